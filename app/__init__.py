@@ -1,23 +1,40 @@
-from flask import Flask, jsonify
+import importlib
+import os
+import threading
+from functools import lru_cache
+
+from flask import Flask, jsonify, request
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from flask_cors import CORS
-from flasgger import Swagger
+from sqlalchemy.exc import OperationalError
+from werkzeug.exceptions import HTTPException
 from app.config import Config
+from app.utils.responses import error_response
+from app.utils.serialization import OrjsonProvider, dumps
 
 # Initialize extensions
-db = SQLAlchemy()
+# Objects stay loaded after commit, so serializing a just-written row doesn't re-SELECT it
+db = SQLAlchemy(session_options={'expire_on_commit': False})
 migrate = Migrate()
 
-def create_app(config_class=Config):
-    """Flask application factory."""
-    app = Flask(__name__)
-    app.config.from_object(config_class)
+# The health payload never changes, so encode it once at import time
+HEALTH_BODY = dumps({'status': 'healthy', 'service': 'airplane-trolley-api'}, sort_keys=True)
+
+# Route modules registered by the app factory, imported on demand
+BLUEPRINTS = (
+    'app.routes.items',
+    'app.routes.drawers',
+    'app.routes.drawer_layouts',
+    'app.routes.drawer_status',
+    'app.routes.employees',
+    'app.routes.restock_history',
+)
 
-    # Initialize extensions
-    db.init_app(app)
-    migrate.init_app(app, db)
-    CORS(app)
+
+def init_swagger(app):
+    """Configure flasgger and expose the API docs at /docs."""
+    from flasgger import Swagger
 
     # Swagger configuration
     swagger_config = Swagger.DEFAULT_CONFIG.copy()
@@ -60,18 +77,128 @@ def create_app(config_class=Config):
     app.config['SWAGGER'] = swagger_config
     Swagger(app, template=swagger_template)
 
-    # Import models (needed for migrations)
+
+@lru_cache(maxsize=512)
+def _classify(endpoint):
+    """Map a route rule to its resource group in the /api listing, or None."""
+    if '/api/items' in endpoint:
+        return 'items'
+    if '/api/drawers' in endpoint and 'layout' not in endpoint:
+        return 'drawers'
+    if '/api/drawer-layout' in endpoint:
+        return 'drawer_layouts'
+    if '/api/drawer-status' in endpoint:
+        return 'drawer_status'
+    if '/api/employees' in endpoint:
+        return 'employees'
+    if '/api/restock-history' in endpoint:
+        return 'restock_history'
+    if '/health' in endpoint or endpoint == '/api' or endpoint == '/api/':
+        return 'health'
+    return None
+
+
+def build_api_index(app):
+    """Group the registered routes by resource for the /api listing."""
+    routes = []
+    for rule in app.url_map.iter_rules():
+        if rule.endpoint != 'static' and '/flasgger' not in str(rule):
+            routes.append({
+                'endpoint': str(rule),
+                'methods': sorted(list(rule.methods - {'HEAD', 'OPTIONS'}))
+            })
+
+    # Group routes by resource
+    resources = {
+        'health': [],
+        'items': [],
+        'drawers': [],
+        'drawer_layouts': [],
+        'drawer_status': [],
+        'employees': [],
+        'restock_history': []
+    }
+
+    for route in sorted(routes, key=lambda x: x['endpoint']):
+        group = _classify(route['endpoint'])
+        if group is not None:
+            resources[group].append(route)
+
+    return {
+        'service': 'Airplane Food Trolley Management API',
+        'version': '1.0.0',
+        'documentation': '/docs',
+        'total_endpoints': len(routes),
+        'resources': resources
+    }
+
+
+def warm_pool(app):
+    """Fill this process's connection pool up to pool_size."""
     with app.app_context():
-        from app import models
+        engine = db.engine
+        try:
+            connections = [engine.connect() for _ in range(engine.pool.size())]
+        except OperationalError as e:
+            app.logger.warning('Skipping connection pool warm-up: %s', e)
+            return
+        for connection in connections:
+            connection.close()
+
+
+def create_app(config_class=Config):
+    """Flask application factory."""
+    app = Flask(__name__)
+    app.config.from_object(config_class)
+    app.json = OrjsonProvider(app)
+
+    # Let psycopg2 yield to other greenlets while queries are in flight
+    if app.config.get('DB_GEVENT_PATCH'):
+        from psycogreen.gevent import patch_psycopg
+        patch_psycopg()
+
+    # Initialize extensions (models are imported first so their tables are on
+    # db.metadata before Flask-Migrate sees it; no app context is needed)
+    db.init_app(app)
+    from app import models  # noqa: F401
+    migrate.init_app(app, db)
+    CORS(app)
+
+    # Redis cache-aside (redis is only imported when REDIS_URL is set)
+    from app.cache import init_cache
+    init_cache(app)
+
+    # Swagger docs (flasgger is only imported when enabled)
+    if app.config.get('ENABLE_SWAGGER'):
+        init_swagger(app)
 
-    # Register blueprints
-    from app.routes import items, drawers, drawer_layouts, drawer_status, employees, restock_history
-    app.register_blueprint(items.bp)
-    app.register_blueprint(drawers.bp)
-    app.register_blueprint(drawer_layouts.bp)
-    app.register_blueprint(drawer_status.bp)
-    app.register_blueprint(employees.bp)
-    app.register_blueprint(restock_history.bp)
+    # <uuid:...> route parameters reach the views as uuid.UUID (malformed ones are a 400)
+    from app.utils.converters import UUIDConverter
+    app.url_map.converters['uuid'] = UUIDConverter
+
+    # Register blueprints (API_BLUEPRINTS can restrict which route modules get imported)
+    for module_name in app.config.get('API_BLUEPRINTS') or BLUEPRINTS:
+        app.register_blueprint(importlib.import_module(module_name).bp)
+
+    # Read-only requests have nothing to flush, so skip the per-query autoflush check
+    @app.before_request
+    def disable_autoflush_for_reads():
+        if request.method in ('GET', 'HEAD'):
+            db.session.autoflush = False
+
+    # Flag N+1 query patterns while developing
+    if app.config.get('QUERY_COUNT_WARN_THRESHOLD'):
+        from app.utils.query_counter import init_query_logging
+        init_query_logging(app, app.config['QUERY_COUNT_WARN_THRESHOLD'])
+
+    # Compress large JSON bodies and streamed listings
+    if app.config.get('GZIP_RESPONSES'):
+        from app.utils.compression import init_compression
+        init_compression(app)
+
+    # Maintenance commands (flask refresh-views)
+    from app.cli import register_commands
+    register_commands(app)
 
     # Health check endpoint
     @app.route('/health', methods=['GET'])
@@ -94,7 +221,8 @@ def create_app(config_class=Config):
                   type: string
                   example: airplane-trolley-api
         """
-        return jsonify({'status': 'healthy', 'service': 'airplane-trolley-api'}), 200
+        return app.response_class(HEALTH_BODY, mimetype='application/json',
+                                  headers={'Cache-Control': 'no-cache'}), 200
 
     # API Routes listing endpoint
     @app.route('/api', methods=['GET'])
@@ -109,51 +237,14 @@ def create_app(config_class=Config):
           200:
             description: List of all available API endpoints
         """
-        routes = []
-        for rule in app.url_map.iter_rules():
-            if rule.endpoint != 'static' and '/flasgger' not in str(rule):
-                routes.append({
-                    'endpoint': str(rule),
-                    'methods': sorted(list(rule.methods - {'HEAD', 'OPTIONS'}))
-                })
-
-        # Group routes by resource
-        resources = {
-            'health': [],
-            'items': [],
-            'drawers': [],
-            'drawer_layouts': [],
-            'drawer_status': [],
-            'employees': [],
-            'restock_history': []
-        }
-
-        for route in sorted(routes, key=lambda x: x['endpoint']):
-            endpoint = route['endpoint']
-            if '/api/items' in endpoint:
-                resources['items'].append(route)
-            elif '/api/drawers' in endpoint and 'layout' not in endpoint:
-                resources['drawers'].append(route)
-            elif '/api/drawer-layout' in endpoint:
-                resources['drawer_layouts'].append(route)
-            elif '/api/drawer-status' in endpoint:
-                resources['drawer_status'].append(route)
-            elif '/api/employees' in endpoint:
-                resources['employees'].append(route)
-            elif '/api/restock-history' in endpoint:
-                resources['restock_history'].append(route)
-            elif '/health' in endpoint or endpoint == '/api' or endpoint == '/api/':
-                resources['health'].append(route)
-
-        return jsonify({
-            'service': 'Airplane Food Trolley Management API',
-            'version': '1.0.0',
-            'documentation': '/docs',
-            'total_endpoints': len(routes),
-            'resources': resources
-        }), 200
+        return app.response_class(api_index, mimetype='application/json',
+                                  headers={'Cache-Control': 'public, max-age=300'}), 200
 
     # Global error handlers
+    @app.errorhandler(400)
+    def bad_request(error):
+        return jsonify({'error': {'code': 'VALIDATION_ERROR', 'message': error.description}}), 400
+
     @app.errorhandler(404)
     def not_found(error):
         return jsonify({'error': {'code': 'NOT_FOUND', 'message': 'Resource not found'}}), 404
@@ -162,4 +253,34 @@ def create_app(config_class=Config):
     def internal_error(error):
         return jsonify({'error': {'code': 'INTERNAL_ERROR', 'message': 'Internal server error'}}), 500
 
+    # Views raise instead of catching: bad input is a ValueError, anything else a server error
+    @app.errorhandler(ValueError)
+    def validation_error(error):
+        db.session.rollback()
+        return error_response('VALIDATION_ERROR', str(error), status_code=400)
+
+    @app.errorhandler(Exception)
+    def server_error(error):
+        if isinstance(error, HTTPException):
+            return error
+        db.session.rollback()
+        return error_response('SERVER_ERROR', str(error), status_code=500)
+
+    # Pre-open database connections (SQLite and test runs don't pool). Done by each
+    # serving process on its first request, in the background: never for CLI commands,
+    # and never before a pre-forking server (gunicorn --preload) forks its workers
+    if (app.config.get('DB_POOL_WARMUP') and not app.config.get('TESTING')
+            and not app.config['SQLALCHEMY_DATABASE_URI'].startswith('sqlite')):
+        warmed_pid = None
+
+        @app.before_request
+        def warm_pool_once():
+            nonlocal warmed_pid
+            if warmed_pid != os.getpid():
+                warmed_pid = os.getpid()
+                threading.Thread(target=warm_pool, args=(app,), daemon=True).start()
+
+    # The URL map is fixed from here on, so the /api listing is serialized once
+    api_index = app.json.dumps(build_api_index(app))
+
     return app
@@ -0,0 +1,177 @@
+"""
+Cache-aside helpers for hot single-row reads.
+
+Backed by Redis when REDIS_URL is configured (requires the redis package);
+otherwise every lookup goes straight to the loader. Redis is never required
+for correctness: when it errors or times out the call is logged and the
+request carries on as if no cache were configured.
+"""
+from functools import wraps
+
+from flask import current_app, request
+import orjson
+
+from app.utils.serialization import dumps
+
+try:
+    from redis import RedisError
+except ImportError:
+    class RedisError(Exception):
+        """Stand-in when redis is not installed (no client exists to raise it)."""
+
+
+def _cache_failed(action, error):
+    current_app.logger.warning('Cache %s failed, continuing without the cache: %s', action, error)
+
+
+def init_cache(app):
+    """
+    Connect the Redis client if one is configured.
+
+    Args:
+        app: Flask application
+    """
+    if app.config.get('REDIS_URL'):
+        import redis
+        # Short timeouts: a slow Redis should cost a request milliseconds, not a worker
+        app.extensions['redis'] = redis.Redis.from_url(
+            app.config['REDIS_URL'],
+            socket_timeout=app.config['CACHE_SOCKET_TIMEOUT'],
+            socket_connect_timeout=app.config['CACHE_SOCKET_TIMEOUT']
+        )
+
+
+def cached(key, loader):
+    """
+    Return the cached JSON value for key, loading and storing it on a miss.
+
+    Args:
+        key: Cache key, e.g. 'drawer:<uuid>'
+        loader: Callable returning a JSON-serializable dict, or None if missing
+
+    Returns:
+        dict or None: Cached or freshly loaded value (None results are not cached)
+    """
+    client = current_app.extensions.get('redis')
+    if client is None:
+        return loader()
+
+    try:
+        raw = client.get(key)
+    except RedisError as e:
+        _cache_failed('read', e)
+        return loader()
+    if raw is not None:
+        return orjson.loads(raw)
+
+    value = loader()
+    if value is not None:
+        # The TTL bounds staleness if an invalidation is ever missed
+        try:
+            client.setex(key, current_app.config['CACHE_TTL_SECONDS'], dumps(value))
+        except RedisError as e:
+            _cache_failed('write', e)
+    return value
+
+
+def invalidate(*keys):
+    """
+    Drop cached values after a write.
+
+    Runs after the write has committed, so a Redis failure is only logged:
+    the entries then expire on their TTL.
+
+    Args:
+        *keys: Cache keys to delete
+    """
+    client = current_app.extensions.get('redis')
+    if client is not None:
+        try:
+            client.delete(*keys)
+        except RedisError as e:
+            _cache_failed('invalidation', e)
+
+
+def _namespace_version(client, namespace):
+    version = client.get(f'{namespace}:version')
+    return int(version) if version is not None else 0
+
+
+def bump_versions(*namespaces):
+    """
+    Retire every response cached under the given namespaces.
+
+    Cached views embed the namespace version in their keys, so one INCR
+    makes all older entries unreachable (they expire on their TTL) without
+    scanning for them.
+
+    Called from the session's after_commit hook, so a Redis failure is only
+    logged: raising would fail a write that is already saved. Responses
+    cached before it then live out their TTL.
+
+    Args:
+        *namespaces: Namespaces passed to cached_view, e.g. 'items'
+    """
+    client = current_app.extensions.get('redis')
+    if client is not None and namespaces:
+        try:
+            pipeline = client.pipeline(transaction=False)
+            for namespace in namespaces:
+                pipeline.incr(f'{namespace}:version')
+            pipeline.execute()
+        except RedisError as e:
+            _cache_failed('version bump', e)
+
+
+def cached_view(namespace, ttl=None):
+    """
+    Cache a GET view's 200 JSON body per URL (path and query string).
+
+    Hits are sent as stored bytes with no database work or re-encoding.
+    Writes invalidate through bump_versions(namespace).
+
+    Args:
+        namespace: Group of responses invalidated together
+        ttl: Seconds to keep a response (default CACHE_TTL_SECONDS)
+
+    Returns:
+        function: Decorator for the view
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            client = current_app.extensions.get('redis')
+            if client is None:
+                return view(*args, **kwargs)
+
+            try:
+                key = f'{namespace}:v{_namespace_version(client, namespace)}:{request.full_path}'
+                body = client.get(key)
+            except RedisError as e:
+                # Serve uncached rather than fail the read
+                _cache_failed('read', e)
+                return view(*args, **kwargs)
+            if body is not None:
+                return current_app.response_class(body, mimetype='application/json'), 200
+
+            response, status_code = view(*args, **kwargs)
+            if status_code == 200:
+                try:
+                    client.setex(key, ttl or current_app.config['CACHE_TTL_SECONDS'], response.get_data())
+                except RedisError as e:
+                    _cache_failed('write', e)
+            return response, status_code
+        return wrapper
+    return decorator
+
+
+def drawer_key(drawer_id):
+    return f'drawer:{drawer_id}'
+
+
+def employee_key(emp_id):
+    return f'employee:{emp_id}'
+
+
+def drawer_status_key(drawer_id):
+    return f'drawer_status:latest:{drawer_id}'
@@ -0,0 +1,61 @@
+"""
+Flask CLI commands for scheduled maintenance.
+"""
+import click
+from sqlalchemy import select, update
+
+from app import db
+from app.models import CurrentDrawerStatus, Drawer, DrawerLayout, DrawerStatus, EmployeeScore, RestockHistory, RestockHistoryDaily
+from app.utils.qr_codes import qr_png_bytes
+
+
+def register_commands(app):
+    """Attach the maintenance commands to the app's CLI."""
+
+    @app.cli.command('refresh-views')
+    def refresh_views():
+        """Refresh the reporting materialized views."""
+        RestockHistoryDaily.refresh()
+        click.echo('Refreshed restock_history_daily')
+        CurrentDrawerStatus.refresh()
+        click.echo('Refreshed mv_current_drawer_status')
+        EmployeeScore.refresh()
+        click.echo('Refreshed mv_employee_scores')
+
+    @app.cli.command('create-partitions')
+    @click.option('--months-ahead', default=3, show_default=True, help='Future months to create partitions for.')
+    def create_partitions(months_ahead):
+        """Create upcoming monthly restock_history partitions."""
+        for name, moved in RestockHistory.create_partitions(months_ahead):
+            if moved:
+                click.echo(f'Ensured {name} (moved {moved} rows out of restock_history_default)')
+            else:
+                click.echo(f'Ensured {name}')
+
+    @app.cli.command('purge-deleted')
+    @click.option('--days', default=7, show_default=True, help='Only purge rows soft-deleted at least this long ago.')
+    @click.option('--batch-size', default=10000, show_default=True, help='Rows deleted per statement.')
+    def purge_deleted(days, batch_size):
+        """Physically delete soft-deleted drawer statuses, layouts and drawers."""
+        for model in (DrawerStatus, DrawerLayout, Drawer):
+            purged = model.purge_deleted(days, batch_size)
+            click.echo(f'Purged {purged} from {model.__tablename__}')
+
+    @app.cli.command('backfill-qr-png')
+    @click.option('--batch-size', default=500, show_default=True, help='Drawers rendered per commit.')
+    def backfill_qr_png(batch_size):
+        """Store the rendered QR PNG for drawers whose code predates qr_png."""
+        total = 0
+        while True:
+            rows = db.session.execute(
+                select(Drawer.id, Drawer.qr_code)
+                .where(Drawer.qr_code.is_not(None), Drawer.qr_png.is_(None))
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                break
+            # Bulk UPDATE by primary key, as in the batch QR regeneration endpoint
+            db.session.execute(update(Drawer), [{'id': drawer_id, 'qr_png': qr_png_bytes(payload)} for drawer_id, payload in rows])
+            db.session.commit()
+            total += len(rows)
+        click.echo(f'Stored {total} QR images')
@@ -15,5 +15,42 @@ class Config:
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SQLALCHEMY_ECHO = FLASK_ENV == 'development'
 
+    # Connection pool (SQLite uses its own single-connection pool)
+    SQLALCHEMY_ENGINE_OPTIONS = {} if SQLALCHEMY_DATABASE_URI.startswith('sqlite') else {
+        'pool_size': int(os.getenv('DB_POOL_SIZE', 10)),
+        'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', 20)),
+        'pool_timeout': 30,
+        'pool_recycle': 1800,
+        'pool_pre_ping': True,
+        'pool_use_lifo': True,
+    }
+
+    # Open pool_size connections once a process starts serving, so later requests skip the handshake
+    DB_POOL_WARMUP = os.getenv('DB_POOL_WARMUP', 'true').lower() in ('1', 'true', 'yes')
+
+    # Warn about requests that run more SQL statements than this (development only by default)
+    QUERY_COUNT_WARN_THRESHOLD = int(os.getenv('QUERY_COUNT_WARN_THRESHOLD', 10 if FLASK_ENV == 'development' else 0))
+
+    # Cooperative psycopg2 I/O when served by gevent workers (requires psycogreen)
+    DB_GEVENT_PATCH = os.getenv('DB_GEVENT_PATCH', 'false').lower() in ('1', 'true', 'yes')
+
+    # Cache-aside for hot single-row reads (requires redis; disabled when unset)
+    REDIS_URL = os.getenv('REDIS_URL')
+    CACHE_TTL_SECONDS = int(os.getenv('CACHE_TTL_SECONDS', 60))
+    CACHE_SOCKET_TIMEOUT = float(os.getenv('CACHE_SOCKET_TIMEOUT', 0.25))
+
+    # Gzip JSON responses for clients that accept it (off when a reverse proxy already compresses)
+    GZIP_RESPONSES = os.getenv('GZIP_RESPONSES', 'true').lower() in ('1', 'true', 'yes')
+    GZIP_MIN_SIZE = int(os.getenv('GZIP_MIN_SIZE', 1024))
+    GZIP_LEVEL = int(os.getenv('GZIP_LEVEL', 6))
+
+    # API docs (skipped for tests and CLI commands to avoid importing flasgger)
+    ENABLE_SWAGGER = os.getenv('ENABLE_SWAGGER', str(FLASK_ENV != 'testing')).lower() in ('1', 'true', 'yes')
+
+    # Blueprints (None registers every module in app.BLUEPRINTS)
+    API_BLUEPRINTS = None
+
     # CORS
     CORS_HEADERS = 'Content-Type'
+    CORS_ORIGINS = os.getenv('CORS_ORIGINS', '*').split(',')
+    CORS_MAX_AGE = int(os.getenv('CORS_MAX_AGE', 86400))  # Let browsers cache preflights for a day
@@ -5,8 +5,11 @@ from app.models.drawer import Drawer, DrawerSide
 from app.models.drawer_layout import DrawerLayout
 from app.models.employee import Employee, EmployeeStatus
 from app.models.drawer_status import DrawerStatus, DrawerStatusEnum
+from app.models.current_drawer_status import CurrentDrawerStatus
 from app.models.drawer_batch_tracking import DrawerBatchTracking
 from app.models.restock_history import RestockHistory, ActionType
+from app.models.restock_history_daily import RestockHistoryDaily
+from app.models.employee_score import EmployeeScore
 from app.models.product import Product
 from app.models.flight import Flight, FlightStatus
 from app.models.packing_job import PackingJob
@@ -24,9 +27,12 @@ __all__ = [
     'EmployeeStatus',
     'DrawerStatus',
     'DrawerStatusEnum',
+    'CurrentDrawerStatus',
     'DrawerBatchTracking',
     'RestockHistory',
     'ActionType',
+    'RestockHistoryDaily',
+    'EmployeeScore',
     'Product',
     'Flight',
     'FlightStatus',
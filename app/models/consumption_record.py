@@ -1,16 +1,24 @@
 import uuid
 from datetime import datetime
 from app import db
+from app.models.mixins import SerializerMixin
 from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import text
 
-class ConsumptionRecord(db.Model):
+class ConsumptionRecord(db.Model, SerializerMixin):
     """Model for audit trail of inventory consumption via scanning."""
     __tablename__ = 'consumption_records'
+    __table_args__ = (
+        # Reporting filters by drawer, job or employee, usually over a time range
+        db.Index('ix_cr_drawer_time', 'drawer_id', 'consumed_at'),
+        db.Index('ix_cr_job', 'job_id'),
+        db.Index('ix_cr_employee_time', 'employee_id', 'consumed_at'),
+    )
 
-    id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, server_default=text('gen_random_uuid()'))
     drawer_id = db.Column(UUID(as_uuid=True), db.ForeignKey('drawers.id'), nullable=False)
-    batch_id = db.Column(UUID(as_uuid=True), db.ForeignKey('item_batches.id'), nullable=False)
-    product_id = db.Column(UUID(as_uuid=True), db.ForeignKey('products.id'), nullable=False)
+    batch_id = db.Column(UUID(as_uuid=True), db.ForeignKey('item_batches.id'), nullable=False, index=True)
+    product_id = db.Column(UUID(as_uuid=True), db.ForeignKey('products.id'), nullable=False, index=True)
     quantity_consumed = db.Column(db.Integer, nullable=False)
     employee_id = db.Column(UUID(as_uuid=True), db.ForeignKey('employees.id'), nullable=False)
     job_id = db.Column(UUID(as_uuid=True), db.ForeignKey('packing_jobs.id'), nullable=True)  # Optional link to packing job
@@ -25,16 +33,3 @@ class ConsumptionRecord(db.Model):
 
     def __repr__(self):
         return f'<ConsumptionRecord batch={self.batch_id} qty={self.quantity_consumed}>'
-
-    def to_dict(self):
-        """Convert model to dictionary."""
-        return {
-            'id': str(self.id),
-            'drawer_id': str(self.drawer_id),
-            'batch_id': str(self.batch_id),
-            'product_id': str(self.product_id),
-            'quantity_consumed': self.quantity_consumed,
-            'employee_id': str(self.employee_id),
-            'job_id': str(self.job_id) if self.job_id else None,
-            'consumed_at': self.consumed_at.isoformat() if self.consumed_at else None
-        }
@@ -0,0 +1,48 @@
+from app import db
+from app.models.mixins import SerializerMixin, enum_values
+from app.models.drawer_status import DrawerStatus, DrawerStatusEnum
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import DDL, Enum, MetaData, event
+
+CREATE_CURRENT_DRAWER_STATUS = DDL("""
+CREATE MATERIALIZED VIEW IF NOT EXISTS mv_current_drawer_status AS
+SELECT DISTINCT ON (drawer_id) id, drawer_id, status, last_updated, created_at
+FROM drawer_status
+WHERE deleted_at IS NULL
+ORDER BY drawer_id, last_updated DESC;
+CREATE UNIQUE INDEX IF NOT EXISTS ux_mv_current_drawer_status ON mv_current_drawer_status (drawer_id)
+""")
+
+DROP_CURRENT_DRAWER_STATUS = DDL('DROP MATERIALIZED VIEW IF EXISTS mv_current_drawer_status')
+
+# Keep the view in step with create_all()/drop_all() (used by reset_database.py)
+event.listen(DrawerStatus.__table__, 'after_create', CREATE_CURRENT_DRAWER_STATUS.execute_if(dialect='postgresql'))
+event.listen(DrawerStatus.__table__, 'before_drop', DROP_CURRENT_DRAWER_STATUS.execute_if(dialect='postgresql'))
+
+
+class CurrentDrawerStatus(db.Model, SerializerMixin):
+    """Read-only view of the most recent status per drawer."""
+    # Separate metadata so create_all() and Alembic don't treat the view as a table
+    __table__ = db.Table(
+        'mv_current_drawer_status', MetaData(),
+        db.Column('id', UUID(as_uuid=True)),
+        db.Column('drawer_id', UUID(as_uuid=True), primary_key=True),
+        db.Column('status', Enum(DrawerStatusEnum, values_callable=enum_values)),
+        db.Column('last_updated', db.DateTime(timezone=True)),
+        db.Column('created_at', db.DateTime(timezone=True)),
+    )
+
+    def __repr__(self):
+        return f'<CurrentDrawerStatus {self.drawer_id} {self.status}>'
+
+    @staticmethod
+    def refresh():
+        """
+        Recompute the view without blocking readers.
+        Called by `flask refresh-views` only, off the request path.
+        """
+        # The view only exists on Postgres; other backends (tests) have nothing to refresh
+        if db.session.get_bind().dialect.name != 'postgresql':
+            return
+        db.session.execute(db.text('REFRESH MATERIALIZED VIEW CONCURRENTLY mv_current_drawer_status'))
+        db.session.commit()
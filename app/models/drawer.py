@@ -1,8 +1,10 @@
 import uuid
 from datetime import datetime
 from app import db
+from app.models.mixins import SerializerMixin, SoftDeleteMixin, enum_values
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy import Enum
+from sqlalchemy import Enum, exists, func, select, text
+from sqlalchemy.orm import deferred
 import enum
 
 class DrawerSide(enum.Enum):
@@ -10,12 +12,23 @@ class DrawerSide(enum.Enum):
     front = 'front'
     back = 'back'
 
-class Drawer(db.Model):
+class Drawer(db.Model, SoftDeleteMixin, SerializerMixin):
     """Model for permanent drawer definitions."""
     __tablename__ = 'drawers'
+    __table_args__ = (
+        # Keyset pagination order for the drawer listing (creation time never changes, so cursors stay valid)
+        db.Index('ix_drawers_created_id', db.text('created_at DESC'), db.text('id DESC')),
+        # Codes are unique among live drawers only, so a deleted drawer's code can be reused
+        db.Index('ux_drawers_live_drawer_code', 'drawer_code', unique=True,
+                 postgresql_where=text('deleted_at IS NULL'), sqlite_where=text('deleted_at IS NULL')),
+    )
+    # Load server-generated values in the INSERT/UPDATE's RETURNING instead of on next access
+    __mapper_args__ = {'eager_defaults': True}
+    # The rendered QR image is served by its own endpoint, not in the drawer JSON
+    _hidden_fields = ('deleted_at', 'qr_png')
 
-    id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    drawer_code = db.Column(db.String(50), unique=True, nullable=False, index=True)
+    id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, server_default=text('gen_random_uuid()'))
+    drawer_code = db.Column(db.String(50), nullable=False)
     trolley_id = db.Column(db.String(50), nullable=False)
     position = db.Column(db.Integer, nullable=False)
     capacity = db.Column(db.Integer, nullable=False)
@@ -23,33 +36,29 @@ class Drawer(db.Model):
 
     # Frontend support fields
     qr_code = db.Column(db.String(100), unique=True, nullable=True, index=True)  # QR code for drawer
-    side = db.Column(Enum(DrawerSide), nullable=True)  # front or back side
+    side = db.Column(Enum(DrawerSide, values_callable=enum_values), nullable=True)  # front or back side
+    qr_png = deferred(db.Column(db.LargeBinary, nullable=True))  # PNG of qr_code, rendered once at generation
 
     created_at = db.Column(db.DateTime(timezone=True), nullable=False, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime(timezone=True), nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Set by the database on insert and on every UPDATE of the row
+    updated_at = db.Column(db.DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
 
     # Relationships
-    drawer_layouts = db.relationship('DrawerLayout', back_populates='drawer', lazy='dynamic', cascade='all, delete-orphan')
-    drawer_statuses = db.relationship('DrawerStatus', back_populates='drawer', lazy='dynamic', cascade='all, delete-orphan')
-    restock_histories = db.relationship('RestockHistory', back_populates='drawer', lazy='dynamic')
-    drawer_inventories = db.relationship('DrawerInventory', back_populates='drawer', lazy='dynamic')
-    packing_job_drawers = db.relationship('PackingJobDrawer', back_populates='drawer', lazy='dynamic')
-    consumption_records = db.relationship('ConsumptionRecord', back_populates='drawer', lazy='dynamic')
+    drawer_layouts = db.relationship('DrawerLayout', back_populates='drawer', cascade='all, delete-orphan')
+    drawer_statuses = db.relationship('DrawerStatus', back_populates='drawer', cascade='all, delete-orphan')
+    restock_histories = db.relationship('RestockHistory', back_populates='drawer', lazy='write_only', passive_deletes=True)
+    drawer_inventories = db.relationship('DrawerInventory', back_populates='drawer', lazy='write_only', passive_deletes=True)
+    packing_job_drawers = db.relationship('PackingJobDrawer', back_populates='drawer', lazy='write_only', passive_deletes=True)
+    consumption_records = db.relationship('ConsumptionRecord', back_populates='drawer', lazy='write_only', passive_deletes=True)
 
     def __repr__(self):
         return f'<Drawer {self.drawer_code}>'
 
-    def to_dict(self):
-        """Convert model to dictionary."""
-        return {
-            'id': str(self.id),
-            'drawer_code': self.drawer_code,
-            'trolley_id': self.trolley_id,
-            'position': self.position,
-            'capacity': self.capacity,
-            'drawer_type': self.drawer_type,
-            'qr_code': self.qr_code,
-            'side': self.side.value if self.side else None,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
+    @staticmethod
+    def exists_by_id(drawer_id):
+        """
+        Check whether a drawer exists and has not been soft-deleted.
+        Issues a single SELECT EXISTS instead of loading the row.
+        """
+        # Core exists() is not an ORM entity query, so the soft-delete criteria must be explicit
+        return db.session.scalar(select(exists().where(Drawer.id == drawer_id, Drawer.deleted_at.is_(None))))
@@ -1,50 +1,40 @@
 import uuid
 from datetime import datetime
 from app import db
+from app.models.mixins import SerializerMixin
 from sqlalchemy.dialects.postgresql import UUID
+from typing import Optional
+from sqlalchemy import text
+from sqlalchemy.orm import Mapped, mapped_column
 
-class DrawerBatchTracking(db.Model):
+class DrawerBatchTracking(db.Model, SerializerMixin):
     """Model for critical batch stacking prevention tracking."""
     __tablename__ = 'drawer_batch_tracking'
+    __table_args__ = (
+        # Partial index: only non-depleted rows matter for stacking detection;
+        # batch_order lets the stacking lookups read them already sorted, and the
+        # included columns let the stacking check's join skip the heap
+        db.Index('ix_dbt_status_active_covering', 'drawer_status_id', 'batch_order',
+                 postgresql_where=text('is_depleted = false'),
+                 postgresql_include=['batch_id', 'quantity_loaded', 'load_date']),
+        db.Index('ix_dbt_status_order', 'drawer_status_id', 'batch_order'),
+    )
+    # Load server-generated values in the INSERT's RETURNING instead of on next access
+    __mapper_args__ = {'eager_defaults': True}
 
-    id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    drawer_status_id = db.Column(UUID(as_uuid=True), db.ForeignKey('drawer_status.id', ondelete='CASCADE'), nullable=False)
-    batch_id = db.Column(UUID(as_uuid=True), db.ForeignKey('item_batches.id', ondelete='RESTRICT'), nullable=False)
-    quantity_loaded = db.Column(db.Integer, nullable=False)
-    load_date = db.Column(db.DateTime(timezone=True), nullable=False, default=datetime.utcnow)
-    is_depleted = db.Column(db.Boolean, nullable=False, default=False)
-    depletion_date = db.Column(db.DateTime(timezone=True), nullable=True)
-    batch_order = db.Column(db.Integer, nullable=False)  # Tracks stacking order
-    created_at = db.Column(db.DateTime(timezone=True), nullable=False, default=datetime.utcnow)
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, server_default=text('gen_random_uuid()'))
+    drawer_status_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), db.ForeignKey('drawer_status.id', ondelete='CASCADE'), nullable=False)
+    batch_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), db.ForeignKey('item_batches.id', ondelete='RESTRICT'), nullable=False, index=True)
+    quantity_loaded: Mapped[int] = mapped_column(db.Integer, nullable=False)
+    load_date: Mapped[datetime] = mapped_column(db.DateTime(timezone=True), nullable=False, default=datetime.utcnow)
+    is_depleted: Mapped[bool] = mapped_column(db.Boolean, nullable=False, default=False)
+    depletion_date: Mapped[Optional[datetime]] = mapped_column(db.DateTime(timezone=True), nullable=True)
+    batch_order: Mapped[int] = mapped_column(db.Integer, nullable=False)  # Tracks stacking order
+    created_at: Mapped[datetime] = mapped_column(db.DateTime(timezone=True), nullable=False, default=datetime.utcnow)
 
-    # Relationships
-    drawer_status = db.relationship('DrawerStatus', back_populates='batch_trackings')
-    batch = db.relationship('ItemBatch', back_populates='batch_trackings')
+    # Relationships; never lazy-loaded, so reads must join or eager-load them explicitly
+    drawer_status: Mapped['DrawerStatus'] = db.relationship('DrawerStatus', back_populates='batch_trackings', lazy='raise_on_sql')
+    batch: Mapped['ItemBatch'] = db.relationship('ItemBatch', back_populates='batch_trackings', lazy='raise_on_sql')
 
     def __repr__(self):
         return f'<DrawerBatchTracking {self.id}>'
-
-    def to_dict(self):
-        """Convert model to dictionary."""
-        return {
-            'id': str(self.id),
-            'drawer_status_id': str(self.drawer_status_id),
-            'batch_id': str(self.batch_id),
-            'quantity_loaded': self.quantity_loaded,
-            'load_date': self.load_date.isoformat() if self.load_date else None,
-            'is_depleted': self.is_depleted,
-            'depletion_date': self.depletion_date.isoformat() if self.depletion_date else None,
-            'batch_order': self.batch_order,
-            'created_at': self.created_at.isoformat() if self.created_at else None
-        }
-
-    @staticmethod
-    def get_non_depleted_batches(drawer_status_id):
-        """
-        Get all non-depleted batches for a drawer status.
-        Used for batch stacking detection.
-        """
-        return DrawerBatchTracking.query.filter_by(
-            drawer_status_id=drawer_status_id,
-            is_depleted=False
-        ).all()
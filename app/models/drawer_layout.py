@@ -1,15 +1,17 @@
 import uuid
 from datetime import datetime
 from app import db
+from app.models.mixins import SerializerMixin, SoftDeleteMixin
 from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import text
 
-class DrawerLayout(db.Model):
+class DrawerLayout(db.Model, SoftDeleteMixin, SerializerMixin):
     """Model for permanent layout templates."""
     __tablename__ = 'drawer_layouts'
 
-    id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, server_default=text('gen_random_uuid()'))
     layout_name = db.Column(db.String(100), nullable=False)
-    drawer_id = db.Column(UUID(as_uuid=True), db.ForeignKey('drawers.id', ondelete='CASCADE'), nullable=False)
+    drawer_id = db.Column(UUID(as_uuid=True), db.ForeignKey('drawers.id', ondelete='CASCADE'), nullable=False, index=True)
     item_type = db.Column(db.String(100), nullable=False)
     designated_quantity = db.Column(db.Integer, nullable=False)
     priority_order = db.Column(db.Integer, nullable=False)
@@ -21,16 +23,3 @@ class DrawerLayout(db.Model):
 
     def __repr__(self):
         return f'<DrawerLayout {self.layout_name}>'
-
-    def to_dict(self):
-        """Convert model to dictionary."""
-        return {
-            'id': str(self.id),
-            'layout_name': self.layout_name,
-            'drawer_id': str(self.drawer_id),
-            'item_type': self.item_type,
-            'designated_quantity': self.designated_quantity,
-            'priority_order': self.priority_order,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
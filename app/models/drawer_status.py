@@ -1,8 +1,9 @@
 import uuid
 from datetime import datetime
 from app import db
+from app.models.mixins import SerializerMixin, SoftDeleteMixin, enum_values
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy import Enum
+from sqlalchemy import Enum, func, text
 import enum
 
 class DrawerStatusEnum(enum.Enum):
@@ -12,29 +13,28 @@ class DrawerStatusEnum(enum.Enum):
     full = 'full'
     needs_restock = 'needs_restock'
 
-class DrawerStatus(db.Model):
+class DrawerStatus(db.Model, SoftDeleteMixin, SerializerMixin):
     """Model for current state of each drawer."""
     __tablename__ = 'drawer_status'
+    __table_args__ = (
+        # Latest status per drawer is a backward scan that stops after one row
+        db.Index('ix_drawer_status_drawer_updated', 'drawer_id', db.text('last_updated DESC')),
+        # Keyset pagination order for the status listing (creation time never changes, so cursors stay valid)
+        db.Index('ix_drawer_status_created_id', db.text('created_at DESC'), db.text('id DESC')),
+    )
+    # Load server-generated values in the INSERT/UPDATE's RETURNING instead of on next access
+    __mapper_args__ = {'eager_defaults': True}
 
-    id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, server_default=text('gen_random_uuid()'))
     drawer_id = db.Column(UUID(as_uuid=True), db.ForeignKey('drawers.id', ondelete='CASCADE'), nullable=False)
-    status = db.Column(Enum(DrawerStatusEnum), nullable=False, default=DrawerStatusEnum.empty)
-    last_updated = db.Column(db.DateTime(timezone=True), nullable=False, default=datetime.utcnow)
+    status = db.Column(Enum(DrawerStatusEnum, values_callable=enum_values), nullable=False, default=DrawerStatusEnum.empty)
+    # Set by the database on insert and on every UPDATE of the row
+    last_updated = db.Column(db.DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
     created_at = db.Column(db.DateTime(timezone=True), nullable=False, default=datetime.utcnow)
 
     # Relationships
     drawer = db.relationship('Drawer', back_populates='drawer_statuses')
-    batch_trackings = db.relationship('DrawerBatchTracking', back_populates='drawer_status', lazy='dynamic', cascade='all, delete-orphan')
+    batch_trackings = db.relationship('DrawerBatchTracking', back_populates='drawer_status', lazy='write_only', cascade='all, delete-orphan', passive_deletes=True)
 
     def __repr__(self):
         return f'<DrawerStatus {self.id}>'
-
-    def to_dict(self):
-        """Convert model to dictionary."""
-        return {
-            'id': str(self.id),
-            'drawer_id': str(self.drawer_id),
-            'status': self.status.value if self.status else None,
-            'last_updated': self.last_updated.isoformat() if self.last_updated else None,
-            'created_at': self.created_at.isoformat() if self.created_at else None
-        }
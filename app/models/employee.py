@@ -1,8 +1,9 @@
 import uuid
 from datetime import datetime
 from app import db
+from app.models.mixins import SerializerMixin, enum_values
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy import Enum
+from sqlalchemy import Enum, exists, func, select, text
 import enum
 
 class EmployeeStatus(enum.Enum):
@@ -10,34 +11,32 @@ class EmployeeStatus(enum.Enum):
     active = 'active'
     inactive = 'inactive'
 
-class Employee(db.Model):
+class Employee(db.Model, SerializerMixin):
     """Model for employee management."""
     __tablename__ = 'employees'
+    # Load server-generated values in the INSERT/UPDATE's RETURNING instead of on next access
+    __mapper_args__ = {'eager_defaults': True}
 
-    id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, server_default=text('gen_random_uuid()'))
     employee_id = db.Column(db.String(50), unique=True, nullable=False, index=True)
     first_name = db.Column(db.String(100), nullable=False)
     last_name = db.Column(db.String(100), nullable=False)
     role = db.Column(db.String(50), nullable=False)
-    status = db.Column(Enum(EmployeeStatus), nullable=False, default=EmployeeStatus.active)
+    status = db.Column(Enum(EmployeeStatus, values_callable=enum_values), nullable=False, default=EmployeeStatus.active)
     created_at = db.Column(db.DateTime(timezone=True), nullable=False, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime(timezone=True), nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Set by the database on insert and on every UPDATE of the row
+    updated_at = db.Column(db.DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
 
     # Relationships
-    restock_histories = db.relationship('RestockHistory', back_populates='employee', lazy='dynamic')
+    restock_histories = db.relationship('RestockHistory', back_populates='employee', lazy='write_only', passive_deletes=True)
 
     def __repr__(self):
         return f'<Employee {self.employee_id}>'
 
-    def to_dict(self):
-        """Convert model to dictionary."""
-        return {
-            'id': str(self.id),
-            'employee_id': self.employee_id,
-            'first_name': self.first_name,
-            'last_name': self.last_name,
-            'role': self.role,
-            'status': self.status.value if self.status else None,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
+    @staticmethod
+    def exists_by_id(emp_id):
+        """
+        Check whether an employee exists.
+        Issues a single SELECT EXISTS instead of loading the row.
+        """
+        return db.session.scalar(select(exists().where(Employee.id == emp_id)))
@@ -0,0 +1,56 @@
+from app import db
+from app.models.mixins import SerializerMixin
+from app.models.restock_history import RestockHistory
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import DDL, MetaData, Numeric, event
+
+CREATE_EMPLOYEE_SCORES = DDL("""
+CREATE MATERIALIZED VIEW IF NOT EXISTS mv_employee_scores AS
+SELECT employee_id,
+       count(*) AS total_actions,
+       avg(accuracy_score) AS avg_accuracy,
+       avg(efficiency_score) AS avg_efficiency,
+       count(*) FILTER (WHERE batch_warning_triggered) AS warnings_triggered,
+       avg(completion_time_seconds) AS avg_completion_time
+FROM restock_history
+WHERE employee_id IS NOT NULL
+GROUP BY employee_id;
+CREATE UNIQUE INDEX IF NOT EXISTS ux_mv_employee_scores ON mv_employee_scores (employee_id);
+CREATE INDEX IF NOT EXISTS ix_mv_employee_scores_accuracy ON mv_employee_scores (avg_accuracy DESC);
+CREATE INDEX IF NOT EXISTS ix_mv_employee_scores_efficiency ON mv_employee_scores (avg_efficiency DESC)
+""")
+
+DROP_EMPLOYEE_SCORES = DDL('DROP MATERIALIZED VIEW IF EXISTS mv_employee_scores')
+
+# Keep the view in step with create_all()/drop_all() (used by reset_database.py)
+event.listen(RestockHistory.__table__, 'after_create', CREATE_EMPLOYEE_SCORES.execute_if(dialect='postgresql'))
+event.listen(RestockHistory.__table__, 'before_drop', DROP_EMPLOYEE_SCORES.execute_if(dialect='postgresql'))
+
+
+class EmployeeScore(db.Model, SerializerMixin):
+    """Read-only per-employee totals and averages over all restock history."""
+    # Separate metadata so create_all() and Alembic don't treat the view as a table
+    __table__ = db.Table(
+        'mv_employee_scores', MetaData(),
+        db.Column('employee_id', UUID(as_uuid=True), primary_key=True),
+        db.Column('total_actions', db.BigInteger),
+        db.Column('avg_accuracy', Numeric),
+        db.Column('avg_efficiency', Numeric),
+        db.Column('warnings_triggered', db.BigInteger),
+        db.Column('avg_completion_time', Numeric),
+    )
+
+    def __repr__(self):
+        return f'<EmployeeScore {self.employee_id}>'
+
+    @staticmethod
+    def refresh():
+        """
+        Recompute the view without blocking readers.
+        Intended to run on a schedule, e.g. cron calling `flask refresh-views`.
+        """
+        # The view only exists on Postgres; other backends (tests) have nothing to refresh
+        if db.session.get_bind().dialect.name != 'postgresql':
+            return
+        db.session.execute(db.text('REFRESH MATERIALIZED VIEW CONCURRENTLY mv_employee_scores'))
+        db.session.commit()
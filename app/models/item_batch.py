@@ -1,8 +1,9 @@
 import uuid
 from datetime import datetime
 from app import db
+from app.models.mixins import SerializerMixin, enum_values
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy import Enum
+from sqlalchemy import Enum, text
 import enum
 
 class BatchStatus(enum.Enum):
@@ -11,17 +12,22 @@ class BatchStatus(enum.Enum):
     in_use = 'in_use'
     depleted = 'depleted'
 
-class ItemBatch(db.Model):
+class ItemBatch(db.Model, SerializerMixin):
     """Model for individual batch tracking."""
     __tablename__ = 'item_batches'
+    __table_args__ = (
+        # Keyset pagination order for the batch listing, unfiltered and by status
+        db.Index('ix_item_batches_created_id', db.text('created_at DESC'), db.text('id DESC')),
+        db.Index('ix_item_batches_status_created_id', 'status', db.text('created_at DESC'), db.text('id DESC')),
+    )
 
-    id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, server_default=text('gen_random_uuid()'))
     item_type = db.Column(db.String(100), nullable=False)
     batch_number = db.Column(db.String(50), unique=True, nullable=False, index=True)
     quantity = db.Column(db.Integer, nullable=False)
     expiry_date = db.Column(db.Date, nullable=False)
     received_date = db.Column(db.DateTime(timezone=True), nullable=False, default=datetime.utcnow)
-    status = db.Column(Enum(BatchStatus), nullable=False, default=BatchStatus.available)
+    status = db.Column(Enum(BatchStatus, values_callable=enum_values), nullable=False, default=BatchStatus.available)
 
     # Frontend support fields
     qr_code = db.Column(db.String(100), unique=True, nullable=True, index=True)  # QR code for batch
@@ -32,26 +38,9 @@ class ItemBatch(db.Model):
     updated_at = db.Column(db.DateTime(timezone=True), nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Relationships
-    batch_trackings = db.relationship('DrawerBatchTracking', back_populates='batch', lazy='dynamic')
-    restock_histories = db.relationship('RestockHistory', back_populates='batch', lazy='dynamic')
-    consumption_records = db.relationship('ConsumptionRecord', back_populates='batch', lazy='dynamic')
+    batch_trackings = db.relationship('DrawerBatchTracking', back_populates='batch', lazy='write_only', passive_deletes=True)
+    restock_histories = db.relationship('RestockHistory', back_populates='batch', lazy='write_only', passive_deletes=True)
+    consumption_records = db.relationship('ConsumptionRecord', back_populates='batch', lazy='write_only', passive_deletes=True)
 
     def __repr__(self):
         return f'<ItemBatch {self.batch_number}>'
-
-    def to_dict(self):
-        """Convert model to dictionary."""
-        return {
-            'id': str(self.id),
-            'item_type': self.item_type,
-            'batch_number': self.batch_number,
-            'quantity': self.quantity,
-            'expiry_date': self.expiry_date.isoformat() if self.expiry_date else None,
-            'received_date': self.received_date.isoformat() if self.received_date else None,
-            'status': self.status.value if self.status else None,
-            'qr_code': self.qr_code,
-            'lote_id': self.lote_id,
-            'ean': self.ean,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
@@ -0,0 +1,244 @@
+"""Shared model helpers."""
+from dataclasses import make_dataclass
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import Numeric, Uuid, delete, event, func, select, type_coerce
+from sqlalchemy.orm import declared_attr, with_loader_criteria
+
+from app import db
+
+
+def enum_values(enum_class):
+    """Persist enum members by value so DB labels match the JSON output."""
+    return [member.value for member in enum_class]
+
+
+def _passthrough(value):
+    return value
+
+
+def _float(value):
+    return float(value) if value is not None else None
+
+
+def column_serializer(column):
+    """Pick the JSON conversion for a column based on its type."""
+    column_type = column.type
+    if isinstance(column_type, Numeric) and column_type.asdecimal:
+        return _float if column.nullable else float
+    # Enums, UUIDs and datetimes are left as-is for the orjson encoder
+    return _passthrough
+
+
+def _read_column(column):
+    """Column expression for read_select(); UUIDs are fetched as their string form."""
+    if isinstance(column.type, Uuid) and column.type.as_uuid:
+        # The driver already returns text, so this skips building a uuid.UUID per value
+        return type_coerce(column, type(column.type)(as_uuid=False)).label(column.key)
+    return column
+
+
+def _compile_to_dict(cls, fields, nested=()):
+    """
+    Generate a straight-line to_dict for a model class.
+
+    Args:
+        cls: Mapped model class
+        fields: (key, converter) pairs for the mapped columns
+        nested: Relationship names embedded via their own to_dict (None if unset)
+
+    Returns:
+        function: to_dict(self) building the dict literal directly
+    """
+    namespace = {}
+    lines = ['def to_dict(self):', '    return {']
+    for key, convert in fields:
+        if convert is _passthrough:
+            lines.append(f'        {key!r}: self.{key},')
+        else:
+            name = f'_convert_{key}'
+            namespace[name] = convert
+            lines.append(f'        {key!r}: {name}(self.{key}),')
+    for key in nested:
+        lines.append(f'        {key!r}: None if (related := self.{key}) is None else related.to_dict(),')
+    lines.append('    }')
+    exec('\n'.join(lines), namespace)
+    to_dict = namespace['to_dict']
+    to_dict.__qualname__ = f'{cls.__name__}.to_dict'
+    to_dict.__doc__ = 'Convert model to dictionary.'
+    return to_dict
+
+
+class SerializerMixin:
+    """
+    Adds a to_dict() built from the mapped columns.
+
+    When the mapper is configured, a to_dict specialized to the class's
+    columns is generated, so serializing a row is one dict literal with
+    no per-field lookups or branches.
+    """
+
+    # Many-to-one relationships to embed in to_dict()
+    _nested_fields = ()
+    # Mapped columns left out of to_dict() and read_select()
+    _hidden_fields = ()
+
+    _fast_fields = ()
+    _row_class = None
+
+    @classmethod
+    def _serialized_attrs(cls):
+        return [attr for attr in cls.__mapper__.column_attrs if attr.key not in cls._hidden_fields]
+
+    @classmethod
+    def __declare_last__(cls):
+        cls._fast_fields = tuple(
+            (attr.key, column_serializer(attr.columns[0]))
+            for attr in cls._serialized_attrs()
+        )
+        cls._columns_to_dict = _compile_to_dict(cls, cls._fast_fields, cls._nested_fields)
+        # A model that defines its own to_dict reaches this one via super()
+        if 'to_dict' not in cls.__dict__:
+            cls.to_dict = cls._columns_to_dict
+
+        # Slotted read model holding just the column values
+        row_class = make_dataclass(f'{cls.__name__}Row', [key for key, _ in cls._fast_fields], slots=True)
+        row_class.to_dict = _compile_to_dict(row_class, cls._fast_fields)
+        cls._row_class = row_class
+
+    @classmethod
+    def read_select(cls):
+        """
+        Build a select() of the mapped columns for read-only listings.
+
+        Soft-deleted rows are excluded here: a select of plain columns isn't
+        ORM-enabled, so the loader criteria that hide them elsewhere don't apply.
+
+        Returns:
+            Select: Statement to refine with where/order_by/limit and pass to fetch_rows
+        """
+        stmt = select(*(_read_column(attr.columns[0]) for attr in cls._serialized_attrs()))
+        if issubclass(cls, SoftDeleteMixin):
+            stmt = stmt.where(cls.deleted_at.is_(None))
+        return stmt
+
+    @classmethod
+    def fetch_rows(cls, stmt):
+        """
+        Execute a read_select() statement without ORM hydration.
+
+        Args:
+            stmt: Statement built from read_select()
+
+        Returns:
+            list: Row objects exposing the same to_dict() as the model (UUIDs as strings)
+        """
+        row_class = cls._row_class
+        return [row_class(*row) for row in db.session.execute(stmt)]
+
+    @classmethod
+    def fetch_page(cls, stmt, page, per_page, total=None):
+        """
+        Fetch one OFFSET page of a read_select() statement and the total row count in one round-trip.
+
+        The total rides along as a count(*) OVER () column; only a page past
+        the end, which has no rows to carry it, costs a separate COUNT.
+
+        Args:
+            stmt: Statement built from read_select()
+            page: 1-based page number
+            per_page: Rows per page
+            total: Known (e.g. estimated) total; skips counting altogether
+
+        Returns:
+            tuple: (list of row objects as from fetch_rows, total row count)
+        """
+        row_class = cls._row_class
+        page_stmt = stmt.offset((page - 1) * per_page).limit(per_page)
+        if total is not None:
+            return [row_class(*row) for row in db.session.execute(page_stmt)], total
+
+        rows = db.session.execute(page_stmt.add_columns(func.count().over())).all()
+        if rows:
+            return [row_class(*row[:-1]) for row in rows], rows[0][-1]
+        total = db.session.scalar(select(func.count()).select_from(stmt.order_by(None).subquery()))
+        return [], total
+
+    @classmethod
+    def stream_rows(cls, stmt, chunk_size=1000):
+        """
+        Like fetch_rows, but yield rows while reading the result chunk_size rows at a time.
+
+        Args:
+            stmt: Statement built from read_select()
+            chunk_size: Rows buffered from the cursor per fetch
+
+        Yields:
+            Row objects exposing the same to_dict() as the model (UUIDs as strings)
+        """
+        row_class = cls._row_class
+        for row in db.session.execute(stmt.execution_options(yield_per=chunk_size)):
+            yield row_class(*row)
+
+    def _columns_to_dict(self):
+        return {key: convert(getattr(self, key)) for key, convert in self._fast_fields}
+
+    def to_dict(self):
+        """Convert model to dictionary."""
+        return self._columns_to_dict()
+
+
+class SoftDeleteMixin:
+    """
+    Marks rows deleted instead of removing them.
+
+    Every ORM SELECT skips rows with deleted_at set (pass the execution
+    option include_deleted=True to see them); purge_deleted() removes them
+    physically later, off the request path.
+    """
+
+    _hidden_fields = ('deleted_at',)
+
+    @declared_attr
+    def deleted_at(cls):
+        return db.Column(db.DateTime(timezone=True), nullable=True)
+
+    @classmethod
+    def purge_deleted(cls, older_than_days=7, batch_size=10000):
+        """
+        Physically delete rows soft-deleted more than older_than_days ago.
+
+        Works in batches of batch_size, committing after each, so locks
+        stay short and readers are never blocked for long.
+
+        Args:
+            older_than_days: Minimum age of the soft delete
+            batch_size: Rows deleted per statement
+
+        Returns:
+            int: Number of rows deleted
+        """
+        cutoff = datetime.now(timezone.utc) - timedelta(days=older_than_days)
+        total = 0
+        while True:
+            batch = select(cls.id).where(cls.deleted_at < cutoff).limit(batch_size).scalar_subquery()
+            deleted = db.session.execute(
+                delete(cls).where(cls.id.in_(batch)).execution_options(synchronize_session=False)
+            ).rowcount
+            db.session.commit()
+            total += deleted
+            if deleted < batch_size:
+                return total
+
+
+@event.listens_for(db.session, 'do_orm_execute')
+def _skip_soft_deleted(orm_execute_state):
+    if (
+        orm_execute_state.is_select
+        and not orm_execute_state.is_column_load
+        and not orm_execute_state.is_relationship_load
+        and not orm_execute_state.execution_options.get('include_deleted', False)
+    ):
+        orm_execute_state.statement = orm_execute_state.statement.options(
+            with_loader_criteria(SoftDeleteMixin, lambda cls: cls.deleted_at.is_(None), include_aliases=True)
+        )
@@ -1,13 +1,15 @@
 import uuid
 from datetime import datetime
 from app import db
-from sqlalchemy.dialects.postgresql import UUID
+from app.models.mixins import SerializerMixin
+from sqlalchemy.dialects.postgresql import UUID, insert as pg_insert
+from sqlalchemy import func, text
 
-class Product(db.Model):
+class Product(db.Model, SerializerMixin):
     """Model for product catalog with EAN barcode support."""
     __tablename__ = 'products'
 
-    id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, server_default=text('gen_random_uuid()'))
     ean = db.Column(db.String(50), unique=True, nullable=False, index=True)  # Barcode
     name = db.Column(db.String(200), nullable=False)
     product_type = db.Column(db.String(100), nullable=True)
@@ -16,20 +18,54 @@ class Product(db.Model):
     updated_at = db.Column(db.DateTime(timezone=True), nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Relationships
-    drawer_inventories = db.relationship('DrawerInventory', back_populates='product', lazy='dynamic')
-    consumption_records = db.relationship('ConsumptionRecord', back_populates='product', lazy='dynamic')
+    drawer_inventories = db.relationship('DrawerInventory', back_populates='product', lazy='write_only', passive_deletes=True)
+    consumption_records = db.relationship('ConsumptionRecord', back_populates='product', lazy='write_only', passive_deletes=True)
 
     def __repr__(self):
         return f'<Product {self.ean} - {self.name}>'
 
-    def to_dict(self):
-        """Convert model to dictionary."""
-        return {
-            'id': str(self.id),
-            'ean': self.ean,
-            'name': self.name,
-            'product_type': self.product_type,
-            'description': self.description,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
+    # Postgres caps a statement at 65535 bind parameters
+    UPSERT_CHUNK_SIZE = 65535 // 7
+
+    @staticmethod
+    def bulk_upsert_by_ean(rows):
+        """
+        Insert products, updating name/type/description of EANs that already exist.
+        One INSERT ... ON CONFLICT per chunk instead of a SELECT and write per row.
+
+        An EAN given more than once keeps its last row: Postgres refuses an
+        ON CONFLICT DO UPDATE that would touch the same row twice.
+
+        Args:
+            rows: List of dicts with ean, name and optional product_type/description
+
+        Returns:
+            list: UUIDs of the inserted or updated products, one per distinct EAN
+                in order of first appearance
+        """
+        # Last row wins for a repeated EAN
+        rows = {row['ean']: row for row in rows}.values()
+        # A multi-VALUES INSERT takes its column list from the first row, so give every row the same keys
+        rows = [
+            {
+                'ean': row['ean'],
+                'name': row['name'],
+                'product_type': row.get('product_type'),
+                'description': row.get('description'),
+            }
+            for row in rows
+        ]
+        ids = []
+        for start in range(0, len(rows), Product.UPSERT_CHUNK_SIZE):
+            stmt = pg_insert(Product).values(rows[start:start + Product.UPSERT_CHUNK_SIZE])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Product.ean],
+                set_={
+                    'name': stmt.excluded.name,
+                    'product_type': stmt.excluded.product_type,
+                    'description': stmt.excluded.description,
+                    'updated_at': func.now(),
+                }
+            ).returning(Product.id)
+            ids.extend(db.session.scalars(stmt))
+        return ids
@@ -1,8 +1,9 @@
 import uuid
-from datetime import datetime
+from datetime import date, datetime
 from app import db
+from app.models.mixins import SerializerMixin, enum_values
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy import Enum, Numeric
+from sqlalchemy import Enum, Numeric, event, text
 import enum
 
 class ActionType(enum.Enum):
@@ -11,17 +12,29 @@ class ActionType(enum.Enum):
     removal = 'removal'
     adjustment = 'adjustment'
 
-class RestockHistory(db.Model):
+class RestockHistory(db.Model, SerializerMixin):
     """Model for restock actions with evaluation metrics."""
     __tablename__ = 'restock_history'
+    __table_args__ = (
+        # Per-drawer history in time order
+        db.Index('ix_restock_drawer_ts', 'drawer_id', 'restock_timestamp'),
+        # Keyset pagination order for the history listing
+        db.Index('ix_restock_ts_id', db.text('restock_timestamp DESC'), db.text('id DESC')),
+        # Warning listing: the few flagged rows, newest first, without scanning the rest
+        db.Index('ix_restock_warning_ts', db.text('restock_timestamp DESC'),
+                 postgresql_where=db.text('batch_warning_triggered')),
+        # Monthly partitions keep insert B-trees small and let time-ranged reads prune
+        {'postgresql_partition_by': 'RANGE (restock_timestamp)'},
+    )
 
-    id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    employee_id = db.Column(UUID(as_uuid=True), db.ForeignKey('employees.id', ondelete='SET NULL'), nullable=True)
+    id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, server_default=text('gen_random_uuid()'))
+    employee_id = db.Column(UUID(as_uuid=True), db.ForeignKey('employees.id', ondelete='SET NULL'), nullable=True, index=True)
     drawer_id = db.Column(UUID(as_uuid=True), db.ForeignKey('drawers.id', ondelete='SET NULL'), nullable=True)
-    batch_id = db.Column(UUID(as_uuid=True), db.ForeignKey('item_batches.id', ondelete='SET NULL'), nullable=True)
-    action_type = db.Column(Enum(ActionType), nullable=False)
+    batch_id = db.Column(UUID(as_uuid=True), db.ForeignKey('item_batches.id', ondelete='SET NULL'), nullable=True, index=True)
+    action_type = db.Column(Enum(ActionType, values_callable=enum_values), nullable=False)
     quantity_changed = db.Column(db.Integer, nullable=False)
-    restock_timestamp = db.Column(db.DateTime(timezone=True), nullable=False, default=datetime.utcnow)
+    # Part of the table's primary key, as Postgres requires for the partition column
+    restock_timestamp = db.Column(db.DateTime(timezone=True), primary_key=True, nullable=False, default=datetime.utcnow)
     completion_time_seconds = db.Column(db.Integer, nullable=True)
     accuracy_score = db.Column(Numeric(5, 2), nullable=True)  # Up to 999.99
     efficiency_score = db.Column(Numeric(5, 2), nullable=True)
@@ -29,28 +42,72 @@ class RestockHistory(db.Model):
     batch_warning_triggered = db.Column(db.Boolean, nullable=False, default=False)
     created_at = db.Column(db.DateTime(timezone=True), nullable=False, default=datetime.utcnow)
 
-    # Relationships
-    employee = db.relationship('Employee', back_populates='restock_histories')
-    drawer = db.relationship('Drawer', back_populates='restock_histories')
-    batch = db.relationship('ItemBatch', back_populates='restock_histories')
+    # Relationships; never lazy-loaded, so reads must join or eager-load them explicitly
+    employee = db.relationship('Employee', back_populates='restock_histories', lazy='raise_on_sql')
+    drawer = db.relationship('Drawer', back_populates='restock_histories', lazy='raise_on_sql')
+    batch = db.relationship('ItemBatch', back_populates='restock_histories', lazy='raise_on_sql')
+
+    # Rows are still identified by id alone in the ORM
+    __mapper_args__ = {'primary_key': [id]}
 
     def __repr__(self):
         return f'<RestockHistory {self.id}>'
 
-    def to_dict(self):
-        """Convert model to dictionary."""
-        return {
-            'id': str(self.id),
-            'employee_id': str(self.employee_id) if self.employee_id else None,
-            'drawer_id': str(self.drawer_id) if self.drawer_id else None,
-            'batch_id': str(self.batch_id) if self.batch_id else None,
-            'action_type': self.action_type.value if self.action_type else None,
-            'quantity_changed': self.quantity_changed,
-            'restock_timestamp': self.restock_timestamp.isoformat() if self.restock_timestamp else None,
-            'completion_time_seconds': self.completion_time_seconds,
-            'accuracy_score': float(self.accuracy_score) if self.accuracy_score else None,
-            'efficiency_score': float(self.efficiency_score) if self.efficiency_score else None,
-            'notes': self.notes,
-            'batch_warning_triggered': self.batch_warning_triggered,
-            'created_at': self.created_at.isoformat() if self.created_at else None
-        }
+    @staticmethod
+    def create_partitions(months_ahead=3, connection=None):
+        """
+        Create the monthly partitions from the current month up to months_ahead.
+        Intended to run on a schedule, e.g. cron calling `flask create-partitions`,
+        so inserts never fall through to the default partition.
+
+        If the schedule lapsed and a missing month already has rows in
+        restock_history_default, Postgres refuses to create its partition;
+        those rows are moved into the new partition first, with the default
+        detached for the duration of the transaction.
+
+        Args:
+            months_ahead: Number of future months to prepare
+            connection: Connection to use instead of the session (used during create_all)
+
+        Returns:
+            list: (partition name, rows moved out of the default partition) tuples
+        """
+        executor = connection if connection is not None else db.session
+        today = datetime.utcnow().date()
+        created = []
+        for offset in range(months_ahead + 1):
+            year, month = divmod(today.year * 12 + today.month - 1 + offset, 12)
+            start = date(year, month + 1, 1)
+            end_year, end_month = divmod(year * 12 + month + 1, 12)
+            end = date(end_year, end_month + 1, 1)
+            name = f'restock_history_{start:%Y_%m}'
+            bounds = f"FROM ('{start} 00:00:00+00') TO ('{end} 00:00:00+00')"
+            in_range = f"restock_timestamp >= '{start} 00:00:00+00' AND restock_timestamp < '{end} 00:00:00+00'"
+
+            if executor.execute(text('SELECT to_regclass(:name)'), {'name': name}).scalar() is not None:
+                created.append((name, 0))
+                continue
+
+            stranded = executor.execute(text(
+                f'SELECT count(*) FROM restock_history_default WHERE {in_range}'
+            )).scalar()
+            if stranded:
+                executor.execute(text('ALTER TABLE restock_history DETACH PARTITION restock_history_default'))
+            executor.execute(text(f'CREATE TABLE {name} PARTITION OF restock_history FOR VALUES {bounds}'))
+            if stranded:
+                executor.execute(text(f'INSERT INTO {name} SELECT * FROM restock_history_default WHERE {in_range}'))
+                executor.execute(text(f'DELETE FROM restock_history_default WHERE {in_range}'))
+                executor.execute(text('ALTER TABLE restock_history ATTACH PARTITION restock_history_default DEFAULT'))
+            created.append((name, stranded))
+        if connection is None:
+            db.session.commit()
+        return created
+
+
+@event.listens_for(RestockHistory.__table__, 'after_create')
+def _create_restock_partitions(target, connection, **kw):
+    # create_all() (reset_database.py) gets the same layout as the migration
+    if connection.dialect.name != 'postgresql':
+        return
+    connection.execute(text('CREATE TABLE IF NOT EXISTS restock_history_default PARTITION OF restock_history DEFAULT'))
+    RestockHistory.create_partitions(connection=connection)
@@ -0,0 +1,58 @@
+from app import db
+from app.models.mixins import SerializerMixin, enum_values
+from app.models.restock_history import ActionType, RestockHistory
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import DDL, Enum, MetaData, Numeric, event
+
+CREATE_RESTOCK_HISTORY_DAILY = DDL("""
+CREATE MATERIALIZED VIEW IF NOT EXISTS restock_history_daily AS
+SELECT employee_id,
+       drawer_id,
+       date_trunc('day', restock_timestamp) AS day,
+       action_type,
+       count(*) AS action_count,
+       avg(accuracy_score) AS avg_accuracy,
+       avg(efficiency_score) AS avg_efficiency,
+       sum(quantity_changed) AS quantity_changed
+FROM restock_history
+GROUP BY 1, 2, 3, 4;
+CREATE UNIQUE INDEX IF NOT EXISTS ux_restock_history_daily
+    ON restock_history_daily (employee_id, drawer_id, day, action_type) NULLS NOT DISTINCT
+""")
+
+DROP_RESTOCK_HISTORY_DAILY = DDL('DROP MATERIALIZED VIEW IF EXISTS restock_history_daily')
+
+# Keep the view in step with create_all()/drop_all() (used by reset_database.py)
+event.listen(RestockHistory.__table__, 'after_create', CREATE_RESTOCK_HISTORY_DAILY.execute_if(dialect='postgresql'))
+event.listen(RestockHistory.__table__, 'before_drop', DROP_RESTOCK_HISTORY_DAILY.execute_if(dialect='postgresql'))
+
+
+class RestockHistoryDaily(db.Model, SerializerMixin):
+    """Read-only daily roll-up of restock history per employee, drawer and action."""
+    # Separate metadata so create_all() and Alembic don't treat the view as a table
+    __table__ = db.Table(
+        'restock_history_daily', MetaData(),
+        db.Column('employee_id', UUID(as_uuid=True)),
+        db.Column('drawer_id', UUID(as_uuid=True)),
+        db.Column('day', db.DateTime(timezone=True)),
+        db.Column('action_type', Enum(ActionType, values_callable=enum_values)),
+        db.Column('action_count', db.BigInteger),
+        db.Column('avg_accuracy', Numeric),
+        db.Column('avg_efficiency', Numeric),
+        db.Column('quantity_changed', db.BigInteger),
+    )
+    __mapper_args__ = {
+        'primary_key': [__table__.c.employee_id, __table__.c.drawer_id, __table__.c.day, __table__.c.action_type],
+    }
+
+    def __repr__(self):
+        return f'<RestockHistoryDaily {self.day} {self.action_type}>'
+
+    @staticmethod
+    def refresh():
+        """
+        Recompute the view without blocking readers.
+        Intended to run on a schedule, e.g. cron calling `flask refresh-views`.
+        """
+        db.session.execute(db.text('REFRESH MATERIALIZED VIEW CONCURRENTLY restock_history_daily'))
+        db.session.commit()
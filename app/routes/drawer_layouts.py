@@ -2,16 +2,21 @@
 Drawer Layouts API endpoints.
 """
 from flask import Blueprint, request
+from sqlalchemy import insert, select
+from sqlalchemy.orm import raiseload
 from app import db
 from app.models import DrawerLayout, Drawer
 from app.utils.responses import success_response, error_response
-from app.utils.validators import validate_uuid, validate_required_fields, validate_positive_integer
+from app.utils.http_cache import collection_etag, not_modified, with_etag
+from app.utils.tx import transactional
+from app.utils.validators import validate_uuid, validate_required_fields, validate_positive_integer, validate_bulk_size
 from datetime import datetime
 
 bp = Blueprint('drawer_layouts', __name__, url_prefix='/api/drawer-layouts')
 
 
 @bp.route('', methods=['POST'])
+@transactional
 def create_layout():
     """
     Create a new drawer layout
@@ -61,37 +66,123 @@ def create_layout():
       500:
         description: Server error
     """
-    try:
-        data = request.get_json()
-
-        # Validate required fields
-        validate_required_fields(data, ['layout_name', 'drawer_id', 'item_type', 'designated_quantity', 'priority_order'])
-
-        # Validate drawer exists
-        drawer_uuid = validate_uuid(data['drawer_id'], 'drawer_id')
-        drawer = Drawer.query.get(drawer_uuid)
-        if not drawer:
-            return error_response('NOT_FOUND', f'Drawer {data["drawer_id"]} not found', status_code=404)
-
-        # Create layout
-        layout = DrawerLayout(
-            layout_name=data['layout_name'],
-            drawer_id=drawer_uuid,
-            item_type=data['item_type'],
-            designated_quantity=validate_positive_integer(data['designated_quantity'], 'designated_quantity'),
-            priority_order=validate_positive_integer(data['priority_order'], 'priority_order', allow_zero=True)
-        )
+    data = request.get_json()
+
+    # Validate required fields
+    validate_required_fields(data, ['layout_name', 'drawer_id', 'item_type', 'designated_quantity', 'priority_order'])
+
+    # Validate drawer exists
+    drawer_uuid = validate_uuid(data['drawer_id'], 'drawer_id')
+    if not Drawer.exists_by_id(drawer_uuid):
+        return error_response('NOT_FOUND', f'Drawer {data["drawer_id"]} not found', status_code=404)
 
-        db.session.add(layout)
-        db.session.commit()
+    # Create layout
+    layout = DrawerLayout(
+        layout_name=data['layout_name'],
+        drawer_id=drawer_uuid,
+        item_type=data['item_type'],
+        designated_quantity=validate_positive_integer(data['designated_quantity'], 'designated_quantity'),
+        priority_order=validate_positive_integer(data['priority_order'], 'priority_order', allow_zero=True)
+    )
 
-        return success_response(layout, status_code=201)
+    db.session.add(layout)
+    # Populate generated columns for the response; @transactional commits
+    db.session.flush()
 
-    except ValueError as e:
-        return error_response('VALIDATION_ERROR', str(e), status_code=400)
-    except Exception as e:
-        db.session.rollback()
-        return error_response('SERVER_ERROR', str(e), status_code=500)
+    return success_response(layout, status_code=201)
+
+
+@bp.route('/bulk', methods=['POST'])
+@transactional
+def bulk_create_layouts():
+    """
+    Create many drawer layouts in one request
+    ---
+    tags:
+      - Drawer Layouts
+    parameters:
+      - in: body
+        name: body
+        required: true
+        schema:
+          type: object
+          required:
+            - items
+          properties:
+            items:
+              type: array
+              maxItems: 1000
+              items:
+                type: object
+                required:
+                  - layout_name
+                  - drawer_id
+                  - item_type
+                  - designated_quantity
+                  - priority_order
+                properties:
+                  layout_name:
+                    type: string
+                    example: "Standard Beverage Layout"
+                  drawer_id:
+                    type: string
+                    example: "123e4567-e89b-12d3-a456-426614174000"
+                  item_type:
+                    type: string
+                    example: "Coca-Cola"
+                  designated_quantity:
+                    type: integer
+                    example: 24
+                  priority_order:
+                    type: integer
+                    example: 1
+    responses:
+      201:
+        description: Layouts created successfully
+      400:
+        description: Validation error or more than 1000 items (no layouts are created)
+      404:
+        description: One or more drawers not found
+      500:
+        description: Server error
+    """
+    data = request.get_json()
+    if not isinstance(data, dict) or not isinstance(data.get('items'), list) or not data['items']:
+        raise ValueError('Request body must contain a non-empty items list')
+    validate_bulk_size(data['items'], 'items')
+
+    # Validate the whole batch before touching the database
+    rows = []
+    for index, item in enumerate(data['items']):
+        try:
+            if not isinstance(item, dict):
+                raise ValueError('must be an object')
+            validate_required_fields(item, ['layout_name', 'drawer_id', 'item_type', 'designated_quantity', 'priority_order'])
+            rows.append({
+                'layout_name': item['layout_name'],
+                'drawer_id': validate_uuid(item['drawer_id'], 'drawer_id'),
+                'item_type': item['item_type'],
+                'designated_quantity': validate_positive_integer(item['designated_quantity'], 'designated_quantity'),
+                'priority_order': validate_positive_integer(item['priority_order'], 'priority_order', allow_zero=True)
+            })
+        except (ValueError, TypeError) as e:
+            raise ValueError(f'Layout {index}: {e}')
+
+    # One round-trip to confirm every referenced drawer exists
+    drawer_ids = {row['drawer_id'] for row in rows}
+    found = set(db.session.scalars(select(Drawer.id).where(Drawer.id.in_(drawer_ids))))
+    missing = drawer_ids - found
+    if missing:
+        return error_response(
+            'NOT_FOUND',
+            f'Drawers not found: {", ".join(sorted(str(drawer_id) for drawer_id in missing))}',
+            status_code=404
+        )
+
+    # SQLAlchemy batches the rows into multi-VALUES INSERT statements
+    layouts = db.session.scalars(insert(DrawerLayout).returning(DrawerLayout), rows).all()
+
+    return success_response(layouts, status_code=201)
 
 
 @bp.route('', methods=['GET'])
@@ -117,12 +208,15 @@ def list_layouts():
       500:
         description: Server error
     """
-    try:
-        layouts = DrawerLayout.query.all()
-        return success_response(layouts)
+    # Answer polling clients from a single aggregate when nothing changed
+    etag = collection_etag(DrawerLayout)
+    cached = not_modified(etag)
+    if cached:
+        return cached
 
-    except Exception as e:
-        return error_response('SERVER_ERROR', str(e), status_code=500)
+    # Layouts serialize from their own columns; refuse any lazy relationship load
+    layouts = db.session.scalars(select(DrawerLayout).options(raiseload('*'))).all()
+    return with_etag(success_response(layouts), etag)
 
 
 @bp.route('/<layout_id>', methods=['GET'])
@@ -156,22 +250,17 @@ def get_layout(layout_id):
       500:
         description: Server error
     """
-    try:
-        uuid_id = validate_uuid(layout_id)
-        layout = DrawerLayout.query.get(uuid_id)
-
-        if not layout:
-            return error_response('NOT_FOUND', f'Drawer layout {layout_id} not found', status_code=404)
+    uuid_id = validate_uuid(layout_id)
+    layout = db.session.get(DrawerLayout, uuid_id)
 
-        return success_response(layout)
+    if not layout:
+        return error_response('NOT_FOUND', f'Drawer layout {layout_id} not found', status_code=404)
 
-    except ValueError as e:
-        return error_response('VALIDATION_ERROR', str(e), status_code=400)
-    except Exception as e:
-        return error_response('SERVER_ERROR', str(e), status_code=500)
+    return success_response(layout)
 
 
 @bp.route('/<layout_id>', methods=['PUT'])
+@transactional
 def update_layout(layout_id):
     """
     Update a drawer layout
@@ -219,39 +308,31 @@ def update_layout(layout_id):
       500:
         description: Server error
     """
-    try:
-        uuid_id = validate_uuid(layout_id)
-        layout = DrawerLayout.query.get(uuid_id)
+    uuid_id = validate_uuid(layout_id)
+    layout = db.session.get(DrawerLayout, uuid_id)
 
-        if not layout:
-            return error_response('NOT_FOUND', f'Drawer layout {layout_id} not found', status_code=404)
+    if not layout:
+        return error_response('NOT_FOUND', f'Drawer layout {layout_id} not found', status_code=404)
 
-        data = request.get_json()
+    data = request.get_json()
 
-        # Update fields if provided
-        if 'layout_name' in data:
-            layout.layout_name = data['layout_name']
-        if 'item_type' in data:
-            layout.item_type = data['item_type']
-        if 'designated_quantity' in data:
-            layout.designated_quantity = validate_positive_integer(data['designated_quantity'], 'designated_quantity')
-        if 'priority_order' in data:
-            layout.priority_order = validate_positive_integer(data['priority_order'], 'priority_order', allow_zero=True)
+    # Update fields if provided
+    if 'layout_name' in data:
+        layout.layout_name = data['layout_name']
+    if 'item_type' in data:
+        layout.item_type = data['item_type']
+    if 'designated_quantity' in data:
+        layout.designated_quantity = validate_positive_integer(data['designated_quantity'], 'designated_quantity')
+    if 'priority_order' in data:
+        layout.priority_order = validate_positive_integer(data['priority_order'], 'priority_order', allow_zero=True)
 
-        layout.updated_at = datetime.utcnow()
-        db.session.commit()
+    layout.updated_at = datetime.utcnow()
 
-        return success_response(layout)
-
-    except ValueError as e:
-        db.session.rollback()
-        return error_response('VALIDATION_ERROR', str(e), status_code=400)
-    except Exception as e:
-        db.session.rollback()
-        return error_response('SERVER_ERROR', str(e), status_code=500)
+    return success_response(layout)
 
 
 @bp.route('/<layout_id>', methods=['DELETE'])
+@transactional
 def delete_layout(layout_id):
     """
     Delete a drawer layout
@@ -286,24 +367,15 @@ def delete_layout(layout_id):
       500:
         description: Server error
     """
-    try:
-        uuid_id = validate_uuid(layout_id)
-        layout = DrawerLayout.query.get(uuid_id)
-
-        if not layout:
-            return error_response('NOT_FOUND', f'Drawer layout {layout_id} not found', status_code=404)
+    uuid_id = validate_uuid(layout_id)
+    layout = db.session.get(DrawerLayout, uuid_id)
 
-        db.session.delete(layout)
-        db.session.commit()
+    if not layout:
+        return error_response('NOT_FOUND', f'Drawer layout {layout_id} not found', status_code=404)
 
-        return success_response({'message': 'Drawer layout deleted successfully'})
+    db.session.delete(layout)
 
-    except ValueError as e:
-        db.session.rollback()
-        return error_response('VALIDATION_ERROR', str(e), status_code=400)
-    except Exception as e:
-        db.session.rollback()
-        return error_response('SERVER_ERROR', str(e), status_code=500)
+    return success_response({'message': 'Drawer layout deleted successfully'})
 
 
 # Additional endpoint from specification
@@ -340,20 +412,20 @@ def get_layouts_by_drawer(drawer_id):
       500:
         description: Server error
     """
-    try:
-        drawer_uuid = validate_uuid(drawer_id, 'drawer_id')
+    drawer_uuid = validate_uuid(drawer_id, 'drawer_id')
 
-        # Check if drawer exists
-        drawer = Drawer.query.get(drawer_uuid)
-        if not drawer:
-            return error_response('NOT_FOUND', f'Drawer {drawer_id} not found', status_code=404)
+    # Check if drawer exists
+    if not Drawer.exists_by_id(drawer_uuid):
+        return error_response('NOT_FOUND', f'Drawer {drawer_id} not found', status_code=404)
 
-        # Get layouts for this drawer
-        layouts = DrawerLayout.query.filter_by(drawer_id=drawer_uuid).all()
+    etag = collection_etag(DrawerLayout, DrawerLayout.drawer_id == drawer_uuid)
+    cached = not_modified(etag)
+    if cached:
+        return cached
 
-        return success_response(layouts)
+    # Get layouts for this drawer
+    layouts = db.session.scalars(
+        select(DrawerLayout).options(raiseload('*')).where(DrawerLayout.drawer_id == drawer_uuid)
+    ).all()
 
-    except ValueError as e:
-        return error_response('VALIDATION_ERROR', str(e), status_code=400)
-    except Exception as e:
-        return error_response('SERVER_ERROR', str(e), status_code=500)
+    return with_etag(success_response(layouts), etag)
@@ -2,15 +2,53 @@
 Drawer Status API endpoints - CRITICAL: Includes batch stacking detection.
 """
 from flask import Blueprint, request
+from sqlalchemy import and_, bindparam, func, select, update
+from sqlalchemy.orm import raiseload
 from app import db
-from app.models import DrawerStatus, DrawerStatusEnum, Drawer, ItemBatch, DrawerBatchTracking
-from app.services.batch_tracking import create_drawer_status_with_batch, mark_batch_depleted
-from app.utils.responses import success_response, error_response, warning_response
-from app.utils.validators import validate_uuid, validate_required_fields
-from datetime import datetime
+from app.cache import cached, invalidate, drawer_status_key
+from app.models import DrawerStatus, DrawerStatusEnum, DrawerBatchTracking, CurrentDrawerStatus
+from app.services.batch_tracking import create_drawer_status_with_batch, create_drawer_statuses_with_batches, mark_batch_depleted
+from app.utils.responses import success_response, error_response, warning_response, cursor_response, streamed_response
+from app.utils.inflight import coalesce
+from app.utils.pagination import keyset_page, wants_keyset_page
+from app.utils.validators import validate_uuid, validate_required_fields, validate_bulk_size
 
 bp = Blueprint('drawer_status', __name__, url_prefix='/api/drawer-status')
 
+# Statements for the hottest reads, built once at import and executed with bound parameters
+# (rows serialize from their own columns, so listings refuse any lazy relationship load)
+_ALL_STATUSES = select(DrawerStatus).options(raiseload('*'))
+_LATEST_STATUS_BY_DRAWER = (
+    select(DrawerStatus)
+    .where(DrawerStatus.drawer_id == bindparam('drawer_id'))
+    .order_by(DrawerStatus.last_updated.desc())
+    .limit(1)
+)
+
+
+def _trackings_for_status(status_uuid, *criteria):
+    """
+    Load a status's batch trackings and check the status exists in one query.
+
+    Args:
+        status_uuid: UUID of the drawer status
+        *criteria: Extra conditions on DrawerBatchTracking
+
+    Returns:
+        list or None: Trackings in stacking order, or None if the status doesn't exist
+    """
+    rows = db.session.execute(
+        select(DrawerStatus.id, DrawerBatchTracking)
+        .outerjoin(DrawerBatchTracking, and_(DrawerBatchTracking.drawer_status_id == DrawerStatus.id, *criteria))
+        .where(DrawerStatus.id == status_uuid)
+        .order_by(DrawerBatchTracking.batch_order)
+        # Trackings serialize from their own columns; refuse any lazy relationship load
+        .options(raiseload('*'))
+    ).all()
+    if not rows:
+        return None
+    return [tracking for _, tracking in rows if tracking is not None]
+
 
 @bp.route('', methods=['POST'])
 def create_status():
@@ -93,54 +131,142 @@ def create_status():
       500:
         description: Server error
     """
-    try:
-        data = request.get_json()
+    data = request.get_json()
 
-        # Validate required fields
-        validate_required_fields(data, ['drawer_id', 'batch_id', 'quantity', 'status'])
+    # Validate required fields
+    validate_required_fields(data, ['drawer_id', 'batch_id', 'quantity', 'status'])
 
-        # Validate UUIDs
-        drawer_uuid = validate_uuid(data['drawer_id'], 'drawer_id')
-        batch_uuid = validate_uuid(data['batch_id'], 'batch_id')
+    # Validate UUIDs
+    drawer_uuid = validate_uuid(data['drawer_id'], 'drawer_id')
+    batch_uuid = validate_uuid(data['batch_id'], 'batch_id')
 
-        # Validate drawer and batch exist
-        drawer = Drawer.query.get(drawer_uuid)
-        if not drawer:
-            return error_response('NOT_FOUND', f'Drawer {data["drawer_id"]} not found', status_code=404)
+    # Validate status
+    status_enum = DrawerStatusEnum(data['status'])
 
-        batch = ItemBatch.query.get(batch_uuid)
-        if not batch:
-            return error_response('NOT_FOUND', f'Batch {data["batch_id"]} not found', status_code=404)
+    # Get employee_id if provided
+    employee_uuid = None
+    if 'employee_id' in data:
+        employee_uuid = validate_uuid(data['employee_id'], 'employee_id')
 
-        # Validate status
-        status_enum = DrawerStatusEnum(data['status'])
+    quantity = int(data['quantity'])
 
-        # Get employee_id if provided
-        employee_uuid = None
-        if 'employee_id' in data:
-            employee_uuid = validate_uuid(data['employee_id'], 'employee_id')
-
-        # Use batch tracking service (handles stacking detection)
+    def create():
+        # Use batch tracking service (handles stacking detection); it checks the
+        # drawer and batch inside the load's transaction, where a delete can't race them
         drawer_status, warning = create_drawer_status_with_batch(
             drawer_id=drawer_uuid,
             batch_id=batch_uuid,
-            quantity=int(data['quantity']),
+            quantity=quantity,
             status_value=status_enum,
             employee_id=employee_uuid
         )
+        invalidate(drawer_status_key(drawer_uuid))
+        # Plain data, since coalesced requests read it outside this session
+        return drawer_status.to_dict(), warning
+
+    # A scanner resubmitting while the first request is still running gets that request's result
+    try:
+        drawer_status, warning = coalesce(
+            ('create_status', drawer_uuid, batch_uuid, quantity, status_enum, employee_uuid), create
+        )
+    except LookupError as e:
+        return error_response('NOT_FOUND', str(e), status_code=404)
 
-        # Return with warning if batch stacking detected
-        if warning:
-            return warning_response(drawer_status, warning, status_code=207)
+    # Return with warning if batch stacking detected
+    if warning:
+        return warning_response(drawer_status, warning, status_code=207)
 
-        return success_response(drawer_status, status_code=201)
+    return success_response(drawer_status, status_code=201)
+
+
+@bp.route('/bulk', methods=['POST'])
+def bulk_create_statuses():
+    """
+    Create many drawer statuses with batch tracking in one request
+    ---
+    tags:
+      - Drawer Status
+    parameters:
+      - in: body
+        name: body
+        required: true
+        schema:
+          type: object
+          required:
+            - items
+          properties:
+            items:
+              type: array
+              maxItems: 1000
+              items:
+                type: object
+                required:
+                  - drawer_id
+                  - batch_id
+                  - quantity
+                  - status
+                properties:
+                  drawer_id:
+                    type: string
+                    example: "123e4567-e89b-12d3-a456-426614174000"
+                  batch_id:
+                    type: string
+                    example: "223e4567-e89b-12d3-a456-426614174000"
+                  quantity:
+                    type: integer
+                    example: 24
+                  status:
+                    type: string
+                    enum: [empty, partial, full, needs_restock]
+                    example: "full"
+                  employee_id:
+                    type: string
+                    example: "323e4567-e89b-12d3-a456-426614174000"
+    responses:
+      201:
+        description: Statuses created successfully
+      207:
+        description: Statuses created, but batch stacking detected for some items (see each item's warning)
+      400:
+        description: Validation error or more than 1000 items (no statuses are created)
+      404:
+        description: One or more drawers or batches not found
+      500:
+        description: Server error
+    """
+    data = request.get_json()
+    if not isinstance(data, dict) or not isinstance(data.get('items'), list) or not data['items']:
+        raise ValueError('Request body must contain a non-empty items list')
+    validate_bulk_size(data['items'], 'items')
+
+    # Validate the whole batch before touching the database
+    items = []
+    for index, item in enumerate(data['items']):
+        try:
+            if not isinstance(item, dict):
+                raise ValueError('must be an object')
+            validate_required_fields(item, ['drawer_id', 'batch_id', 'quantity', 'status'])
+            items.append({
+                'drawer_id': validate_uuid(item['drawer_id'], 'drawer_id'),
+                'batch_id': validate_uuid(item['batch_id'], 'batch_id'),
+                'quantity': int(item['quantity']),
+                'status_value': DrawerStatusEnum(item['status']),
+                'employee_id': validate_uuid(item['employee_id'], 'employee_id') if 'employee_id' in item else None
+            })
+        except (ValueError, TypeError) as e:
+            raise ValueError(f'Item {index}: {e}')
+
+    # Drawers and batches are checked inside the load's transaction, where a delete can't race them
+    drawer_ids = {item['drawer_id'] for item in items}
+    try:
+        results = create_drawer_statuses_with_batches(items)
+    except LookupError as e:
+        return error_response('NOT_FOUND', str(e), status_code=404)
+    invalidate(*(drawer_status_key(drawer_id) for drawer_id in drawer_ids))
 
-    except ValueError as e:
-        db.session.rollback()
-        return error_response('VALIDATION_ERROR', str(e), status_code=400)
-    except Exception as e:
-        db.session.rollback()
-        return error_response('SERVER_ERROR', str(e), status_code=500)
+    response = [{'drawer_status': drawer_status, 'warning': warning} for drawer_status, warning in results]
+    stacked = any(warning for _, warning in results)
+    return success_response(response, status_code=207 if stacked else 201)
 
 
 @bp.route('', methods=['GET'])
@@ -150,6 +276,22 @@ def list_statuses():
     ---
     tags:
       - Drawer Status
+    parameters:
+      - in: query
+        name: current
+        type: boolean
+        required: false
+        description: Only the most recent status per drawer, as of the last `flask refresh-views` (lags writes until then)
+      - in: query
+        name: limit
+        type: integer
+        required: false
+        description: Page size for cursor pagination (default 100, max 1000)
+      - in: query
+        name: after
+        type: string
+        required: false
+        description: next_cursor from the previous page
     responses:
       200:
         description: List of all drawer statuses
@@ -163,15 +305,22 @@ def list_statuses():
               type: array
               items:
                 type: object
+      400:
+        description: Invalid limit or cursor
       500:
         description: Server error
     """
-    try:
-        statuses = DrawerStatus.query.all()
-        return success_response(statuses)
+    if request.args.get('current', '').lower() == 'true':
+        # One row per drawer from the materialized view instead of the full event log
+        # (as of the last refresh-views run; writes don't refresh it)
+        return success_response(db.session.scalars(select(CurrentDrawerStatus)).all())
 
-    except Exception as e:
-        return error_response('SERVER_ERROR', str(e), status_code=500)
+    if wants_keyset_page():
+        statuses, limit, next_cursor = keyset_page(_ALL_STATUSES, DrawerStatus.created_at, DrawerStatus.id)
+        return cursor_response(statuses, limit, next_cursor)
+
+    # Unbounded listing: stream it so memory stays flat however many rows there are
+    return streamed_response(DrawerStatus.stream_rows(DrawerStatus.read_select()))
 
 
 @bp.route('/drawer/<drawer_id>', methods=['GET'])
@@ -205,23 +354,18 @@ def get_status_by_drawer(drawer_id):
       500:
         description: Server error
     """
-    try:
-        drawer_uuid = validate_uuid(drawer_id, 'drawer_id')
-
-        # Get the most recent status for this drawer
-        status = DrawerStatus.query.filter_by(drawer_id=drawer_uuid).order_by(
-            DrawerStatus.last_updated.desc()
-        ).first()
+    drawer_uuid = validate_uuid(drawer_id, 'drawer_id')
 
-        if not status:
-            return error_response('NOT_FOUND', f'No status found for drawer {drawer_id}', status_code=404)
+    # Get the most recent status for this drawer
+    def load():
+        status = db.session.scalars(_LATEST_STATUS_BY_DRAWER, {'drawer_id': drawer_uuid}).first()
+        return status.to_dict() if status else None
 
-        return success_response(status)
+    status = cached(drawer_status_key(drawer_uuid), load)
+    if not status:
+        return error_response('NOT_FOUND', f'No status found for drawer {drawer_id}', status_code=404)
 
-    except ValueError as e:
-        return error_response('VALIDATION_ERROR', str(e), status_code=400)
-    except Exception as e:
-        return error_response('SERVER_ERROR', str(e), status_code=500)
+    return success_response(status)
 
 
 @bp.route('/<status_id>', methods=['PUT'])
@@ -264,30 +408,32 @@ def update_status(status_id):
       500:
         description: Server error
     """
-    try:
-        uuid_id = validate_uuid(status_id)
-        status = DrawerStatus.query.get(uuid_id)
-
-        if not status:
-            return error_response('NOT_FOUND', f'Drawer status {status_id} not found', status_code=404)
-
-        data = request.get_json()
-
-        # Update fields if provided
-        if 'status' in data:
-            status.status = DrawerStatusEnum(data['status'])
+    uuid_id = validate_uuid(status_id)
+    data = request.get_json()
+
+    # Update fields if provided
+    changes = {}
+    if 'status' in data:
+        changes['status'] = DrawerStatusEnum(data['status'])
+
+    if changes:
+        # Single UPDATE ... RETURNING; last_updated is set by the column's onupdate
+        status = db.session.scalars(
+            update(DrawerStatus)
+            .where(DrawerStatus.id == uuid_id, DrawerStatus.deleted_at.is_(None))
+            .values(**changes)
+            .returning(DrawerStatus)
+        ).first()
+    else:
+        status = db.session.get(DrawerStatus, uuid_id)
 
-        status.last_updated = datetime.utcnow()
-        db.session.commit()
+    if not status:
+        return error_response('NOT_FOUND', f'Drawer status {status_id} not found', status_code=404)
 
-        return success_response(status)
+    db.session.commit()
+    invalidate(drawer_status_key(status.drawer_id))
 
-    except ValueError as e:
-        db.session.rollback()
-        return error_response('VALIDATION_ERROR', str(e), status_code=400)
-    except Exception as e:
-        db.session.rollback()
-        return error_response('SERVER_ERROR', str(e), status_code=500)
+    return success_response(status)
 
 
 @bp.route('/<status_id>', methods=['DELETE'])
@@ -325,24 +471,23 @@ def delete_status(status_id):
       500:
         description: Server error
     """
-    try:
-        uuid_id = validate_uuid(status_id)
-        status = DrawerStatus.query.get(uuid_id)
+    uuid_id = validate_uuid(status_id)
 
-        if not status:
-            return error_response('NOT_FOUND', f'Drawer status {status_id} not found', status_code=404)
+    # Soft delete; `flask purge-deleted` removes the row (and its trackings) later
+    drawer_uuid = db.session.scalar(
+        update(DrawerStatus)
+        .where(DrawerStatus.id == uuid_id, DrawerStatus.deleted_at.is_(None))
+        .values(deleted_at=func.now())
+        .returning(DrawerStatus.drawer_id)
+    )
 
-        db.session.delete(status)
-        db.session.commit()
+    if not drawer_uuid:
+        return error_response('NOT_FOUND', f'Drawer status {status_id} not found', status_code=404)
 
-        return success_response({'message': 'Drawer status deleted successfully'})
+    db.session.commit()
+    invalidate(drawer_status_key(drawer_uuid))
 
-    except ValueError as e:
-        db.session.rollback()
-        return error_response('VALIDATION_ERROR', str(e), status_code=400)
-    except Exception as e:
-        db.session.rollback()
-        return error_response('SERVER_ERROR', str(e), status_code=500)
+    return success_response({'message': 'Drawer status deleted successfully'})
 
 
 @bp.route('/<status_id>/deplete-batch', methods=['POST'])
@@ -388,29 +533,21 @@ def deplete_batch(status_id):
       500:
         description: Server error
     """
-    try:
-        status_uuid = validate_uuid(status_id)
-        data = request.get_json()
+    status_uuid = validate_uuid(status_id)
+    data = request.get_json()
 
-        # Validate required fields
-        validate_required_fields(data, ['batch_tracking_id'])
+    # Validate required fields
+    validate_required_fields(data, ['batch_tracking_id'])
 
-        tracking_uuid = validate_uuid(data['batch_tracking_id'], 'batch_tracking_id')
+    tracking_uuid = validate_uuid(data['batch_tracking_id'], 'batch_tracking_id')
 
-        # Use service to mark batch as depleted
-        tracking = mark_batch_depleted(tracking_uuid)
+    # Use service to mark batch as depleted
+    tracking = mark_batch_depleted(tracking_uuid)
 
-        if not tracking:
-            return error_response('NOT_FOUND', f'Batch tracking {data["batch_tracking_id"]} not found', status_code=404)
+    if not tracking:
+        return error_response('NOT_FOUND', f'Batch tracking {data["batch_tracking_id"]} not found', status_code=404)
 
-        return success_response(tracking)
-
-    except ValueError as e:
-        db.session.rollback()
-        return error_response('VALIDATION_ERROR', str(e), status_code=400)
-    except Exception as e:
-        db.session.rollback()
-        return error_response('SERVER_ERROR', str(e), status_code=500)
+    return success_response(tracking)
 
 
 @bp.route('/<status_id>/batches', methods=['GET'])
@@ -446,23 +583,14 @@ def list_batches_in_drawer(status_id):
       500:
         description: Server error
     """
-    try:
-        status_uuid = validate_uuid(status_id)
-
-        # Check if status exists
-        status = DrawerStatus.query.get(status_uuid)
-        if not status:
-            return error_response('NOT_FOUND', f'Drawer status {status_id} not found', status_code=404)
-
-        # Get all batch trackings
-        trackings = DrawerBatchTracking.query.filter_by(drawer_status_id=status_uuid).all()
+    status_uuid = validate_uuid(status_id)
 
-        return success_response(trackings)
+    # Get all batch trackings (None if the status doesn't exist)
+    trackings = _trackings_for_status(status_uuid)
+    if trackings is None:
+        return error_response('NOT_FOUND', f'Drawer status {status_id} not found', status_code=404)
 
-    except ValueError as e:
-        return error_response('VALIDATION_ERROR', str(e), status_code=400)
-    except Exception as e:
-        return error_response('SERVER_ERROR', str(e), status_code=500)
+    return success_response(trackings)
 
 
 @bp.route('/<status_id>/non-depleted-batches', methods=['GET'])
@@ -498,23 +626,11 @@ def list_non_depleted_batches(status_id):
       500:
         description: Server error
     """
-    try:
-        status_uuid = validate_uuid(status_id)
-
-        # Check if status exists
-        status = DrawerStatus.query.get(status_uuid)
-        if not status:
-            return error_response('NOT_FOUND', f'Drawer status {status_id} not found', status_code=404)
-
-        # Get non-depleted batches
-        trackings = DrawerBatchTracking.query.filter_by(
-            drawer_status_id=status_uuid,
-            is_depleted=False
-        ).all()
+    status_uuid = validate_uuid(status_id)
 
-        return success_response(trackings)
+    # Get non-depleted batches (None if the status doesn't exist)
+    trackings = _trackings_for_status(status_uuid, DrawerBatchTracking.is_depleted.is_(False))
+    if trackings is None:
+        return error_response('NOT_FOUND', f'Drawer status {status_id} not found', status_code=404)
 
-    except ValueError as e:
-        return error_response('VALIDATION_ERROR', str(e), status_code=400)
-    except Exception as e:
-        return error_response('SERVER_ERROR', str(e), status_code=500)
+    return success_response(trackings)
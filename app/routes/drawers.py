@@ -1,18 +1,43 @@
 """
 Drawers API endpoints.
 """
+import hashlib
+import uuid
+
 from flask import Blueprint, request, Response
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import raiseload
 from app import db
-from app.models import Drawer
-from app.utils.responses import success_response, error_response
-from app.utils.validators import validate_uuid, validate_required_fields, validate_positive_integer
-from app.utils.qr_codes import qr_png_data_uri, qr_png_bytes
-from datetime import datetime
+from app.cache import cached, invalidate, drawer_key, drawer_status_key
+from app.models import Drawer, DrawerLayout, DrawerStatus
+from app.services.batch_tracking import lock_drawers
+from app.utils.responses import success_response, error_response, cursor_response, streamed_response
+from app.utils.http_cache import not_modified
+from app.utils.pagination import keyset_page, wants_keyset_page
+from app.utils.validators import validate_uuid, validate_required_fields, validate_positive_integer, validate_bulk_size
+from app.utils.qr_codes import png_data_uri, qr_png_bytes
+from app.utils.tx import transactional
 
 bp = Blueprint('drawers', __name__, url_prefix='/api/drawers')
 
+# QR images are rendered on the request thread (~2 ms each), so a batch is kept to a few trolleys' worth
+MAX_QR_BATCH = 200
+
+# Statements for the hottest reads, built once at import and executed with bound parameters
+# (rows serialize from their own columns, so listings refuse any lazy relationship load)
+_ALL_DRAWERS = select(Drawer).options(raiseload('*'))
+_DRAWER_BY_ID = select(Drawer).where(Drawer.id == bindparam('drawer_id'))
+_DRAWER_QR = select(Drawer.qr_code, Drawer.qr_png).where(Drawer.id == bindparam('drawer_id'))
+
+
+def _stored_qr_png(drawer):
+    """PNG for a (qr_code, qr_png) row; codes generated before qr_png existed are rendered (and cached) on demand."""
+    return drawer.qr_png or qr_png_bytes(drawer.qr_code)
+
 
 @bp.route('', methods=['POST'])
+@transactional
 def create_drawer():
     """
     Create a new drawer
@@ -54,7 +79,7 @@ def create_drawer():
               example: "cold"
     responses:
       201:
-        description: Drawer created successfully
+        description: Drawer created successfully, with its QR code already generated
       400:
         description: Validation error
       409:
@@ -62,36 +87,36 @@ def create_drawer():
       500:
         description: Server error
     """
-    try:
-        data = request.get_json()
-
-        # Validate required fields
-        validate_required_fields(data, ['drawer_code', 'trolley_id', 'position', 'capacity', 'drawer_type'])
-
-        # Check if drawer_code already exists
-        existing = Drawer.query.filter_by(drawer_code=data['drawer_code']).first()
-        if existing:
-            return error_response('DUPLICATE_DRAWER', f'Drawer code {data["drawer_code"]} already exists', status_code=409)
-
-        # Create drawer
-        drawer = Drawer(
+    data = request.get_json()
+
+    # Validate required fields
+    validate_required_fields(data, ['drawer_code', 'trolley_id', 'position', 'capacity', 'drawer_type'])
+
+    # The QR payload is the drawer id, so pick the id here and store the rendered code with the row
+    drawer_id = uuid.uuid4()
+    qr_payload = str(drawer_id)
+
+    # Create drawer; a code already used by a live drawer inserts nothing, in the same round-trip
+    drawer = db.session.scalars(
+        pg_insert(Drawer)
+        .values(
+            id=drawer_id,
+            qr_code=qr_payload,
+            qr_png=qr_png_bytes(qr_payload),
             drawer_code=data['drawer_code'],
             trolley_id=data['trolley_id'],
             position=validate_positive_integer(data['position'], 'position', allow_zero=True),
             capacity=validate_positive_integer(data['capacity'], 'capacity'),
             drawer_type=data['drawer_type']
         )
+        .on_conflict_do_nothing(index_elements=[Drawer.drawer_code], index_where=Drawer.deleted_at.is_(None))
+        .returning(Drawer)
+    ).first()
 
-        db.session.add(drawer)
-        db.session.commit()
+    if drawer is None:
+        return error_response('DUPLICATE_DRAWER', f'Drawer code {data["drawer_code"]} already exists', status_code=409)
 
-        return success_response(drawer, status_code=201)
-
-    except ValueError as e:
-        return error_response('VALIDATION_ERROR', str(e), status_code=400)
-    except Exception as e:
-        db.session.rollback()
-        return error_response('SERVER_ERROR', str(e), status_code=500)
+    return success_response(drawer, status_code=201)
 
 
 @bp.route('', methods=['GET'])
@@ -101,6 +126,17 @@ def list_drawers():
     ---
     tags:
       - Drawers
+    parameters:
+      - in: query
+        name: limit
+        type: integer
+        required: false
+        description: Page size for cursor pagination (default 100, max 1000)
+      - in: query
+        name: after
+        type: string
+        required: false
+        description: next_cursor from the previous page
     responses:
       200:
         description: List of all drawers
@@ -114,18 +150,20 @@ def list_drawers():
               type: array
               items:
                 type: object
+      400:
+        description: Invalid limit or cursor
       500:
         description: Server error
     """
-    try:
-        drawers = Drawer.query.all()
-        return success_response(drawers)
+    if wants_keyset_page():
+        drawers, limit, next_cursor = keyset_page(_ALL_DRAWERS, Drawer.created_at, Drawer.id)
+        return cursor_response(drawers, limit, next_cursor)
 
-    except Exception as e:
-        return error_response('SERVER_ERROR', str(e), status_code=500)
+    # Column tuples straight from the cursor, encoded and sent in chunks as they are read
+    return streamed_response(Drawer.stream_rows(Drawer.read_select()))
 
 
-@bp.route('/<drawer_id>', methods=['GET'])
+@bp.route('/<uuid:drawer_id>', methods=['GET'])
 def get_drawer(drawer_id):
     """
     Get a specific drawer by ID
@@ -141,29 +179,23 @@ def get_drawer(drawer_id):
     responses:
       200:
         description: Drawer details
-      400:
-        description: Invalid UUID format
       404:
         description: Drawer not found
       500:
         description: Server error
     """
-    try:
-        uuid_id = validate_uuid(drawer_id)
-        drawer = Drawer.query.get(uuid_id)
-
-        if not drawer:
-            return error_response('NOT_FOUND', f'Drawer {drawer_id} not found', status_code=404)
+    def load():
+        drawer = db.session.scalars(_DRAWER_BY_ID, {'drawer_id': drawer_id}).first()
+        return drawer.to_dict() if drawer else None
 
-        return success_response(drawer)
+    drawer = cached(drawer_key(drawer_id), load)
+    if not drawer:
+        return error_response('NOT_FOUND', f'Drawer {drawer_id} not found', status_code=404)
 
-    except ValueError as e:
-        return error_response('VALIDATION_ERROR', str(e), status_code=400)
-    except Exception as e:
-        return error_response('SERVER_ERROR', str(e), status_code=500)
+    return success_response(drawer)
 
 
-@bp.route('/<drawer_id>', methods=['PUT'])
+@bp.route('/<uuid:drawer_id>', methods=['PUT'])
 def update_drawer(drawer_id):
     """
     Update a drawer
@@ -199,39 +231,40 @@ def update_drawer(drawer_id):
       500:
         description: Server error
     """
-    try:
-        uuid_id = validate_uuid(drawer_id)
-        drawer = Drawer.query.get(uuid_id)
-
-        if not drawer:
-            return error_response('NOT_FOUND', f'Drawer {drawer_id} not found', status_code=404)
-
-        data = request.get_json()
-
-        # Update fields if provided
-        if 'trolley_id' in data:
-            drawer.trolley_id = data['trolley_id']
-        if 'position' in data:
-            drawer.position = validate_positive_integer(data['position'], 'position', allow_zero=True)
-        if 'capacity' in data:
-            drawer.capacity = validate_positive_integer(data['capacity'], 'capacity')
-        if 'drawer_type' in data:
-            drawer.drawer_type = data['drawer_type']
-
-        drawer.updated_at = datetime.utcnow()
-        db.session.commit()
-
-        return success_response(drawer)
-
-    except ValueError as e:
-        db.session.rollback()
-        return error_response('VALIDATION_ERROR', str(e), status_code=400)
-    except Exception as e:
-        db.session.rollback()
-        return error_response('SERVER_ERROR', str(e), status_code=500)
-
-
-@bp.route('/<drawer_id>', methods=['DELETE'])
+    data = request.get_json()
+
+    # Update fields if provided
+    changes = {}
+    if 'trolley_id' in data:
+        changes['trolley_id'] = data['trolley_id']
+    if 'position' in data:
+        changes['position'] = validate_positive_integer(data['position'], 'position', allow_zero=True)
+    if 'capacity' in data:
+        changes['capacity'] = validate_positive_integer(data['capacity'], 'capacity')
+    if 'drawer_type' in data:
+        changes['drawer_type'] = data['drawer_type']
+
+    if changes:
+        # Single UPDATE ... RETURNING; updated_at is set by the column's onupdate
+        drawer = db.session.scalars(
+            update(Drawer)
+            .where(Drawer.id == drawer_id, Drawer.deleted_at.is_(None))
+            .values(**changes)
+            .returning(Drawer)
+        ).first()
+    else:
+        drawer = db.session.get(Drawer, drawer_id)
+
+    if not drawer:
+        return error_response('NOT_FOUND', f'Drawer {drawer_id} not found', status_code=404)
+
+    db.session.commit()
+    invalidate(drawer_key(drawer_id))
+
+    return success_response(drawer)
+
+
+@bp.route('/<uuid:drawer_id>', methods=['DELETE'])
 def delete_drawer(drawer_id):
     """
     Delete a drawer
@@ -247,37 +280,41 @@ def delete_drawer(drawer_id):
     responses:
       200:
         description: Drawer deleted successfully
-      400:
-        description: Invalid UUID format
       404:
         description: Drawer not found
       500:
         description: Server error
     """
-    try:
-        uuid_id = validate_uuid(drawer_id)
-        drawer = Drawer.query.get(uuid_id)
-
-        if not drawer:
-            return error_response('NOT_FOUND', f'Drawer {drawer_id} not found', status_code=404)
-
-        db.session.delete(drawer)
-        db.session.commit()
-
-        return success_response({'message': 'Drawer deleted successfully'})
+    # Soft delete; `flask purge-deleted` removes the row (and cascades) later.
+    # Takes the drawer's load lock, so an in-flight load either lands first or sees the delete
+    lock_drawers([drawer_id])
+    deleted = db.session.execute(
+        update(Drawer)
+        .where(Drawer.id == drawer_id, Drawer.deleted_at.is_(None))
+        .values(deleted_at=func.now())
+    ).rowcount
+
+    if not deleted:
+        return error_response('NOT_FOUND', f'Drawer {drawer_id} not found', status_code=404)
+
+    # Hide the drawer's statuses and layouts too, as the ON DELETE CASCADE would
+    for model in (DrawerStatus, DrawerLayout):
+        db.session.execute(
+            update(model)
+            .where(model.drawer_id == drawer_id, model.deleted_at.is_(None))
+            .values(deleted_at=func.now())
+        )
+    db.session.commit()
+    invalidate(drawer_key(drawer_id), drawer_status_key(drawer_id))
 
-    except ValueError as e:
-        db.session.rollback()
-        return error_response('VALIDATION_ERROR', str(e), status_code=400)
-    except Exception as e:
-        db.session.rollback()
-        return error_response('SERVER_ERROR', str(e), status_code=500)
+    return success_response({'message': 'Drawer deleted successfully'})
 
 
-@bp.route('/<drawer_id>/qr-code', methods=['POST'])
+@bp.route('/<uuid:drawer_id>/qr-code', methods=['POST'])
 def generate_drawer_qr(drawer_id):
     """
     Generate a QR code for a drawer.
+    New drawers get their QR code at creation; this (re)renders it for older drawers.
     ---
     tags:
       - Drawers
@@ -290,43 +327,109 @@ def generate_drawer_qr(drawer_id):
     responses:
       201:
         description: QR code generated successfully
-      400:
-        description: Invalid UUID format
       404:
         description: Drawer not found
       500:
         description: Server error
     """
-    try:
-        uuid_id = validate_uuid(drawer_id)
-        drawer = Drawer.query.get(uuid_id)
+    # The payload is the id itself, so the row never has to be read first
+    payload = str(drawer_id)
+    qr_png = qr_png_bytes(payload)
 
-        if not drawer:
-            return error_response('NOT_FOUND', f'Drawer {drawer_id} not found', status_code=404)
+    # Store the rendered image so reads never re-encode it, even after a restart
+    updated = db.session.execute(
+        update(Drawer)
+        .where(Drawer.id == drawer_id, Drawer.deleted_at.is_(None))
+        .values(qr_code=payload, qr_png=qr_png)
+    ).rowcount
 
-        payload = str(drawer.id)
-        qr_data_uri = qr_png_data_uri(payload)
+    if not updated:
+        return error_response('NOT_FOUND', f'Drawer {drawer_id} not found', status_code=404)
 
-        drawer.qr_code = payload
-        db.session.commit()
+    db.session.commit()
+    invalidate(drawer_key(drawer_id))
 
-        response_payload = {
-            'drawer_id': payload,
-            'qr_payload': payload,
-            'qr_code_image': qr_data_uri
-        }
+    response_payload = {
+        'drawer_id': payload,
+        'qr_payload': payload,
+        'qr_code_image': png_data_uri(qr_png)
+    }
+
+    return success_response(response_payload, status_code=201)
+
+
+@bp.route('/qr-codes:batch', methods=['POST'])
+def generate_drawer_qrs():
+    """
+    Generate QR codes for many drawers in one request (e.g. a whole trolley)
+    ---
+    tags:
+      - Drawers
+    parameters:
+      - in: body
+        name: body
+        required: true
+        schema:
+          type: object
+          required:
+            - drawer_ids
+          properties:
+            drawer_ids:
+              type: array
+              maxItems: 200
+              items:
+                type: string
+              example: ["123e4567-e89b-12d3-a456-426614174000"]
+    responses:
+      201:
+        description: QR codes generated successfully, in request order
+      400:
+        description: Validation error or more than 200 drawer ids (no QR codes are generated)
+      404:
+        description: One or more drawers not found
+      500:
+        description: Server error
+    """
+    data = request.get_json()
+    if not isinstance(data, dict) or not isinstance(data.get('drawer_ids'), list) or not data['drawer_ids']:
+        raise ValueError('Request body must contain a non-empty drawer_ids list')
+    validate_bulk_size(data['drawer_ids'], 'drawer ids', MAX_QR_BATCH)
+
+    # Validate every id first; repeats are generated once
+    drawer_ids = list(dict.fromkeys(validate_uuid(drawer_id, 'drawer_id') for drawer_id in data['drawer_ids']))
+
+    # One round-trip to confirm every drawer exists
+    missing = set(drawer_ids) - set(db.session.scalars(select(Drawer.id).where(Drawer.id.in_(drawer_ids))))
+    if missing:
+        return error_response(
+            'NOT_FOUND',
+            f'Drawers not found: {", ".join(sorted(str(drawer_id) for drawer_id in missing))}',
+            status_code=404
+        )
 
-        return success_response(response_payload, status_code=201)
+    rows = []
+    for drawer_id in drawer_ids:
+        payload = str(drawer_id)
+        rows.append({'id': drawer_id, 'qr_code': payload, 'qr_png': qr_png_bytes(payload)})
+
+    # Bulk UPDATE by primary key: one executemany and one commit for the batch
+    db.session.execute(update(Drawer), rows)
+    db.session.commit()
+    invalidate(*(drawer_key(drawer_id) for drawer_id in drawer_ids))
+
+    response_payload = [
+        {
+            'drawer_id': row['qr_code'],
+            'qr_payload': row['qr_code'],
+            'qr_code_image': png_data_uri(row['qr_png'])
+        }
+        for row in rows
+    ]
 
-    except ValueError as e:
-        db.session.rollback()
-        return error_response('VALIDATION_ERROR', str(e), status_code=400)
-    except Exception as e:
-        db.session.rollback()
-        return error_response('SERVER_ERROR', str(e), status_code=500)
+    return success_response(response_payload, status_code=201)
 
 
-@bp.route('/<drawer_id>/qr-code', methods=['GET'])
+@bp.route('/<uuid:drawer_id>/qr-code', methods=['GET'])
 def get_drawer_qr(drawer_id):
     """
     Retrieve an existing drawer QR code.
@@ -342,41 +445,29 @@ def get_drawer_qr(drawer_id):
     responses:
       200:
         description: Existing QR code
-      400:
-        description: Invalid UUID format
       404:
         description: Drawer or QR code not found
       500:
         description: Server error
     """
-    try:
-        uuid_id = validate_uuid(drawer_id)
-        drawer = Drawer.query.get(uuid_id)
+    drawer = db.session.execute(_DRAWER_QR, {'drawer_id': drawer_id}).first()
 
-        if not drawer:
-            return error_response('NOT_FOUND', f'Drawer {drawer_id} not found', status_code=404)
+    if not drawer:
+        return error_response('NOT_FOUND', f'Drawer {drawer_id} not found', status_code=404)
 
-        if not drawer.qr_code:
-            return error_response('QR_CODE_NOT_GENERATED', f'Drawer {drawer_id} does not have a QR code yet', status_code=404)
+    if not drawer.qr_code:
+        return error_response('QR_CODE_NOT_GENERATED', f'Drawer {drawer_id} does not have a QR code yet', status_code=404)
 
-        payload = drawer.qr_code
-        qr_data_uri = qr_png_data_uri(payload)
+    response_payload = {
+        'drawer_id': str(drawer_id),
+        'qr_payload': drawer.qr_code,
+        'qr_code_image': png_data_uri(_stored_qr_png(drawer))
+    }
 
-        response_payload = {
-            'drawer_id': str(drawer.id),
-            'qr_payload': payload,
-            'qr_code_image': qr_data_uri
-        }
-
-        return success_response(response_payload)
+    return success_response(response_payload)
 
-    except ValueError as e:
-        return error_response('VALIDATION_ERROR', str(e), status_code=400)
-    except Exception as e:
-        return error_response('SERVER_ERROR', str(e), status_code=500)
 
-
-@bp.route('/<drawer_id>/qr-code/image', methods=['GET'])
+@bp.route('/<uuid:drawer_id>/qr-code/image', methods=['GET'])
 def get_drawer_qr_image(drawer_id):
     """
     Retrieve the QR code image (PNG) for a drawer.
@@ -392,27 +483,30 @@ def get_drawer_qr_image(drawer_id):
     responses:
       200:
         description: PNG image for the QR code
-      400:
-        description: Invalid UUID format
       404:
         description: Drawer or QR code not found
       500:
         description: Server error
     """
-    try:
-        uuid_id = validate_uuid(drawer_id)
-        drawer = Drawer.query.get(uuid_id)
-
-        if not drawer:
-            return error_response('NOT_FOUND', f'Drawer {drawer_id} not found', status_code=404)
-
-        if not drawer.qr_code:
-            return error_response('QR_CODE_NOT_GENERATED', f'Drawer {drawer_id} does not have a QR code yet', status_code=404)
-
-        qr_bytes = qr_png_bytes(drawer.qr_code)
-        return Response(qr_bytes, mimetype='image/png')
-
-    except ValueError as e:
-        return error_response('VALIDATION_ERROR', str(e), status_code=400)
-    except Exception as e:
-        return error_response('SERVER_ERROR', str(e), status_code=500)
+    drawer = db.session.execute(_DRAWER_QR, {'drawer_id': drawer_id}).first()
+
+    if not drawer:
+        return error_response('NOT_FOUND', f'Drawer {drawer_id} not found', status_code=404)
+
+    if not drawer.qr_code:
+        return error_response('QR_CODE_NOT_GENERATED', f'Drawer {drawer_id} does not have a QR code yet', status_code=404)
+
+    # The image is a pure function of the payload, so clients holding it get a bodiless 304
+    etag = hashlib.md5(drawer.qr_code.encode()).hexdigest()
+    unchanged = not_modified(etag)
+    if unchanged:
+        return unchanged
+
+    # The payload is the drawer's own id, so the image never changes
+    response = Response(
+        _stored_qr_png(drawer),
+        mimetype='image/png',
+        headers={'Cache-Control': 'public, max-age=31536000, immutable'}
+    )
+    response.set_etag(etag)
+    return response
@@ -2,16 +2,36 @@
 Employees API endpoints.
 """
 from flask import Blueprint, request
+from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from app import db
+from app.cache import cached, invalidate, employee_key
 from app.models import Employee, EmployeeStatus
-from app.utils.responses import success_response, error_response
-from app.utils.validators import validate_uuid, validate_required_fields
-from datetime import datetime
+from app.utils.responses import success_response, error_response, streamed_response
+from app.utils.tx import transactional
+from app.utils.validators import validate_required_fields
 
 bp = Blueprint('employees', __name__, url_prefix='/api/employees')
 
+# Plain dict probe instead of the EnumMeta.__call__ lookup on every request
+_STATUS_BY_VALUE = {status.value: status for status in EmployeeStatus}
+
+
+def _parse_status(value):
+    """
+    Convert a status string to EmployeeStatus.
+
+    Raises:
+        ValueError: If value is not a valid status (same message as EmployeeStatus(value))
+    """
+    try:
+        return _STATUS_BY_VALUE[value]
+    except (KeyError, TypeError):
+        raise ValueError(f'{value!r} is not a valid EmployeeStatus')
+
 
 @bp.route('', methods=['POST'])
+@transactional
 def create_employee():
     """
     Create a new employee
@@ -69,36 +89,29 @@ def create_employee():
       500:
         description: Server error
     """
-    try:
-        data = request.get_json()
+    data = request.get_json()
 
-        # Validate required fields
-        validate_required_fields(data, ['employee_id', 'first_name', 'last_name', 'role'])
+    # Validate required fields
+    validate_required_fields(data, ['employee_id', 'first_name', 'last_name', 'role'])
 
-        # Check if employee_id already exists
-        existing = Employee.query.filter_by(employee_id=data['employee_id']).first()
-        if existing:
-            return error_response('DUPLICATE_EMPLOYEE', f'Employee ID {data["employee_id"]} already exists', status_code=409)
-
-        # Create employee
-        employee = Employee(
+    # Create employee; a duplicate employee_id inserts nothing, in the same round-trip
+    employee = db.session.scalars(
+        pg_insert(Employee)
+        .values(
             employee_id=data['employee_id'],
             first_name=data['first_name'],
             last_name=data['last_name'],
             role=data['role'],
-            status=EmployeeStatus(data.get('status', 'active'))
+            status=_parse_status(data.get('status', 'active'))
         )
+        .on_conflict_do_nothing(index_elements=[Employee.employee_id])
+        .returning(Employee)
+    ).first()
 
-        db.session.add(employee)
-        db.session.commit()
-
-        return success_response(employee, status_code=201)
+    if employee is None:
+        return error_response('DUPLICATE_EMPLOYEE', f'Employee ID {data["employee_id"]} already exists', status_code=409)
 
-    except ValueError as e:
-        return error_response('VALIDATION_ERROR', str(e), status_code=400)
-    except Exception as e:
-        db.session.rollback()
-        return error_response('SERVER_ERROR', str(e), status_code=500)
+    return success_response(employee, status_code=201)
 
 
 @bp.route('', methods=['GET'])
@@ -132,24 +145,18 @@ def list_employees():
       500:
         description: Server error
     """
-    try:
-        status_filter = request.args.get('status')
-
-        query = Employee.query
+    status_filter = request.args.get('status')
 
-        if status_filter:
-            query = query.filter_by(status=EmployeeStatus(status_filter))
+    # Column tuples straight from the cursor, encoded and sent in chunks as they are read
+    stmt = Employee.read_select()
 
-        employees = query.all()
-        return success_response(employees)
+    if status_filter:
+        stmt = stmt.where(Employee.status == _parse_status(status_filter))
 
-    except ValueError as e:
-        return error_response('VALIDATION_ERROR', str(e), status_code=400)
-    except Exception as e:
-        return error_response('SERVER_ERROR', str(e), status_code=500)
+    return streamed_response(Employee.stream_rows(stmt))
 
 
-@bp.route('/<emp_id>', methods=['GET'])
+@bp.route('/<uuid:emp_id>', methods=['GET'])
 def get_employee(emp_id):
     """
     Get a specific employee by ID
@@ -173,29 +180,23 @@ def get_employee(emp_id):
               example: success
             data:
               type: object
-      400:
-        description: Invalid UUID format
       404:
         description: Employee not found
       500:
         description: Server error
     """
-    try:
-        uuid_id = validate_uuid(emp_id)
-        employee = Employee.query.get(uuid_id)
-
-        if not employee:
-            return error_response('NOT_FOUND', f'Employee {emp_id} not found', status_code=404)
+    def load():
+        employee = db.session.get(Employee, emp_id)
+        return employee.to_dict() if employee else None
 
-        return success_response(employee)
+    employee = cached(employee_key(emp_id), load)
+    if not employee:
+        return error_response('NOT_FOUND', f'Employee {emp_id} not found', status_code=404)
 
-    except ValueError as e:
-        return error_response('VALIDATION_ERROR', str(e), status_code=400)
-    except Exception as e:
-        return error_response('SERVER_ERROR', str(e), status_code=500)
+    return success_response(employee)
 
 
-@bp.route('/<emp_id>', methods=['PUT'])
+@bp.route('/<uuid:emp_id>', methods=['PUT'])
 def update_employee(emp_id):
     """
     Update an employee
@@ -244,39 +245,34 @@ def update_employee(emp_id):
       500:
         description: Server error
     """
-    try:
-        uuid_id = validate_uuid(emp_id)
-        employee = Employee.query.get(uuid_id)
-
-        if not employee:
-            return error_response('NOT_FOUND', f'Employee {emp_id} not found', status_code=404)
+    data = request.get_json()
 
-        data = request.get_json()
+    # Update fields if provided
+    changes = {}
+    if 'first_name' in data:
+        changes['first_name'] = data['first_name']
+    if 'last_name' in data:
+        changes['last_name'] = data['last_name']
+    if 'role' in data:
+        changes['role'] = data['role']
+    if 'status' in data:
+        changes['status'] = _parse_status(data['status'])
 
-        # Update fields if provided
-        if 'first_name' in data:
-            employee.first_name = data['first_name']
-        if 'last_name' in data:
-            employee.last_name = data['last_name']
-        if 'role' in data:
-            employee.role = data['role']
-        if 'status' in data:
-            employee.status = EmployeeStatus(data['status'])
+    # Single UPDATE ... RETURNING; updated_at is set by the column's onupdate
+    employee = db.session.scalars(
+        update(Employee).where(Employee.id == emp_id).values(**changes).returning(Employee)
+    ).first()
 
-        employee.updated_at = datetime.utcnow()
-        db.session.commit()
+    if not employee:
+        return error_response('NOT_FOUND', f'Employee {emp_id} not found', status_code=404)
 
-        return success_response(employee)
+    db.session.commit()
+    invalidate(employee_key(emp_id))
 
-    except ValueError as e:
-        db.session.rollback()
-        return error_response('VALIDATION_ERROR', str(e), status_code=400)
-    except Exception as e:
-        db.session.rollback()
-        return error_response('SERVER_ERROR', str(e), status_code=500)
+    return success_response(employee)
 
 
-@bp.route('/<emp_id>', methods=['DELETE'])
+@bp.route('/<uuid:emp_id>', methods=['DELETE'])
 def delete_employee(emp_id):
     """
     Soft delete an employee (set status to inactive)
@@ -304,30 +300,23 @@ def delete_employee(emp_id):
                 message:
                   type: string
                   example: Employee marked as inactive
-      400:
-        description: Invalid UUID format
       404:
         description: Employee not found
       500:
         description: Server error
     """
-    try:
-        uuid_id = validate_uuid(emp_id)
-        employee = Employee.query.get(uuid_id)
-
-        if not employee:
-            return error_response('NOT_FOUND', f'Employee {emp_id} not found', status_code=404)
+    # Soft delete by setting status to inactive, without loading the row
+    deactivated = db.session.scalar(
+        update(Employee)
+        .where(Employee.id == emp_id)
+        .values(status=EmployeeStatus.inactive)
+        .returning(Employee.id)
+    )
 
-        # Soft delete by setting status to inactive
-        employee.status = EmployeeStatus.inactive
-        employee.updated_at = datetime.utcnow()
-        db.session.commit()
+    if not deactivated:
+        return error_response('NOT_FOUND', f'Employee {emp_id} not found', status_code=404)
 
-        return success_response({'message': 'Employee marked as inactive'})
+    db.session.commit()
+    invalidate(employee_key(emp_id))
 
-    except ValueError as e:
-        db.session.rollback()
-        return error_response('VALIDATION_ERROR', str(e), status_code=400)
-    except Exception as e:
-        db.session.rollback()
-        return error_response('SERVER_ERROR', str(e), status_code=500)
+    return success_response({'message': 'Employee marked as inactive'})
@@ -1,17 +1,51 @@
 """
 Items (Batches) API endpoints.
 """
-from flask import Blueprint, request
+from flask import Blueprint, request, url_for
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import raiseload
 from app import db
+from app.cache import cached_view
 from app.models import ItemBatch, BatchStatus
-from app.utils.responses import success_response, error_response, paginated_response
+from app.services.response_cache import ITEMS
+from app.utils.http_cache import not_modified, row_etag, with_etag
+from app.utils.pagination import estimated_row_count, keyset_page, wants_keyset_page
+from app.utils.responses import success_response, error_response, paginated_response, cursor_response, streamed_response
+from app.utils.tx import transactional
 from app.utils.validators import validate_uuid, validate_required_fields, validate_positive_integer
 from datetime import datetime
 
 bp = Blueprint('items', __name__, url_prefix='/api/items')
 
+# Plain dict probe instead of the EnumMeta.__call__ lookup on every request
+_STATUS_BY_VALUE = {status.value: status for status in BatchStatus}
+
+
+def _parse_status(value):
+    """
+    Convert a status string to BatchStatus.
+
+    Raises:
+        ValueError: If value is not a valid status (same message as BatchStatus(value))
+    """
+    try:
+        return _STATUS_BY_VALUE[value]
+    except (KeyError, TypeError):
+        raise ValueError(f'{value!r} is not a valid BatchStatus')
+
+
+# Coercion for each field PUT /api/items/<id> accepts; other keys are ignored
+_UPDATE_FIELDS = {
+    'item_type': lambda value: value,
+    'quantity': lambda value: validate_positive_integer(value, 'quantity'),
+    'expiry_date': lambda value: datetime.fromisoformat(value).date(),
+    'status': _parse_status,
+}
+
 
 @bp.route('', methods=['POST'])
+@transactional
 def create_item():
     """
     Create a new item batch
@@ -75,40 +109,34 @@ def create_item():
       500:
         description: Server error
     """
-    try:
-        data = request.get_json()
-
-        # Validate required fields
-        validate_required_fields(data, ['item_type', 'batch_number', 'quantity', 'expiry_date'])
+    data = request.get_json()
 
-        # Check if batch_number already exists
-        existing = ItemBatch.query.filter_by(batch_number=data['batch_number']).first()
-        if existing:
-            return error_response('DUPLICATE_BATCH', f'Batch number {data["batch_number"]} already exists', status_code=409)
+    # Validate required fields
+    validate_required_fields(data, ['item_type', 'batch_number', 'quantity', 'expiry_date'])
 
-        # Create item batch
-        item = ItemBatch(
+    # Create item batch; a duplicate batch_number inserts nothing, in the same round-trip
+    item = db.session.scalars(
+        pg_insert(ItemBatch)
+        .values(
             item_type=data['item_type'],
             batch_number=data['batch_number'],
             quantity=validate_positive_integer(data['quantity'], 'quantity'),
             expiry_date=datetime.fromisoformat(data['expiry_date']).date(),
             received_date=datetime.fromisoformat(data['received_date']) if 'received_date' in data else datetime.utcnow(),
-            status=BatchStatus(data.get('status', 'available'))
+            status=_parse_status(data.get('status', 'available'))
         )
+        .on_conflict_do_nothing(index_elements=[ItemBatch.batch_number])
+        .returning(ItemBatch)
+    ).first()
 
-        db.session.add(item)
-        db.session.commit()
+    if item is None:
+        return error_response('DUPLICATE_BATCH', f'Batch number {data["batch_number"]} already exists', status_code=409)
 
-        return success_response(item, status_code=201)
-
-    except ValueError as e:
-        return error_response('VALIDATION_ERROR', str(e), status_code=400)
-    except Exception as e:
-        db.session.rollback()
-        return error_response('SERVER_ERROR', str(e), status_code=500)
+    return success_response(item, status_code=201)
 
 
 @bp.route('', methods=['GET'])
+@cached_view(ITEMS)
 def list_items():
     """
     List all item batches with pagination and filtering
@@ -126,6 +154,16 @@ def list_items():
         type: integer
         default: 20
         description: Items per page
+      - in: query
+        name: limit
+        type: integer
+        required: false
+        description: Page size for cursor pagination (default 100, max 1000; replaces page/per_page)
+      - in: query
+        name: after
+        type: string
+        required: false
+        description: next_cursor from the previous page
       - in: query
         name: status
         type: string
@@ -159,39 +197,41 @@ def list_items():
                   type: integer
                 total_pages:
                   type: integer
+                total_estimated:
+                  type: boolean
+                  description: Present (true) when total_items is a planner estimate for a large unfiltered listing
       400:
         description: Validation error
       500:
         description: Server error
     """
-    try:
-        # Pagination parameters
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 20, type=int)
-
-        # Filter parameters
-        status_filter = request.args.get('status')
-        item_type_filter = request.args.get('item_type')
+    # Filter parameters
+    status_filter = request.args.get('status')
+    item_type_filter = request.args.get('item_type')
 
-        # Build query
-        query = ItemBatch.query
+    conditions = []
+    if status_filter:
+        conditions.append(ItemBatch.status == _parse_status(status_filter))
+    if item_type_filter:
+        conditions.append(ItemBatch.item_type == item_type_filter)
 
-        if status_filter:
-            query = query.filter_by(status=BatchStatus(status_filter))
+    # Cursor pages are an index range scan with no COUNT, however deep the client pages
+    if wants_keyset_page():
+        stmt = select(ItemBatch).options(raiseload('*')).where(*conditions)
+        items, limit, next_cursor = keyset_page(stmt, ItemBatch.created_at, ItemBatch.id)
+        return cursor_response(items, limit, next_cursor)
 
-        if item_type_filter:
-            query = query.filter_by(item_type=item_type_filter)
+    # Pagination parameters
+    page = request.args.get('page', 1, type=int)
+    per_page = request.args.get('per_page', 20, type=int)
 
-        # Apply pagination
-        total = query.count()
-        items = query.offset((page - 1) * per_page).limit(per_page).all()
+    # Unfiltered, a large table reports the planner's row estimate instead of counting every row
+    estimate = None if conditions else estimated_row_count(ItemBatch.__table__)
 
-        return paginated_response(items, page, per_page, total)
+    # Page rows and the total in one statement (rows are read without building ORM objects)
+    items, total = ItemBatch.fetch_page(ItemBatch.read_select().where(*conditions), page, per_page, total=estimate)
 
-    except ValueError as e:
-        return error_response('VALIDATION_ERROR', str(e), status_code=400)
-    except Exception as e:
-        return error_response('SERVER_ERROR', str(e), status_code=500)
+    return paginated_response(items, page, per_page, total, estimated=estimate is not None)
 
 
 @bp.route('/<item_id>', methods=['GET'])
@@ -225,22 +265,22 @@ def get_item(item_id):
       500:
         description: Server error
     """
-    try:
-        uuid_id = validate_uuid(item_id)
-        item = ItemBatch.query.get(uuid_id)
+    uuid_id = validate_uuid(item_id)
+    item = db.session.get(ItemBatch, uuid_id)
 
-        if not item:
-            return error_response('NOT_FOUND', f'Item batch {item_id} not found', status_code=404)
+    if not item:
+        return error_response('NOT_FOUND', f'Item batch {item_id} not found', status_code=404)
 
-        return success_response(item)
+    etag = row_etag(item, item.updated_at)
+    cached = not_modified(etag)
+    if cached:
+        return cached
 
-    except ValueError as e:
-        return error_response('VALIDATION_ERROR', str(e), status_code=400)
-    except Exception as e:
-        return error_response('SERVER_ERROR', str(e), status_code=500)
+    return with_etag(success_response(item), etag)
 
 
 @bp.route('/<item_id>', methods=['PUT'])
+@transactional
 def update_item(item_id):
     """
     Update an item batch
@@ -291,39 +331,28 @@ def update_item(item_id):
       500:
         description: Server error
     """
-    try:
-        uuid_id = validate_uuid(item_id)
-        item = ItemBatch.query.get(uuid_id)
-
-        if not item:
-            return error_response('NOT_FOUND', f'Item batch {item_id} not found', status_code=404)
+    uuid_id = validate_uuid(item_id)
+    data = request.get_json()
 
-        data = request.get_json()
+    # Update fields if provided
+    changes = {field: coerce(data[field]) for field, coerce in _UPDATE_FIELDS.items() if field in data}
 
-        # Update fields if provided
-        if 'item_type' in data:
-            item.item_type = data['item_type']
-        if 'quantity' in data:
-            item.quantity = validate_positive_integer(data['quantity'], 'quantity')
-        if 'expiry_date' in data:
-            item.expiry_date = datetime.fromisoformat(data['expiry_date']).date()
-        if 'status' in data:
-            item.status = BatchStatus(data['status'])
+    # Single UPDATE ... RETURNING instead of loading the row first
+    item = db.session.scalars(
+        update(ItemBatch)
+        .where(ItemBatch.id == uuid_id)
+        .values(**changes, updated_at=datetime.utcnow())
+        .returning(ItemBatch)
+    ).first()
 
-        item.updated_at = datetime.utcnow()
-        db.session.commit()
+    if not item:
+        return error_response('NOT_FOUND', f'Item batch {item_id} not found', status_code=404)
 
-        return success_response(item)
-
-    except ValueError as e:
-        db.session.rollback()
-        return error_response('VALIDATION_ERROR', str(e), status_code=400)
-    except Exception as e:
-        db.session.rollback()
-        return error_response('SERVER_ERROR', str(e), status_code=500)
+    return success_response(item)
 
 
 @bp.route('/<item_id>', methods=['DELETE'])
+@transactional
 def delete_item(item_id):
     """
     Soft delete an item batch (set status to depleted)
@@ -358,35 +387,27 @@ def delete_item(item_id):
       500:
         description: Server error
     """
-    try:
-        uuid_id = validate_uuid(item_id)
-        item = ItemBatch.query.get(uuid_id)
-
-        if not item:
-            return error_response('NOT_FOUND', f'Item batch {item_id} not found', status_code=404)
+    uuid_id = validate_uuid(item_id)
+    item = db.session.get(ItemBatch, uuid_id)
 
-        # Soft delete by setting status to depleted
-        item.status = BatchStatus.depleted
-        item.updated_at = datetime.utcnow()
-        db.session.commit()
+    if not item:
+        return error_response('NOT_FOUND', f'Item batch {item_id} not found', status_code=404)
 
-        return success_response({'message': 'Item batch marked as depleted'})
+    # Soft delete by setting status to depleted
+    item.status = BatchStatus.depleted
+    item.updated_at = datetime.utcnow()
 
-    except ValueError as e:
-        db.session.rollback()
-        return error_response('VALIDATION_ERROR', str(e), status_code=400)
-    except Exception as e:
-        db.session.rollback()
-        return error_response('SERVER_ERROR', str(e), status_code=500)
+    return success_response({'message': 'Item batch marked as depleted'})
 
 
 @bp.route('/status/<status>', methods=['GET'])
 def get_items_by_status(status):
     """
-    Get all items filtered by status
+    Get all items filtered by status (deprecated, use GET /api/items?status=)
     ---
     tags:
       - Items
+    deprecated: true
     parameters:
       - in: path
         name: status
@@ -412,13 +433,13 @@ def get_items_by_status(status):
       500:
         description: Server error
     """
-    try:
-        status_enum = BatchStatus(status)
-        items = ItemBatch.query.filter_by(status=status_enum).all()
-
-        return success_response(items)
-
-    except ValueError as e:
-        return error_response('VALIDATION_ERROR', f'Invalid status: {status}', status_code=400)
-    except Exception as e:
-        return error_response('SERVER_ERROR', str(e), status_code=500)
+    status_enum = _STATUS_BY_VALUE.get(status)
+    if status_enum is None:
+        raise ValueError(f'Invalid status: {status}')
+
+    # Unbounded listing: stream it so memory stays flat however many rows match
+    stmt = ItemBatch.read_select().where(ItemBatch.status == status_enum)
+    response, status_code = streamed_response(ItemBatch.stream_rows(stmt))
+    response.headers['Deprecation'] = 'true'
+    response.headers['Link'] = f'<{url_for("items.list_items", status=status)}>; rel="successor-version"'
+    return response, status_code
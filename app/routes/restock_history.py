@@ -2,17 +2,93 @@
 Restock History API endpoints - includes performance evaluation.
 """
 from flask import Blueprint, request
+from sqlalchemy import insert, select
+from sqlalchemy.orm import raiseload
 from app import db
 from app.models import RestockHistory, ActionType, Employee, Drawer, ItemBatch
+from app.cache import cached_view
 from app.services.evaluation import calculate_employee_performance, get_employee_leaderboard
-from app.utils.responses import success_response, error_response, paginated_response
-from app.utils.validators import validate_uuid, validate_required_fields, validate_numeric_range
+from app.services.response_cache import RESTOCK
+from app.utils.http_cache import not_modified, row_etag, with_etag
+from app.utils.pagination import estimated_row_count, keyset_page, wants_keyset_page
+from app.utils.responses import success_response, error_response, paginated_response, cursor_response
+from app.utils.tx import transactional
+from app.utils.validators import validate_uuid, validate_required_fields, validate_numeric_range, validate_bulk_size
 from datetime import datetime
 
 bp = Blueprint('restock_history', __name__, url_prefix='/api/restock-history')
 
+# Plain dict probe instead of the EnumMeta.__call__ lookup on every request
+_ACTION_TYPE_BY_VALUE = {action_type.value: action_type for action_type in ActionType}
+
+
+def _parse_action_type(value):
+    """
+    Convert an action type string to ActionType.
+
+    Raises:
+        ValueError: If value is not a valid action type (same message as ActionType(value))
+    """
+    try:
+        return _ACTION_TYPE_BY_VALUE[value]
+    except (KeyError, TypeError):
+        raise ValueError(f'{value!r} is not a valid ActionType')
+
+
+def _restock_values(data):
+    """
+    Validate one restock record from a request body.
+
+    Args:
+        data: Record fields as sent by the client
+
+    Returns:
+        dict: Column values for RestockHistory (restock_timestamp is set by the caller)
+
+    Raises:
+        ValueError: If a field is missing or invalid
+    """
+    # Validate required fields
+    validate_required_fields(data, ['action_type', 'quantity_changed'])
+
+    # Validate UUIDs (nullable foreign keys)
+    employee_uuid = None
+    if 'employee_id' in data and data['employee_id']:
+        employee_uuid = validate_uuid(data['employee_id'], 'employee_id')
+
+    drawer_uuid = None
+    if 'drawer_id' in data and data['drawer_id']:
+        drawer_uuid = validate_uuid(data['drawer_id'], 'drawer_id')
+
+    batch_uuid = None
+    if 'batch_id' in data and data['batch_id']:
+        batch_uuid = validate_uuid(data['batch_id'], 'batch_id')
+
+    # Validate metrics if provided
+    accuracy_score = None
+    if 'accuracy_score' in data and data['accuracy_score'] is not None:
+        accuracy_score = validate_numeric_range(data['accuracy_score'], 'accuracy_score', 0, 999.99)
+
+    efficiency_score = None
+    if 'efficiency_score' in data and data['efficiency_score'] is not None:
+        efficiency_score = validate_numeric_range(data['efficiency_score'], 'efficiency_score', 0, 999.99)
+
+    return {
+        'employee_id': employee_uuid,
+        'drawer_id': drawer_uuid,
+        'batch_id': batch_uuid,
+        'action_type': _parse_action_type(data['action_type']),
+        'quantity_changed': int(data['quantity_changed']),
+        'completion_time_seconds': data.get('completion_time_seconds'),
+        'accuracy_score': accuracy_score,
+        'efficiency_score': efficiency_score,
+        'notes': data.get('notes'),
+        'batch_warning_triggered': data.get('batch_warning_triggered', False)
+    }
+
 
 @bp.route('', methods=['POST'])
+@transactional
 def create_restock_record():
     """
     Log a new restock action with pre-calculated metrics
@@ -88,62 +164,115 @@ def create_restock_record():
       500:
         description: Server error
     """
-    try:
-        data = request.get_json()
-
-        # Validate required fields
-        validate_required_fields(data, ['action_type', 'quantity_changed'])
-
-        # Validate UUIDs (nullable foreign keys)
-        employee_uuid = None
-        if 'employee_id' in data and data['employee_id']:
-            employee_uuid = validate_uuid(data['employee_id'], 'employee_id')
-
-        drawer_uuid = None
-        if 'drawer_id' in data and data['drawer_id']:
-            drawer_uuid = validate_uuid(data['drawer_id'], 'drawer_id')
-
-        batch_uuid = None
-        if 'batch_id' in data and data['batch_id']:
-            batch_uuid = validate_uuid(data['batch_id'], 'batch_id')
-
-        # Validate action type
-        action_type_enum = ActionType(data['action_type'])
-
-        # Validate metrics if provided
-        accuracy_score = None
-        if 'accuracy_score' in data and data['accuracy_score'] is not None:
-            accuracy_score = validate_numeric_range(data['accuracy_score'], 'accuracy_score', 0, 999.99)
-
-        efficiency_score = None
-        if 'efficiency_score' in data and data['efficiency_score'] is not None:
-            efficiency_score = validate_numeric_range(data['efficiency_score'], 'efficiency_score', 0, 999.99)
-
-        # Create restock record
-        record = RestockHistory(
-            employee_id=employee_uuid,
-            drawer_id=drawer_uuid,
-            batch_id=batch_uuid,
-            action_type=action_type_enum,
-            quantity_changed=int(data['quantity_changed']),
-            restock_timestamp=datetime.utcnow(),
-            completion_time_seconds=data.get('completion_time_seconds'),
-            accuracy_score=accuracy_score,
-            efficiency_score=efficiency_score,
-            notes=data.get('notes'),
-            batch_warning_triggered=data.get('batch_warning_triggered', False)
-        )
-
-        db.session.add(record)
-        db.session.commit()
-
-        return success_response(record, status_code=201)
-
-    except ValueError as e:
-        return error_response('VALIDATION_ERROR', str(e), status_code=400)
-    except Exception as e:
-        db.session.rollback()
-        return error_response('SERVER_ERROR', str(e), status_code=500)
+    data = request.get_json()
+
+    # Create restock record
+    record = RestockHistory(**_restock_values(data), restock_timestamp=datetime.utcnow())
+
+    db.session.add(record)
+    # Populate generated columns for the response; @transactional commits
+    db.session.flush()
+
+    return success_response(record, status_code=201)
+
+
+@bp.route('/bulk', methods=['POST'])
+@transactional
+def bulk_create_restock_records():
+    """
+    Log many restock actions in one request
+    ---
+    tags:
+      - Restock History
+    parameters:
+      - in: body
+        name: body
+        required: true
+        schema:
+          type: object
+          required:
+            - items
+          properties:
+            items:
+              type: array
+              maxItems: 1000
+              items:
+                type: object
+                required:
+                  - action_type
+                  - quantity_changed
+                properties:
+                  employee_id:
+                    type: string
+                    example: "123e4567-e89b-12d3-a456-426614174000"
+                  drawer_id:
+                    type: string
+                    example: "223e4567-e89b-12d3-a456-426614174000"
+                  batch_id:
+                    type: string
+                    example: "323e4567-e89b-12d3-a456-426614174000"
+                  action_type:
+                    type: string
+                    enum: [restock, removal, adjustment]
+                    example: "restock"
+                  quantity_changed:
+                    type: integer
+                    example: 24
+                  completion_time_seconds:
+                    type: integer
+                    example: 120
+                  accuracy_score:
+                    type: number
+                    example: 95.5
+                  efficiency_score:
+                    type: number
+                    example: 88.3
+                  notes:
+                    type: string
+                    example: "Restocked during evening shift"
+                  batch_warning_triggered:
+                    type: boolean
+                    example: false
+    responses:
+      201:
+        description: Records created successfully
+        schema:
+          type: object
+          properties:
+            status:
+              type: string
+              example: success
+            data:
+              type: object
+              properties:
+                created:
+                  type: integer
+                  example: 250
+      400:
+        description: Validation error or more than 1000 items (no records are created)
+      500:
+        description: Server error
+    """
+    data = request.get_json()
+    if not isinstance(data, dict) or not isinstance(data.get('items'), list) or not data['items']:
+        raise ValueError('Request body must contain a non-empty items list')
+    validate_bulk_size(data['items'], 'items')
+
+    # Validate the whole batch before touching the database
+    restock_timestamp = datetime.utcnow()
+    rows = []
+    for index, item in enumerate(data['items']):
+        try:
+            if not isinstance(item, dict):
+                raise ValueError('must be an object')
+            rows.append({**_restock_values(item), 'restock_timestamp': restock_timestamp})
+        except (ValueError, TypeError) as e:
+            raise ValueError(f'Record {index}: {e}')
+
+    # SQLAlchemy batches the rows into multi-VALUES INSERT statements
+    db.session.execute(insert(RestockHistory), rows)
+
+    return success_response({'created': len(rows)}, status_code=201)
 
 
 @bp.route('', methods=['GET'])
@@ -164,6 +293,16 @@ def list_restock_history():
         type: integer
         default: 20
         description: Items per page
+      - in: query
+        name: limit
+        type: integer
+        required: false
+        description: Page size for cursor pagination (default 100, max 1000; replaces page/per_page)
+      - in: query
+        name: after
+        type: string
+        required: false
+        description: next_cursor from the previous page
     responses:
       200:
         description: Paginated list of restock records
@@ -188,25 +327,36 @@ def list_restock_history():
                   type: integer
                 total_pages:
                   type: integer
+                total_estimated:
+                  type: boolean
+                  description: Present (true) when total_items is a planner estimate for a large unfiltered listing
+      400:
+        description: Invalid limit or cursor
       500:
         description: Server error
     """
-    try:
-        # Pagination parameters
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 20, type=int)
+    # Cursor pages seek on (restock_timestamp, id) instead of counting and skipping rows
+    if wants_keyset_page():
+        stmt = select(RestockHistory).options(raiseload('*'))
+        records, limit, next_cursor = keyset_page(stmt, RestockHistory.restock_timestamp, RestockHistory.id)
+        return cursor_response(records, limit, next_cursor)
 
-        # Build query
-        query = RestockHistory.query.order_by(RestockHistory.restock_timestamp.desc())
+    # Pagination parameters
+    page = request.args.get('page', 1, type=int)
+    per_page = request.args.get('per_page', 20, type=int)
 
-        # Apply pagination
-        total = query.count()
-        records = query.offset((page - 1) * per_page).limit(per_page).all()
+    # A large history reports the planner's row estimate instead of counting every row
+    estimate = estimated_row_count(RestockHistory.__table__)
 
-        return paginated_response(records, page, per_page, total)
+    # Page rows and the total in one statement (rows are read without building ORM objects)
+    records, total = RestockHistory.fetch_page(
+        RestockHistory.read_select().order_by(RestockHistory.restock_timestamp.desc()),
+        page,
+        per_page,
+        total=estimate
+    )
 
-    except Exception as e:
-        return error_response('SERVER_ERROR', str(e), status_code=500)
+    return paginated_response(records, page, per_page, total, estimated=estimate is not None)
 
 
 @bp.route('/<record_id>', methods=['GET'])
@@ -240,19 +390,19 @@ def get_restock_record(record_id):
       500:
         description: Server error
     """
-    try:
-        uuid_id = validate_uuid(record_id)
-        record = RestockHistory.query.get(uuid_id)
+    uuid_id = validate_uuid(record_id)
+    record = db.session.get(RestockHistory, uuid_id)
 
-        if not record:
-            return error_response('NOT_FOUND', f'Restock record {record_id} not found', status_code=404)
+    if not record:
+        return error_response('NOT_FOUND', f'Restock record {record_id} not found', status_code=404)
 
-        return success_response(record)
+    # Records are never edited after logging, so created_at pins the body
+    etag = row_etag(record, record.created_at)
+    cached = not_modified(etag)
+    if cached:
+        return cached
 
-    except ValueError as e:
-        return error_response('VALIDATION_ERROR', str(e), status_code=400)
-    except Exception as e:
-        return error_response('SERVER_ERROR', str(e), status_code=500)
+    return with_etag(success_response(record), etag)
 
 
 @bp.route('/employee/<employee_id>', methods=['GET'])
@@ -288,28 +438,24 @@ def get_history_by_employee(employee_id):
       500:
         description: Server error
     """
-    try:
-        employee_uuid = validate_uuid(employee_id, 'employee_id')
+    employee_uuid = validate_uuid(employee_id, 'employee_id')
 
-        # Check if employee exists
-        employee = Employee.query.get(employee_uuid)
-        if not employee:
-            return error_response('NOT_FOUND', f'Employee {employee_id} not found', status_code=404)
+    # Check if employee exists
+    if not Employee.exists_by_id(employee_uuid):
+        return error_response('NOT_FOUND', f'Employee {employee_id} not found', status_code=404)
 
-        # Get history
-        records = RestockHistory.query.filter_by(employee_id=employee_uuid).order_by(
-            RestockHistory.restock_timestamp.desc()
-        ).all()
+    # Get history (column rows; no relationship is loaded per record)
+    records = RestockHistory.fetch_rows(
+        RestockHistory.read_select()
+        .where(RestockHistory.employee_id == employee_uuid)
+        .order_by(RestockHistory.restock_timestamp.desc())
+    )
 
-        return success_response(records)
-
-    except ValueError as e:
-        return error_response('VALIDATION_ERROR', str(e), status_code=400)
-    except Exception as e:
-        return error_response('SERVER_ERROR', str(e), status_code=500)
+    return success_response(records)
 
 
 @bp.route('/warnings', methods=['GET'])
+@cached_view(RESTOCK)
 def get_warning_records():
     """
     Get all restock records where batch stacking warnings were triggered
@@ -333,19 +479,18 @@ def get_warning_records():
       500:
         description: Server error
     """
-    try:
-        records = RestockHistory.query.filter_by(batch_warning_triggered=True).order_by(
-            RestockHistory.restock_timestamp.desc()
-        ).all()
+    records = RestockHistory.fetch_rows(
+        RestockHistory.read_select()
+        .where(RestockHistory.batch_warning_triggered.is_(True))
+        .order_by(RestockHistory.restock_timestamp.desc())
+    )
 
-        return success_response(records)
-
-    except Exception as e:
-        return error_response('SERVER_ERROR', str(e), status_code=500)
+    return success_response(records)
 
 
 # Performance evaluation endpoints
 @bp.route('/performance/<employee_id>', methods=['GET'])
+@cached_view(RESTOCK)
 def get_employee_performance(employee_id):
     """
     Get aggregated performance metrics for an employee
@@ -387,24 +532,19 @@ def get_employee_performance(employee_id):
       500:
         description: Server error
     """
-    try:
-        employee_uuid = validate_uuid(employee_id, 'employee_id')
-
-        # Use evaluation service
-        performance = calculate_employee_performance(employee_uuid)
+    employee_uuid = validate_uuid(employee_id, 'employee_id')
 
-        if not performance:
-            return error_response('NOT_FOUND', f'Employee {employee_id} not found', status_code=404)
+    # Use evaluation service
+    performance = calculate_employee_performance(employee_uuid)
 
-        return success_response(performance)
+    if not performance:
+        return error_response('NOT_FOUND', f'Employee {employee_id} not found', status_code=404)
 
-    except ValueError as e:
-        return error_response('VALIDATION_ERROR', str(e), status_code=400)
-    except Exception as e:
-        return error_response('SERVER_ERROR', str(e), status_code=500)
+    return success_response(performance)
 
 
 @bp.route('/leaderboard', methods=['GET'])
+@cached_view(RESTOCK, ttl=300)
 def get_leaderboard():
     """
     Get employee rankings by performance metrics
@@ -450,19 +590,15 @@ def get_leaderboard():
       500:
         description: Server error
     """
-    try:
-        # Query parameters
-        metric = request.args.get('metric', 'accuracy_score')
-        limit = request.args.get('limit', 10, type=int)
-
-        # Validate metric
-        if metric not in ['accuracy_score', 'efficiency_score']:
-            return error_response('VALIDATION_ERROR', 'Metric must be accuracy_score or efficiency_score', status_code=400)
+    # Query parameters
+    metric = request.args.get('metric', 'accuracy_score')
+    limit = request.args.get('limit', 10, type=int)
 
-        # Use evaluation service
-        leaderboard = get_employee_leaderboard(metric=metric, limit=limit)
+    # Validate metric
+    if metric not in ['accuracy_score', 'efficiency_score']:
+        return error_response('VALIDATION_ERROR', 'Metric must be accuracy_score or efficiency_score', status_code=400)
 
-        return success_response(leaderboard)
+    # Use evaluation service
+    leaderboard = get_employee_leaderboard(metric=metric, limit=limit)
 
-    except Exception as e:
-        return error_response('SERVER_ERROR', str(e), status_code=500)
+    return success_response(leaderboard)
@@ -2,8 +2,101 @@
 Batch tracking service - implements critical batch stacking prevention logic.
 """
 from datetime import datetime
+from sqlalchemy import func, insert, select, update
 from app import db
-from app.models import DrawerStatus, DrawerBatchTracking, ItemBatch, RestockHistory, ActionType, BatchStatus
+from app.models import Drawer, DrawerStatus, DrawerBatchTracking, ItemBatch, RestockHistory, ActionType, BatchStatus
+
+
+def lock_drawers(drawer_ids):
+    """
+    Serialize stacking check + load per drawer for the current transaction.
+
+    Takes a transaction-scoped advisory lock per drawer (released on commit or
+    rollback), so two concurrent loads into the same drawer can't both miss
+    each other's batch. Locks are taken in a fixed order to avoid deadlocks.
+    No-op on databases without advisory locks (SQLite in tests).
+
+    Args:
+        drawer_ids: UUIDs of the drawers about to be loaded
+    """
+    if db.session.get_bind().dialect.name != 'postgresql':
+        return
+    for drawer_id in sorted(str(drawer_id) for drawer_id in drawer_ids):
+        db.session.execute(select(func.pg_advisory_xact_lock(func.hashtext(drawer_id))))
+
+
+def _not_found(noun, plural, missing):
+    """Roll back (releasing the drawer locks) and raise LookupError naming the missing ids."""
+    db.session.rollback()
+    if len(missing) == 1:
+        raise LookupError(f'{noun} {missing.pop()} not found')
+    raise LookupError(f'{plural} not found: {", ".join(sorted(str(row_id) for row_id in missing))}')
+
+
+def _require_live_drawers(drawer_ids):
+    """
+    Confirm, under the drawer locks, that no drawer has been soft-deleted.
+
+    delete_drawer takes the same advisory lock, so this sees a delete made by
+    any worker and no load can land in a drawer deleted after the check.
+    Rolls back (releasing the locks) and raises LookupError otherwise.
+    """
+    missing = set(drawer_ids) - set(db.session.scalars(select(Drawer.id).where(Drawer.id.in_(drawer_ids))))
+    if missing:
+        _not_found('Drawer', 'Drawers', missing)
+
+
+def _lock_batches(batch_ids, *columns):
+    """
+    Confirm the batches exist and hold them until the load commits.
+
+    FOR KEY SHARE blocks a concurrent delete of a batch (from any worker)
+    until this transaction ends, without blocking updates to it, so the
+    tracking and history rows never reference a batch deleted after the check.
+    Rolls back and raises LookupError if any batch is missing.
+
+    Args:
+        batch_ids: UUIDs of the batches about to be loaded
+        *columns: Extra ItemBatch columns to return with each id
+
+    Returns:
+        list: Rows of (id, *columns)
+    """
+    rows = db.session.execute(
+        select(ItemBatch.id, *columns).where(ItemBatch.id.in_(batch_ids)).with_for_update(read=True, key_share=True)
+    ).all()
+    missing = set(batch_ids) - {row.id for row in rows}
+    if missing:
+        _not_found('Batch', 'Batches', missing)
+    return rows
+
+
+def _stacked_batches(drawer_ids):
+    """
+    Select the non-depleted loads of the given drawers, in stacking order.
+
+    Every status row of a drawer is considered: each load records its own
+    DrawerStatus, so the stack is spread across the drawer's status history.
+    Soft-deleted statuses are skipped by the ORM criteria.
+    """
+    return (
+        select(DrawerStatus.drawer_id, ItemBatch.batch_number, ItemBatch.item_type,
+               DrawerBatchTracking.quantity_loaded, DrawerBatchTracking.load_date)
+        .join(DrawerBatchTracking, DrawerBatchTracking.drawer_status_id == DrawerStatus.id)
+        .join(ItemBatch, ItemBatch.id == DrawerBatchTracking.batch_id)
+        .where(DrawerStatus.drawer_id.in_(drawer_ids), DrawerBatchTracking.is_depleted.is_(False))
+        .order_by(DrawerBatchTracking.batch_order, DrawerBatchTracking.load_date)
+    )
+
+
+def _batch_info(batch_number, item_type, quantity_loaded, load_date):
+    """Warning entry for one loaded batch."""
+    return {
+        'batch_number': batch_number,
+        'item_type': item_type,
+        'quantity_loaded': quantity_loaded,
+        'load_date': load_date.isoformat() if load_date else None
+    }
 
 
 def check_batch_stacking(drawer_id):
@@ -17,31 +110,8 @@ def check_batch_stacking(drawer_id):
     Returns:
         list: List of dictionaries containing existing batch information
     """
-    # Get the current drawer status
-    current_status = DrawerStatus.query.filter_by(drawer_id=drawer_id).first()
-
-    if not current_status:
-        return []
-
-    # Get non-depleted batches
-    non_depleted = DrawerBatchTracking.query.filter_by(
-        drawer_status_id=current_status.id,
-        is_depleted=False
-    ).all()
-
-    # Format batch information for warning
-    existing_batches = []
-    for tracking in non_depleted:
-        batch = ItemBatch.query.get(tracking.batch_id)
-        if batch:
-            existing_batches.append({
-                'batch_number': batch.batch_number,
-                'item_type': batch.item_type,
-                'quantity_loaded': tracking.quantity_loaded,
-                'load_date': tracking.load_date.isoformat() if tracking.load_date else None
-            })
-
-    return existing_batches
+    # One joined query across the drawer's statuses; no status means no rows
+    return [_batch_info(*row[1:]) for row in db.session.execute(_stacked_batches([drawer_id]))]
 
 
 def create_drawer_status_with_batch(drawer_id, batch_id, quantity, status_value, employee_id=None):
@@ -58,8 +128,14 @@ def create_drawer_status_with_batch(drawer_id, batch_id, quantity, status_value,
 
     Returns:
         tuple: (drawer_status_object, warning_dict or None)
+
+    Raises:
+        LookupError: If the drawer or the batch does not exist (or the drawer has been deleted)
     """
-    # Check for batch stacking
+    # Check for batch stacking; the same rows give the new batch's position
+    lock_drawers([drawer_id])
+    _require_live_drawers([drawer_id])
+    _lock_batches([batch_id])
     existing_batches = check_batch_stacking(drawer_id)
     warning = None
 
@@ -70,25 +146,28 @@ def create_drawer_status_with_batch(drawer_id, batch_id, quantity, status_value,
             'existing_batches': existing_batches
         }
 
+    # One timestamp for the status, tracking and history rows of this load
+    now = datetime.utcnow()
+
     # Create drawer status
     drawer_status = DrawerStatus(
         drawer_id=drawer_id,
         status=status_value,
-        last_updated=datetime.utcnow()
+        last_updated=now
     )
     db.session.add(drawer_status)
-    db.session.flush()  # Get the ID without committing
 
     # Determine batch order
     existing_count = len(existing_batches)
     batch_order = existing_count + 1
 
-    # Create batch tracking
+    # Create batch tracking; linked through the relationship, so all three
+    # rows are written in the single flush at commit
     batch_tracking = DrawerBatchTracking(
-        drawer_status_id=drawer_status.id,
+        drawer_status=drawer_status,
         batch_id=batch_id,
         quantity_loaded=quantity,
-        load_date=datetime.utcnow(),
+        load_date=now,
         batch_order=batch_order,
         is_depleted=False
     )
@@ -101,7 +180,7 @@ def create_drawer_status_with_batch(drawer_id, batch_id, quantity, status_value,
         batch_id=batch_id,
         action_type=ActionType.restock,
         quantity_changed=quantity,
-        restock_timestamp=datetime.utcnow(),
+        restock_timestamp=now,
         batch_warning_triggered=bool(warning)
     )
     db.session.add(restock_record)
@@ -112,6 +191,89 @@ def create_drawer_status_with_batch(drawer_id, batch_id, quantity, status_value,
     return drawer_status, warning
 
 
+def create_drawer_statuses_with_batches(items):
+    """
+    Create many drawer statuses with batch tracking in one transaction.
+    Stacking is checked against every non-depleted batch already in each
+    drawer plus the batches loaded by earlier items of the same request.
+
+    Args:
+        items: List of dicts with drawer_id, batch_id, quantity, status_value
+            and employee_id (UUIDs already validated)
+
+    Returns:
+        list: (drawer_status_object, warning_dict or None) per item, in input order
+
+    Raises:
+        LookupError: If any drawer or batch does not exist (or a drawer has been deleted)
+    """
+    drawer_ids = {item['drawer_id'] for item in items}
+    lock_drawers(drawer_ids)
+    _require_live_drawers(drawer_ids)
+    batches = {
+        batch.id: batch
+        for batch in _lock_batches({item['batch_id'] for item in items}, ItemBatch.batch_number, ItemBatch.item_type)
+    }
+
+    # Non-depleted batches already loaded, per drawer (one query for all drawers)
+    loaded = {drawer_id: [] for drawer_id in drawer_ids}
+    for drawer_id, *batch in db.session.execute(_stacked_batches(drawer_ids)):
+        loaded[drawer_id].append(_batch_info(*batch))
+
+    now = datetime.utcnow()
+    warnings = []
+    batch_orders = []
+    for item in items:
+        existing_batches = list(loaded[item['drawer_id']])
+        warning = None
+        if existing_batches:
+            warning = {
+                'code': 'BATCH_STACKING_DETECTED',
+                'message': f'{len(existing_batches)} batch(es) already loaded without depletion',
+                'existing_batches': existing_batches
+            }
+        warnings.append(warning)
+        batch_orders.append(len(existing_batches) + 1)
+
+        batch = batches[item['batch_id']]
+        loaded[item['drawer_id']].append(_batch_info(batch.batch_number, batch.item_type, item['quantity'], now))
+
+    # One multi-row INSERT per table
+    drawer_statuses = db.session.scalars(
+        insert(DrawerStatus).returning(DrawerStatus, sort_by_parameter_order=True),
+        [{'drawer_id': item['drawer_id'], 'status': item['status_value'], 'last_updated': now} for item in items]
+    ).all()
+
+    db.session.execute(insert(DrawerBatchTracking), [
+        {
+            'drawer_status_id': drawer_status.id,
+            'batch_id': item['batch_id'],
+            'quantity_loaded': item['quantity'],
+            'load_date': now,
+            'batch_order': batch_order,
+            'is_depleted': False
+        }
+        for item, drawer_status, batch_order in zip(items, drawer_statuses, batch_orders)
+    ])
+
+    db.session.execute(insert(RestockHistory), [
+        {
+            'employee_id': item['employee_id'],
+            'drawer_id': item['drawer_id'],
+            'batch_id': item['batch_id'],
+            'action_type': ActionType.restock,
+            'quantity_changed': item['quantity'],
+            'restock_timestamp': now,
+            'batch_warning_triggered': bool(warning)
+        }
+        for item, warning in zip(items, warnings)
+    ])
+
+    db.session.commit()
+
+    return list(zip(drawer_statuses, warnings))
+
+
 def mark_batch_depleted(batch_tracking_id):
     """
     Mark a batch as depleted, removing it from stacking detection.
@@ -120,20 +282,27 @@ def mark_batch_depleted(batch_tracking_id):
         batch_tracking_id: UUID of the batch tracking record
 
     Returns:
-        DrawerBatchTracking: Updated batch tracking object or None if not found
+        DrawerBatchTracking: Updated batch tracking object (unchanged if it was
+        already depleted) or None if not found
     """
-    tracking = DrawerBatchTracking.query.get(batch_tracking_id)
+    # Conditional UPDATE ... RETURNING: no read-modify-write, and a repeat call changes nothing
+    tracking = db.session.scalars(
+        update(DrawerBatchTracking)
+        .where(DrawerBatchTracking.id == batch_tracking_id, DrawerBatchTracking.is_depleted.is_(False))
+        .values(is_depleted=True, depletion_date=func.now())
+        .returning(DrawerBatchTracking)
+    ).first()
 
     if not tracking:
-        return None
-
-    tracking.is_depleted = True
-    tracking.depletion_date = datetime.utcnow()
+        # Either already depleted or missing
+        return db.session.get(DrawerBatchTracking, batch_tracking_id)
 
     # Optionally update the item batch status
-    batch = ItemBatch.query.get(tracking.batch_id)
-    if batch and batch.quantity == tracking.quantity_loaded:
-        batch.status = BatchStatus.depleted
+    db.session.execute(
+        update(ItemBatch)
+        .where(ItemBatch.id == tracking.batch_id, ItemBatch.quantity == tracking.quantity_loaded)
+        .values(status=BatchStatus.depleted)
+    )
 
     db.session.commit()
 
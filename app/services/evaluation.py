@@ -3,38 +3,45 @@ Evaluation service - performance metrics aggregation for employees.
 """
 from sqlalchemy import func
 from app import db
-from app.models import RestockHistory, Employee
+from app.models import RestockHistory, Employee, EmployeeScore
 
 
 def calculate_employee_performance(employee_id):
     """
     Calculate aggregated performance metrics for an employee.
 
+    Aggregated live from the employee's restock history (an index range scan
+    on employee_id), so unlike the leaderboard it is never behind the last
+    write; the endpoint's response cache is invalidated by every restock write.
+
     Args:
         employee_id: UUID of the employee
 
     Returns:
         dict: Performance summary with metrics
     """
-    # Get employee
-    employee = Employee.query.get(employee_id)
-    if not employee:
-        return None
-
-    # Aggregate metrics from restock history
+    # Employee and its metrics in one round-trip; no row means no such employee
+    scores = _live_scores(RestockHistory.employee_id == employee_id)
     metrics = db.session.query(
-        func.count(RestockHistory.id).label('total_actions'),
-        func.avg(RestockHistory.accuracy_score).label('avg_accuracy'),
-        func.avg(RestockHistory.efficiency_score).label('avg_efficiency'),
-        func.sum(func.cast(RestockHistory.batch_warning_triggered, db.Integer)).label('warnings_triggered'),
-        func.avg(RestockHistory.completion_time_seconds).label('avg_completion_time')
+        Employee.employee_id,
+        Employee.first_name,
+        Employee.last_name,
+        scores.c.total_actions,
+        scores.c.avg_accuracy,
+        scores.c.avg_efficiency,
+        scores.c.warnings_triggered,
+        scores.c.avg_completion_time
+    ).outerjoin(
+        scores, scores.c.employee_id == Employee.id
     ).filter(
-        RestockHistory.employee_id == employee_id
+        Employee.id == employee_id
     ).first()
+    if not metrics:
+        return None
 
     return {
-        'employee_id': employee.employee_id,
-        'employee_name': f'{employee.first_name} {employee.last_name}',
+        'employee_id': metrics.employee_id,
+        'employee_name': f'{metrics.first_name} {metrics.last_name}',
         'total_actions': metrics.total_actions or 0,
         'average_accuracy_score': float(metrics.avg_accuracy) if metrics.avg_accuracy else 0.0,
         'average_efficiency_score': float(metrics.avg_efficiency) if metrics.avg_efficiency else 0.0,
@@ -43,10 +50,39 @@ def calculate_employee_performance(employee_id):
     }
 
 
+def _employee_scores():
+    """
+    Per-employee totals and averages: the mv_employee_scores view on Postgres
+    (refreshed by `flask refresh-views`), computed live on other backends.
+    """
+    if db.session.get_bind().dialect.name == 'postgresql':
+        return EmployeeScore.__table__
+    return _live_scores()
+
+
+def _live_scores(*criteria):
+    """Per-employee totals and averages computed from restock_history, optionally filtered."""
+    return db.select(
+        RestockHistory.employee_id,
+        func.count().label('total_actions'),
+        func.avg(RestockHistory.accuracy_score).label('avg_accuracy'),
+        func.avg(RestockHistory.efficiency_score).label('avg_efficiency'),
+        func.count().filter(RestockHistory.batch_warning_triggered.is_(True)).label('warnings_triggered'),
+        func.avg(RestockHistory.completion_time_seconds).label('avg_completion_time')
+    ).where(
+        RestockHistory.employee_id.is_not(None), *criteria
+    ).group_by(
+        RestockHistory.employee_id
+    ).subquery()
+
+
 def get_employee_leaderboard(metric='accuracy_score', limit=10):
     """
     Get employee rankings by performance metric.
 
+    On Postgres the scores come from mv_employee_scores, so rankings reflect
+    restock history as of the last `flask refresh-views`.
+
     Args:
         metric: Metric to rank by ('accuracy_score' or 'efficiency_score')
         limit: Maximum number of employees to return
@@ -54,28 +90,27 @@ def get_employee_leaderboard(metric='accuracy_score', limit=10):
     Returns:
         list: Sorted list of employee performance data
     """
-    # Determine which metric to use
+    scores = _employee_scores()
     if metric == 'efficiency_score':
-        score_column = RestockHistory.efficiency_score
+        score_column = scores.c.avg_efficiency
     else:
-        score_column = RestockHistory.accuracy_score
+        score_column = scores.c.avg_accuracy
 
-    # Build leaderboard query
+    # Rank one pre-aggregated row per employee instead of averaging the whole history;
+    # on Postgres the view's <score> DESC indexes let LIMIT stop after the top rows
     leaderboard = db.session.query(
         Employee.id,
         Employee.employee_id,
         Employee.first_name,
         Employee.last_name,
-        func.count(RestockHistory.id).label('total_actions'),
-        func.avg(score_column).label('avg_score')
+        scores.c.total_actions,
+        score_column
     ).join(
-        RestockHistory, RestockHistory.employee_id == Employee.id
+        scores, scores.c.employee_id == Employee.id
     ).filter(
         Employee.status == 'active'
-    ).group_by(
-        Employee.id
     ).order_by(
-        func.avg(score_column).desc()
+        score_column.desc()
     ).limit(limit).all()
 
     # Format results
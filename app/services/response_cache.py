@@ -0,0 +1,55 @@
+"""
+Response cache invalidation - retires cached list responses when their tables change.
+"""
+from itertools import chain
+
+from sqlalchemy import event, inspect
+
+from app import db
+from app.cache import bump_versions
+from app.models import Employee, ItemBatch, RestockHistory
+
+ITEMS = 'items'
+RESTOCK = 'restock'
+
+# Cached-view namespaces that read each model (performance and leaderboard show employee names)
+_NAMESPACES_BY_MAPPER = {
+    ItemBatch.__mapper__: ITEMS,
+    RestockHistory.__mapper__: RESTOCK,
+    Employee.__mapper__: RESTOCK,
+}
+
+
+def _mark_stale(session, namespace):
+    session.info.setdefault('stale_cache_namespaces', set()).add(namespace)
+
+
+@event.listens_for(db.session, 'after_flush')
+def _track_flushed_rows(session, flush_context):
+    # new/dirty/deleted still describe what this flush wrote
+    for obj in chain(session.new, session.dirty, session.deleted):
+        namespace = _NAMESPACES_BY_MAPPER.get(inspect(obj).mapper)
+        if namespace:
+            _mark_stale(session, namespace)
+
+
+@event.listens_for(db.session, 'do_orm_execute')
+def _track_bulk_writes(orm_execute_state):
+    # Bulk INSERT/UPDATE/DELETE statements bypass the flush
+    if not orm_execute_state.is_select:
+        namespace = _NAMESPACES_BY_MAPPER.get(orm_execute_state.bind_mapper)
+        if namespace:
+            _mark_stale(orm_execute_state.session, namespace)
+
+
+@event.listens_for(db.session, 'after_commit')
+def _bump_stale_namespaces(session):
+    # Bumped only once committed, so a concurrent read can't re-cache the old rows
+    stale = session.info.pop('stale_cache_namespaces', None)
+    if stale:
+        bump_versions(*stale)
+
+
+@event.listens_for(db.session, 'after_rollback')
+def _forget_stale_namespaces(session):
+    session.info.pop('stale_cache_namespaces', None)
@@ -0,0 +1,67 @@
+"""
+Gzip compression for JSON responses.
+"""
+import gzip
+import zlib
+
+from flask import request
+
+
+def _gzip_stream(chunks, level):
+    """Compress a streamed body chunk by chunk, so memory stays bounded like the stream itself."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits 31 = gzip container
+    try:
+        for chunk in chunks:
+            data = compressor.compress(chunk)
+            if data:
+                yield data
+        yield compressor.flush()
+    finally:
+        # Closing the inner iterable ends stream_with_context (and its request) if the client disconnects
+        close = getattr(chunks, 'close', None)
+        if close is not None:
+            close()
+
+
+def init_compression(app):
+    """
+    Gzip JSON responses for clients that send Accept-Encoding: gzip.
+
+    Buffered bodies smaller than GZIP_MIN_SIZE are left alone (the gzip
+    header would outweigh the saving); streamed listings are compressed
+    on the fly. Images are skipped since PNG data is already deflated.
+    Compressed responses have their ETag downgraded to a weak one.
+
+    Args:
+        app: Flask application
+    """
+    min_size = app.config['GZIP_MIN_SIZE']
+    level = app.config['GZIP_LEVEL']
+
+    @app.after_request
+    def compress_response(response):
+        if (
+            response.mimetype != 'application/json'
+            or not 200 <= response.status_code < 300
+            or 'Content-Encoding' in response.headers
+            or response.direct_passthrough
+        ):
+            return response
+
+        response.vary.add('Accept-Encoding')
+        if not request.accept_encodings['gzip']:
+            return response
+
+        if response.is_streamed:
+            response.response = _gzip_stream(response.response, level)
+        else:
+            body = response.get_data()
+            if len(body) < min_size:
+                return response
+            response.set_data(gzip.compress(body, compresslevel=level))
+        response.headers['Content-Encoding'] = 'gzip'
+        # The gzip bytes differ from the identity body, so a strong ETag would be wrong here
+        etag, is_weak = response.get_etag()
+        if etag and not is_weak:
+            response.set_etag(etag, weak=True)
+        return response
@@ -0,0 +1,25 @@
+"""
+URL converters for route parameters.
+"""
+from werkzeug.routing import BaseConverter, ValidationError
+
+from app.utils.validators import validate_uuid
+
+
+class UUIDConverter(BaseConverter):
+    """
+    Parse a path segment into a uuid.UUID during routing.
+
+    Accepts every form validate_uuid does. A malformed segment does not
+    match, so routing goes on to the other rules (e.g. /qr-codes:batch
+    answers a GET with 405) and an id nothing else matches is a 404.
+    """
+
+    def to_python(self, value):
+        try:
+            return validate_uuid(value)
+        except ValueError:
+            raise ValidationError()
+
+    def to_url(self, value):
+        return str(value)
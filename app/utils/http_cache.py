@@ -0,0 +1,81 @@
+"""
+Conditional GET helpers (ETag / If-None-Match).
+"""
+import hashlib
+
+from flask import current_app, request
+from sqlalchemy import func, select
+
+from app import db
+
+
+def collection_etag(model, *criteria):
+    """
+    Build an ETag for a set of rows from their count and latest updated_at.
+
+    A single aggregate query, so unchanged collections can be answered
+    with 304 without loading any rows.
+
+    Args:
+        model: Model class with an updated_at column
+        *criteria: Optional WHERE clauses scoping the collection
+
+    Returns:
+        str: Unquoted ETag value
+    """
+    latest, count = db.session.execute(
+        select(func.max(model.updated_at), func.count()).select_from(model).where(*criteria)
+    ).one()
+    key = f'{model.__tablename__}:{count}:{latest.isoformat() if latest else ""}'
+    return hashlib.md5(key.encode()).hexdigest()
+
+
+def row_etag(obj, version):
+    """
+    Build an ETag for a single row from its primary key and a version timestamp.
+
+    Args:
+        obj: Loaded model instance with an id
+        version: Datetime that changes whenever the row's JSON does (e.g. updated_at)
+
+    Returns:
+        str: Unquoted ETag value
+    """
+    key = f'{obj.__tablename__}:{obj.id}:{version.isoformat() if version else ""}'
+    return hashlib.md5(key.encode()).hexdigest()
+
+
+def not_modified(etag):
+    """
+    Return a 304 response if the request already holds this ETag.
+
+    Args:
+        etag: Current unquoted ETag
+
+    Returns:
+        tuple or None: (Response, 304) when the client copy is fresh, else None
+    """
+    # Weak comparison: gzip-encoded copies carry the same tag marked W/
+    if not request.if_none_match.contains_weak(etag):
+        return None
+    response = current_app.response_class(status=304)
+    response.set_etag(etag)
+    return response, 304
+
+
+def with_etag(result, etag, max_age=5):
+    """
+    Attach ETag and Cache-Control headers to a (Response, status) tuple.
+
+    Args:
+        result: Tuple returned by one of the response helpers
+        etag: Unquoted ETag value
+        max_age: Seconds clients may reuse the response without revalidating
+
+    Returns:
+        tuple: The same (Response, status) tuple
+    """
+    response, _ = result
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = f'private, max-age={max_age}'
+    return result
@@ -0,0 +1,47 @@
+"""
+In-flight request coalescing.
+"""
+import threading
+from concurrent.futures import Future
+
+_lock = threading.Lock()
+_inflight = {}
+
+
+def coalesce(key, func):
+    """
+    Run func once for all concurrent callers passing the same key.
+
+    The first caller runs func; callers arriving while it is still running
+    wait and receive the same result (or exception) instead of repeating
+    the work. The key is released as soon as func finishes, so later calls
+    run func again. Coalescing is per process.
+
+    Args:
+        key: Hashable identity of the work (e.g. the request's fields)
+        func: Zero-argument callable doing the work
+
+    Returns:
+        The value returned by func (shared between coalesced callers, so it
+        should not be bound to a single request or session)
+    """
+    with _lock:
+        future = _inflight.get(key)
+        leader = future is None
+        if leader:
+            future = _inflight[key] = Future()
+
+    if not leader:
+        return future.result()
+
+    try:
+        result = func()
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    else:
+        future.set_result(result)
+        return result
+    finally:
+        with _lock:
+            del _inflight[key]
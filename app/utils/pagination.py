@@ -0,0 +1,121 @@
+"""
+Keyset (cursor) pagination helpers.
+"""
+import base64
+import uuid
+from datetime import datetime
+
+from flask import request
+from sqlalchemy import text, tuple_
+
+from app import db
+from app.utils.validators import validate_positive_integer
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+
+# Below this many rows an exact COUNT is cheap enough (and estimates are too rough) to keep counting
+ESTIMATE_MIN_ROWS = 100000
+
+# Planner row estimate for a table, summed over its partitions; NULL until ANALYZE has run on any of them.
+# A never-analyzed partition (reltuples -1, e.g. next month's, still empty) counts as 0 rows
+_ROW_ESTIMATE = text("""
+SELECT CASE WHEN bool_and(c.reltuples < 0) THEN NULL ELSE sum(greatest(c.reltuples, 0))::bigint END
+FROM pg_class c
+WHERE c.relkind = 'r'
+  AND (c.oid = CAST(:table AS regclass)
+       OR c.oid IN (SELECT inhrelid FROM pg_inherits WHERE inhparent = CAST(:table AS regclass)))
+""")
+
+
+def wants_keyset_page():
+    """Whether the request asked for a cursor page (?limit= or ?after=)."""
+    return 'limit' in request.args or 'after' in request.args
+
+
+def encode_cursor(timestamp, row_id):
+    """
+    Encode the last row's sort key as an opaque, URL-safe cursor.
+
+    Args:
+        timestamp: Sort timestamp of the last row on the page
+        row_id: UUID of the last row on the page
+
+    Returns:
+        str: Cursor for the ?after= parameter
+    """
+    return base64.urlsafe_b64encode(f'{timestamp.isoformat()}|{row_id}'.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor: Value of the ?after= parameter
+
+    Returns:
+        tuple: (datetime, UUID)
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        timestamp, row_id = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+        return datetime.fromisoformat(timestamp), uuid.UUID(row_id)
+    except (ValueError, TypeError, UnicodeDecodeError):
+        raise ValueError('Invalid cursor for after')
+
+
+def keyset_page(stmt, timestamp_column, id_column):
+    """
+    Fetch one page newest-first, continuing after the request's cursor.
+
+    Rows are ordered by (timestamp_column DESC, id_column DESC), so each page
+    is an index range scan no matter how deep the client has paged.
+
+    Args:
+        stmt: select() of a single model to paginate
+        timestamp_column: Sort column (e.g. DrawerStatus.last_updated)
+        id_column: Primary key column used as the tie-breaker
+
+    Returns:
+        tuple: (rows, limit, next_cursor or None when this is the last page)
+
+    Raises:
+        ValueError: If limit or after are invalid
+    """
+    limit = min(validate_positive_integer(request.args.get('limit', DEFAULT_LIMIT), 'limit'), MAX_LIMIT)
+    after = request.args.get('after')
+    if after:
+        stmt = stmt.where(tuple_(timestamp_column, id_column) < tuple_(*decode_cursor(after)))
+
+    # One extra row tells us whether another page exists
+    rows = db.session.scalars(
+        stmt.order_by(timestamp_column.desc(), id_column.desc()).limit(limit + 1)
+    ).all()
+    if len(rows) <= limit:
+        return rows, limit, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, limit, encode_cursor(getattr(last, timestamp_column.key), getattr(last, id_column.key))
+
+
+def estimated_row_count(table):
+    """
+    Estimate a table's row count from the planner statistics, without scanning it.
+
+    Args:
+        table: Table to estimate (e.g. ItemBatch.__table__)
+
+    Returns:
+        int or None: Estimated rows, or None when an exact count should be used
+        instead (not Postgres, no partition ever analyzed, or fewer than ESTIMATE_MIN_ROWS)
+    """
+    if db.session.get_bind().dialect.name != 'postgresql':
+        return None
+    estimate = db.session.scalar(_ROW_ESTIMATE, {'table': table.name})
+    if estimate is None or estimate < ESTIMATE_MIN_ROWS:
+        return None
+    return estimate
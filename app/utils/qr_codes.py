@@ -2,29 +2,43 @@
 
 import base64
 import io
+from functools import lru_cache
+from typing import Optional
 
 import segno
 
 
-def _qr_png_bytes(payload: str, scale: int = 6) -> bytes:
-    """Generate PNG bytes for the provided payload."""
-    qr = segno.make(payload)
+@lru_cache(maxsize=1024)
+def _qr_png_bytes(payload: str, scale: int = 6, mask: Optional[int] = 0) -> bytes:
+    """
+    Generate PNG bytes for the provided payload (cached; a payload always renders the same image).
+
+    A fixed mask skips scoring all eight mask patterns, which is most of the
+    encoding time; any mask scans fine for a short machine-read payload.
+    Pass mask=None to let segno pick the best-scoring pattern.
+    """
+    qr = segno.make(payload, mask=mask)
     buffer = io.BytesIO()
     qr.save(buffer, kind="png", scale=scale)
     return buffer.getvalue()
 
 
-def qr_png_data_uri(payload: str, scale: int = 6) -> str:
+def qr_png_data_uri(payload: str, scale: int = 6, mask: Optional[int] = 0) -> str:
     """
     Generate a PNG QR code for the provided payload and return a data URI.
 
     The payload is embedded directly in the code (no URL wrapping) so scanners
     can send the drawer ID straight back to the API or frontend.
     """
-    encoded = base64.b64encode(_qr_png_bytes(payload, scale=scale)).decode("ascii")
+    return png_data_uri(_qr_png_bytes(payload, scale=scale, mask=mask))
+
+
+def png_data_uri(png: bytes) -> str:
+    """Wrap already-rendered PNG bytes in a data URI."""
+    encoded = base64.b64encode(png).decode("ascii")
     return f"data:image/png;base64,{encoded}"
 
 
-def qr_png_bytes(payload: str, scale: int = 6) -> bytes:
+def qr_png_bytes(payload: str, scale: int = 6, mask: Optional[int] = 0) -> bytes:
     """Expose PNG bytes for callers that need the raw binary format."""
-    return _qr_png_bytes(payload, scale=scale)
+    return _qr_png_bytes(payload, scale=scale, mask=mask)
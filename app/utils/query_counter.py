@@ -0,0 +1,56 @@
+"""
+SQL query counting, used to catch N+1 regressions in tests and development.
+"""
+from contextlib import contextmanager
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+
+from app import db
+
+
+@contextmanager
+def count_queries(engine=None):
+    """
+    Record every SQL statement executed inside the block.
+
+    Args:
+        engine: Engine to watch (defaults to the current app's db.engine)
+
+    Yields:
+        list: Executed SQL strings, filled in as statements run
+    """
+    engine = engine or db.engine
+    queries = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        queries.append(statement)
+
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        yield queries
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+
+
+def init_query_logging(app, threshold):
+    """
+    Log requests that run more than `threshold` SQL statements.
+
+    Args:
+        app: Flask application
+        threshold: Statement count above which a warning is logged
+    """
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if has_request_context():
+            g.query_count = g.get('query_count', 0) + 1
+
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute', record)
+
+    @app.after_request
+    def log_query_count(response):
+        count = g.get('query_count', 0)
+        if count > threshold:
+            app.logger.warning('%s %s ran %d SQL queries', request.method, request.path, count)
+        return response
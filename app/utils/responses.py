@@ -1,9 +1,25 @@
 """
 Response formatting utilities for consistent API responses.
 """
-from flask import jsonify
-import uuid
-from datetime import datetime, date
+from flask import current_app, stream_with_context
+from app.utils.serialization import dumps
+
+
+def json_response(payload, status_code=200):
+    """
+    Build a JSON response encoded with orjson.
+    Keys are sorted when the app's JSON provider sorts them (the default), as jsonify() did.
+
+    Args:
+        payload: JSON-serializable data
+        status_code: HTTP status code (default 200)
+
+    Returns:
+        tuple: (Response, status code)
+    """
+    return current_app.response_class(
+        dumps(payload, sort_keys=current_app.json.sort_keys), mimetype='application/json'
+    ), status_code
 
 
 def success_response(data, status_code=200):
@@ -21,7 +37,7 @@ def success_response(data, status_code=200):
         'status': 'success',
         'data': serialize_data(data)
     }
-    return jsonify(response), status_code
+    return json_response(response, status_code)
 
 
 def error_response(code, message, details=None, status_code=400):
@@ -47,7 +63,7 @@ def error_response(code, message, details=None, status_code=400):
     if details:
         response['error']['details'] = details
 
-    return jsonify(response), status_code
+    return json_response(response, status_code)
 
 
 def warning_response(data, warning_dict, status_code=207):
@@ -67,10 +83,10 @@ def warning_response(data, warning_dict, status_code=207):
         'data': serialize_data(data),
         'warning': warning_dict
     }
-    return jsonify(response), status_code
+    return json_response(response, status_code)
 
 
-def paginated_response(items, page, per_page, total, status_code=200):
+def paginated_response(items, page, per_page, total, status_code=200, estimated=False):
     """
     Format paginated list response.
 
@@ -80,6 +96,7 @@ def paginated_response(items, page, per_page, total, status_code=200):
         per_page: Items per page
         total: Total number of items
         status_code: HTTP status code (default 200)
+        estimated: Whether total is a planner estimate (flagged as total_estimated)
 
     Returns:
         tuple: (JSON response, status code)
@@ -96,12 +113,80 @@ def paginated_response(items, page, per_page, total, status_code=200):
             'total_pages': total_pages
         }
     }
-    return jsonify(response), status_code
+    if estimated:
+        response['pagination']['total_estimated'] = True
+    return json_response(response, status_code)
+
+
+def cursor_response(items, limit, next_cursor, status_code=200):
+    """
+    Format keyset-paginated list response.
+
+    Args:
+        items: List of items for current page
+        limit: Maximum items per page
+        next_cursor: Cursor for the next page (None on the last page)
+        status_code: HTTP status code (default 200)
+
+    Returns:
+        tuple: (JSON response, status code)
+    """
+    response = {
+        'status': 'success',
+        'data': serialize_data(items),
+        'pagination': {
+            'limit': limit,
+            'next_cursor': next_cursor
+        }
+    }
+    return json_response(response, status_code)
+
+
+def streamed_response(items, chunk_size=1000, status_code=200):
+    """
+    Format a list response that is encoded and sent while items are read.
+
+    The body is the same document as success_response(list(items)), but
+    only chunk_size encoded items are held in memory at a time.
+
+    Args:
+        items: Iterable of items (models, rows or dicts), e.g. from stream_rows
+        chunk_size: Items encoded per write to the client
+        status_code: HTTP status code (default 200)
+
+    Returns:
+        tuple: (streaming JSON response, status code)
+    """
+    sort_keys = current_app.json.sort_keys
+
+    def generate():
+        # Envelope keys in sorted order, as json_response emits them
+        yield b'{"data":['
+        chunk = []
+        separator = b''
+        for item in items:
+            chunk.append(dumps(serialize_data(item), sort_keys=sort_keys))
+            if len(chunk) == chunk_size:
+                yield separator + b','.join(chunk)
+                chunk = []
+                separator = b','
+        if chunk:
+            yield separator + b','.join(chunk)
+        yield b'],"status":"success"}'
+
+    # Keep the request (and its database session) open until the last chunk is sent
+    return current_app.response_class(stream_with_context(generate()), mimetype='application/json'), status_code
+
+
+_PRIMITIVES = frozenset({str, int, float, bool, type(None)})
 
 
 def serialize_data(data):
     """
-    Serialize data for JSON response, handling UUIDs and datetimes.
+    Serialize data for JSON response.
+
+    Models are converted with to_dict() and containers are walked; UUIDs,
+    datetimes, dates and enums are left for orjson to encode natively.
 
     Args:
         data: Data to serialize (dict, list, model, UUID, datetime, etc.)
@@ -109,8 +194,9 @@ def serialize_data(data):
     Returns:
         Serialized data suitable for JSON response
     """
-    if data is None:
-        return None
+    # Scalars (most leaves of dict payloads) need no work; checked by exact type first
+    if type(data) in _PRIMITIVES:
+        return data
 
     # Handle model objects with to_dict method
     if hasattr(data, 'to_dict'):
@@ -124,21 +210,5 @@ def serialize_data(data):
     if isinstance(data, dict):
         return {key: serialize_data(value) for key, value in data.items()}
 
-    # Handle UUID
-    if isinstance(data, uuid.UUID):
-        return str(data)
-
-    # Handle datetime
-    if isinstance(data, datetime):
-        return data.isoformat()
-
-    # Handle date
-    if isinstance(data, date):
-        return data.isoformat()
-
-    # Handle enums
-    if hasattr(data, 'value'):
-        return data.value
-
-    # Return as-is for basic types
+    # Return as-is; orjson handles the remaining types
     return data
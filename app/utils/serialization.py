@@ -0,0 +1,52 @@
+"""
+JSON encoding helpers backed by orjson.
+"""
+from decimal import Decimal
+
+import orjson
+from flask.json.provider import DefaultJSONProvider
+
+
+def _default(obj):
+    """Encode the types orjson does not handle natively."""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if hasattr(obj, 'to_dict'):
+        return obj.to_dict()
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+
+def dumps(obj, sort_keys=False):
+    """
+    Serialize an object to JSON bytes.
+
+    UUIDs, datetimes, dates and enums are encoded natively by orjson,
+    so callers can pass model values through without converting them.
+
+    Args:
+        obj: Object to serialize
+        sort_keys: Emit object keys in sorted order, as jsonify() does by default
+
+    Returns:
+        bytes: UTF-8 encoded JSON
+    """
+    return orjson.dumps(obj, default=_default, option=orjson.OPT_SORT_KEYS if sort_keys else 0)
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider that routes jsonify() and app.json through orjson."""
+
+    def dumps(self, obj, **kwargs):
+        option = orjson.OPT_SORT_KEYS if kwargs.get('sort_keys', self.sort_keys) else 0
+        return orjson.dumps(obj, default=_default, option=option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        option = orjson.OPT_SORT_KEYS if self.sort_keys else 0
+        # Skip the str round-trip and hand the encoded bytes straight to the response
+        return self._app.response_class(
+            orjson.dumps(obj, default=_default, option=option), mimetype=self.mimetype
+        )
@@ -0,0 +1,35 @@
+"""
+Transaction handling for write endpoints.
+"""
+from functools import wraps
+
+from app import db
+
+
+def transactional(view):
+    """
+    Run a write endpoint as a single unit of work.
+
+    The view only adds/flushes; the session is committed once if it returns
+    a success status and rolled back otherwise. Exceptions roll back and
+    propagate to the app's error handlers (ValueError is a 400).
+
+    Args:
+        view: Flask view function returning (Response, status code)
+
+    Returns:
+        function: Wrapped view
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        try:
+            result = view(*args, **kwargs)
+        except Exception:
+            db.session.rollback()
+            raise
+        if result[1] < 400:
+            db.session.commit()
+        else:
+            db.session.rollback()
+        return result
+    return wrapper
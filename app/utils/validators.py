@@ -4,6 +4,10 @@ Validation utilities for input data.
 import uuid
 from datetime import datetime
 
+# Upper bound on one bulk request, so a single call can't hold a huge batch in
+# memory or keep one transaction (and its locks) open for long
+MAX_BULK_RECORDS = 1000
+
 
 def validate_uuid(value, field_name='id'):
     """
@@ -19,8 +23,11 @@ def validate_uuid(value, field_name='id'):
     Raises:
         ValueError: If UUID format is invalid
     """
+    if isinstance(value, uuid.UUID):
+        return value
     try:
-        return uuid.UUID(str(value))
+        # Strings go straight to the parser; str() only for other types
+        return uuid.UUID(value if isinstance(value, str) else str(value))
     except (ValueError, AttributeError, TypeError):
         raise ValueError(f'Invalid UUID format for {field_name}')
 
@@ -86,6 +93,22 @@ def validate_required_fields(data, required_fields):
         raise ValueError(f'Missing required fields: {", ".join(missing_fields)}')
 
 
+def validate_bulk_size(items, noun='records', max_items=MAX_BULK_RECORDS):
+    """
+    Validate that a bulk request is within the per-request limit.
+
+    Args:
+        items: List of items sent in the request
+        noun: What the items are, for the error message
+        max_items: Largest accepted list
+
+    Raises:
+        ValueError: If the list is longer than max_items
+    """
+    if len(items) > max_items:
+        raise ValueError(f'At most {max_items} {noun} can be sent per request')
+
+
 def validate_positive_integer(value, field_name='value', allow_zero=False):
     """
     Validate that a value is a positive integer.
@@ -101,15 +124,21 @@ def validate_positive_integer(value, field_name='value', allow_zero=False):
     Raises:
         ValueError: If value is not a positive integer
     """
-    try:
-        int_value = int(value)
-        if allow_zero and int_value < 0:
-            raise ValueError(f'{field_name} must be non-negative')
-        elif not allow_zero and int_value <= 0:
-            raise ValueError(f'{field_name} must be a positive integer')
-        return int_value
-    except (ValueError, TypeError):
-        raise ValueError(f'{field_name} must be an integer')
+    # JSON bodies already hold ints; only other types need converting
+    if type(value) is int:
+        int_value = value
+    else:
+        try:
+            int_value = int(value)
+        except (ValueError, TypeError):
+            raise ValueError(f'{field_name} must be an integer')
+
+    # Range errors are raised outside the try so their message isn't replaced
+    if allow_zero and int_value < 0:
+        raise ValueError(f'{field_name} must be non-negative')
+    elif not allow_zero and int_value <= 0:
+        raise ValueError(f'{field_name} must be a positive integer')
+    return int_value
 
 
 def validate_numeric_range(value, field_name='value', min_val=None, max_val=None):
@@ -0,0 +1,29 @@
+"""Set employees.updated_at server-side
+
+Revision ID: 0d4b7e2a9c51
+Revises: c6f1a3e8d2b9
+Create Date: 2026-10-15 20:12:44.905317
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0d4b7e2a9c51'
+down_revision = 'c6f1a3e8d2b9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # UPDATEs set the column via now() from the ORM's onupdate
+    with op.batch_alter_table('employees', schema=None) as batch_op:
+        batch_op.alter_column('updated_at', existing_type=sa.DateTime(timezone=True), existing_nullable=False,
+                              server_default=sa.text('now()'))
+
+
+def downgrade():
+    with op.batch_alter_table('employees', schema=None) as batch_op:
+        batch_op.alter_column('updated_at', existing_type=sa.DateTime(timezone=True), existing_nullable=False,
+                              server_default=None)
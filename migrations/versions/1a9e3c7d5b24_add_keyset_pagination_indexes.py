@@ -0,0 +1,36 @@
+"""Add keyset pagination indexes for drawers and drawer_status
+
+Revision ID: 1a9e3c7d5b24
+Revises: f4c7b2e9a0d6
+Create Date: 2026-10-15 17:40:58.316095
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '1a9e3c7d5b24'
+down_revision = 'f4c7b2e9a0d6'
+branch_labels = None
+depends_on = None
+
+# (index name, table, sort column)
+INDEXES = [
+    ('ix_drawer_status_updated_id', 'drawer_status', 'last_updated'),
+    ('ix_drawers_updated_id', 'drawers', 'updated_at'),
+]
+
+
+def upgrade():
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        for name, table, column in INDEXES:
+            op.create_index(name, table, [sa.text(f'{column} DESC'), sa.text('id DESC')],
+                            unique=False, postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
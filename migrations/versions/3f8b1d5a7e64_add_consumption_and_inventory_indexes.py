@@ -0,0 +1,36 @@
+"""Add consumption_records and drawer_inventories lookup indexes
+
+Revision ID: 3f8b1d5a7e64
+Revises: 9a4d2b6e8c17
+Create Date: 2026-10-15 11:04:27.561930
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f8b1d5a7e64'
+down_revision = '9a4d2b6e8c17'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('consumption_records', schema=None) as batch_op:
+        batch_op.create_index('ix_cr_drawer_time', ['drawer_id', 'consumed_at'], unique=False)
+        batch_op.create_index('ix_cr_job', ['job_id'], unique=False)
+        batch_op.create_index('ix_cr_employee_time', ['employee_id', 'consumed_at'], unique=False)
+
+    with op.batch_alter_table('drawer_inventories', schema=None) as batch_op:
+        batch_op.create_index('ix_di_drawer_priority', ['drawer_id', 'priority_order'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('drawer_inventories', schema=None) as batch_op:
+        batch_op.drop_index('ix_di_drawer_priority')
+
+    with op.batch_alter_table('consumption_records', schema=None) as batch_op:
+        batch_op.drop_index('ix_cr_employee_time')
+        batch_op.drop_index('ix_cr_job')
+        batch_op.drop_index('ix_cr_drawer_time')
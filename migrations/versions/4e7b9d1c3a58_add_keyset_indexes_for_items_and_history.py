@@ -0,0 +1,42 @@
+"""Add keyset pagination indexes for item_batches and restock_history
+
+Revision ID: 4e7b9d1c3a58
+Revises: 0d4b7e2a9c51
+Create Date: 2026-10-15 20:41:17.262904
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4e7b9d1c3a58'
+down_revision = '0d4b7e2a9c51'
+branch_labels = None
+depends_on = None
+
+# (index name, leading columns, sort column)
+ITEM_BATCH_INDEXES = [
+    ('ix_item_batches_created_id', [], 'created_at'),
+    ('ix_item_batches_status_created_id', ['status'], 'created_at'),
+]
+
+
+def upgrade():
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        for name, leading, column in ITEM_BATCH_INDEXES:
+            op.create_index(name, 'item_batches', [*leading, sa.text(f'{column} DESC'), sa.text('id DESC')],
+                            unique=False, postgresql_concurrently=True)
+
+    # Partitioned tables don't support CONCURRENTLY; the index is created on every partition
+    op.create_index('ix_restock_ts_id', 'restock_history',
+                    [sa.text('restock_timestamp DESC'), sa.text('id DESC')], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_restock_ts_id', table_name='restock_history')
+
+    with op.get_context().autocommit_block():
+        for name, _, _ in reversed(ITEM_BATCH_INDEXES):
+            op.drop_index(name, table_name='item_batches', postgresql_concurrently=True)
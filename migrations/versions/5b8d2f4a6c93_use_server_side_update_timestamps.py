@@ -0,0 +1,36 @@
+"""Set drawers.updated_at and drawer_status.last_updated server-side
+
+Revision ID: 5b8d2f4a6c93
+Revises: 1a9e3c7d5b24
+Create Date: 2026-10-15 18:05:19.672843
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b8d2f4a6c93'
+down_revision = '1a9e3c7d5b24'
+branch_labels = None
+depends_on = None
+
+# (table, timestamp column); UPDATEs set these via now() from the ORM's onupdate
+COLUMNS = [
+    ('drawers', 'updated_at'),
+    ('drawer_status', 'last_updated'),
+]
+
+
+def upgrade():
+    for table, column in COLUMNS:
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.alter_column(column, existing_type=sa.DateTime(timezone=True), existing_nullable=False,
+                                  server_default=sa.text('now()'))
+
+
+def downgrade():
+    for table, column in COLUMNS:
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.alter_column(column, existing_type=sa.DateTime(timezone=True), existing_nullable=False,
+                                  server_default=None)
@@ -0,0 +1,28 @@
+"""Add drawer_batch_tracking indexes for batch stacking detection
+
+Revision ID: 5c1e7a9f3b42
+Revises: 2d59ea09063d
+Create Date: 2026-10-15 09:12:41.318204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5c1e7a9f3b42'
+down_revision = '2d59ea09063d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('drawer_batch_tracking', schema=None) as batch_op:
+        batch_op.create_index('ix_dbt_status_active', ['drawer_status_id'], unique=False, postgresql_where=sa.text('is_depleted = false'))
+        batch_op.create_index('ix_dbt_status_order', ['drawer_status_id', 'batch_order'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('drawer_batch_tracking', schema=None) as batch_op:
+        batch_op.drop_index('ix_dbt_status_order')
+        batch_op.drop_index('ix_dbt_status_active')
@@ -0,0 +1,46 @@
+"""Add indexes on foreign key lookup columns
+
+Revision ID: 6e2c9a4f1b83
+Revises: 3f8b1d5a7e64
+Create Date: 2026-10-15 13:41:06.204518
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6e2c9a4f1b83'
+down_revision = '3f8b1d5a7e64'
+branch_labels = None
+depends_on = None
+
+# (index name, table, columns)
+INDEXES = [
+    ('ix_drawer_layouts_drawer_id', 'drawer_layouts', ['drawer_id']),
+    ('ix_drawer_status_drawer_id', 'drawer_status', ['drawer_id']),
+    ('ix_packing_jobs_flight_id', 'packing_jobs', ['flight_id']),
+    ('ix_packing_jobs_assigned_employee_id', 'packing_jobs', ['assigned_employee_id']),
+    ('ix_packing_job_drawers_job_id', 'packing_job_drawers', ['job_id']),
+    ('ix_packing_job_drawers_drawer_id', 'packing_job_drawers', ['drawer_id']),
+    ('ix_restock_history_employee_id', 'restock_history', ['employee_id']),
+    ('ix_restock_history_batch_id', 'restock_history', ['batch_id']),
+    ('ix_restock_drawer_ts', 'restock_history', ['drawer_id', 'restock_timestamp']),
+    ('ix_drawer_batch_tracking_batch_id', 'drawer_batch_tracking', ['batch_id']),
+    ('ix_drawer_inventories_product_id', 'drawer_inventories', ['product_id']),
+    ('ix_consumption_records_batch_id', 'consumption_records', ['batch_id']),
+    ('ix_consumption_records_product_id', 'consumption_records', ['product_id']),
+]
+
+
+def upgrade():
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, columns in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
@@ -0,0 +1,31 @@
+"""Add batch_order to the partial non-depleted tracking index
+
+Revision ID: 7c3e9a1f5d48
+Revises: 5b8d2f4a6c93
+Create Date: 2026-10-15 18:31:44.120587
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c3e9a1f5d48'
+down_revision = '5b8d2f4a6c93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Build the replacement before dropping the old index so lookups are never unindexed
+    with op.get_context().autocommit_block():
+        op.create_index('ix_dbt_status_active_order', 'drawer_batch_tracking', ['drawer_status_id', 'batch_order'],
+                        unique=False, postgresql_where=sa.text('is_depleted = false'), postgresql_concurrently=True)
+        op.drop_index('ix_dbt_status_active', table_name='drawer_batch_tracking', postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.create_index('ix_dbt_status_active', 'drawer_batch_tracking', ['drawer_status_id'],
+                        unique=False, postgresql_where=sa.text('is_depleted = false'), postgresql_concurrently=True)
+        op.drop_index('ix_dbt_status_active_order', table_name='drawer_batch_tracking', postgresql_concurrently=True)
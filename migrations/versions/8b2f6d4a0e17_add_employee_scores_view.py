@@ -0,0 +1,35 @@
+"""Add mv_employee_scores materialized view for the leaderboard
+
+Revision ID: 8b2f6d4a0e17
+Revises: 4e7b9d1c3a58
+Create Date: 2026-10-15 21:03:29.518736
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8b2f6d4a0e17'
+down_revision = '4e7b9d1c3a58'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("""
+        CREATE MATERIALIZED VIEW mv_employee_scores AS
+        SELECT employee_id,
+               count(*) AS total_actions,
+               avg(accuracy_score) AS avg_accuracy,
+               avg(efficiency_score) AS avg_efficiency
+        FROM restock_history
+        WHERE employee_id IS NOT NULL
+        GROUP BY employee_id
+    """)
+    # A unique index is required for REFRESH MATERIALIZED VIEW CONCURRENTLY
+    op.execute('CREATE UNIQUE INDEX ux_mv_employee_scores ON mv_employee_scores (employee_id)')
+
+
+def downgrade():
+    op.execute('DROP MATERIALIZED VIEW IF EXISTS mv_employee_scores')
@@ -0,0 +1,45 @@
+"""Add gen_random_uuid() server defaults to primary keys
+
+Revision ID: 9a4d2b6e8c17
+Revises: 5c1e7a9f3b42
+Create Date: 2026-10-15 10:03:27.540918
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9a4d2b6e8c17'
+down_revision = '5c1e7a9f3b42'
+branch_labels = None
+depends_on = None
+
+TABLES = [
+    'item_batches',
+    'drawers',
+    'drawer_layouts',
+    'employees',
+    'drawer_status',
+    'drawer_batch_tracking',
+    'restock_history',
+    'products',
+    'flights',
+    'packing_jobs',
+    'packing_job_drawers',
+    'drawer_inventories',
+    'consumption_records',
+]
+
+
+def upgrade():
+    # gen_random_uuid() is built in from PostgreSQL 13; pgcrypto provides it on older servers
+    op.execute("CREATE EXTENSION IF NOT EXISTS pgcrypto")
+
+    for table in TABLES:
+        op.alter_column(table, 'id', existing_type=sa.UUID(), server_default=sa.text('gen_random_uuid()'))
+
+
+def downgrade():
+    for table in TABLES:
+        op.alter_column(table, 'id', existing_type=sa.UUID(), server_default=None)
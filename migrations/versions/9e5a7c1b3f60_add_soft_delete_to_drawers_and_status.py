@@ -0,0 +1,51 @@
+"""Add deleted_at soft-delete columns to drawers and drawer_status
+
+Revision ID: 9e5a7c1b3f60
+Revises: 7c3e9a1f5d48
+Create Date: 2026-10-15 19:02:08.441935
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9e5a7c1b3f60'
+down_revision = '7c3e9a1f5d48'
+branch_labels = None
+depends_on = None
+
+CURRENT_STATUS_VIEW = """
+    CREATE MATERIALIZED VIEW mv_current_drawer_status AS
+    SELECT DISTINCT ON (drawer_id) id, drawer_id, status, last_updated, created_at
+    FROM drawer_status
+    {where}
+    ORDER BY drawer_id, last_updated DESC
+"""
+
+
+def _recreate_current_status_view(where):
+    op.execute('DROP MATERIALIZED VIEW IF EXISTS mv_current_drawer_status')
+    op.execute(CURRENT_STATUS_VIEW.format(where=where))
+    op.execute('CREATE UNIQUE INDEX ux_mv_current_drawer_status ON mv_current_drawer_status (drawer_id)')
+
+
+def upgrade():
+    # Nullable with no default: adding the column is a catalog-only change
+    with op.batch_alter_table('drawers', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True))
+
+    with op.batch_alter_table('drawer_status', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True))
+
+    _recreate_current_status_view('WHERE deleted_at IS NULL')
+
+
+def downgrade():
+    _recreate_current_status_view('')
+
+    with op.batch_alter_table('drawer_status', schema=None) as batch_op:
+        batch_op.drop_column('deleted_at')
+
+    with op.batch_alter_table('drawers', schema=None) as batch_op:
+        batch_op.drop_column('deleted_at')
@@ -0,0 +1,26 @@
+"""Add partial index for restock records that triggered a stacking warning
+
+Revision ID: a7e3d5c1b980
+Revises: f4b7c2e9d631
+Create Date: 2026-10-15 23:24:18.771640
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7e3d5c1b980'
+down_revision = 'f4b7c2e9d631'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Partitioned tables don't support CONCURRENTLY; the index is created on every partition
+    op.create_index('ix_restock_warning_ts', 'restock_history', [sa.text('restock_timestamp DESC')],
+                    unique=False, postgresql_where=sa.text('batch_warning_triggered'))
+
+
+def downgrade():
+    op.drop_index('ix_restock_warning_ts', table_name='restock_history')
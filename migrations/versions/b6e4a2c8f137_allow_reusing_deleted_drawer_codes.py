@@ -0,0 +1,38 @@
+"""Make drawer codes unique among live drawers and soft-delete drawer layouts
+
+Revision ID: b6e4a2c8f137
+Revises: a7e3d5c1b980
+Create Date: 2026-10-15 23:51:42.306518
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b6e4a2c8f137'
+down_revision = 'a7e3d5c1b980'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Nullable with no default: adding the column is a catalog-only change
+    with op.batch_alter_table('drawer_layouts', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True))
+
+    # Build the partial index before dropping the full one so codes stay enforced throughout
+    with op.get_context().autocommit_block():
+        op.create_index('ux_drawers_live_drawer_code', 'drawers', ['drawer_code'], unique=True,
+                        postgresql_where=sa.text('deleted_at IS NULL'), postgresql_concurrently=True)
+        op.drop_index('ix_drawers_drawer_code', table_name='drawers', postgresql_concurrently=True)
+
+
+def downgrade():
+    # Fails if a deleted drawer's code has been reused; purge the deleted drawer first
+    with op.get_context().autocommit_block():
+        op.create_index('ix_drawers_drawer_code', 'drawers', ['drawer_code'], unique=True, postgresql_concurrently=True)
+        op.drop_index('ux_drawers_live_drawer_code', table_name='drawers', postgresql_concurrently=True)
+
+    with op.batch_alter_table('drawer_layouts', schema=None) as batch_op:
+        batch_op.drop_column('deleted_at')
@@ -0,0 +1,41 @@
+"""Add restock_history_daily materialized view
+
+Revision ID: b7d3e1f9a256
+Revises: 6e2c9a4f1b83
+Create Date: 2026-10-15 15:27:53.880412
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7d3e1f9a256'
+down_revision = '6e2c9a4f1b83'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("""
+        CREATE MATERIALIZED VIEW restock_history_daily AS
+        SELECT employee_id,
+               drawer_id,
+               date_trunc('day', restock_timestamp) AS day,
+               action_type,
+               count(*) AS action_count,
+               avg(accuracy_score) AS avg_accuracy,
+               avg(efficiency_score) AS avg_efficiency,
+               sum(quantity_changed) AS quantity_changed
+        FROM restock_history
+        GROUP BY 1, 2, 3, 4
+    """)
+    # A unique index is required for REFRESH MATERIALIZED VIEW CONCURRENTLY
+    op.execute("""
+        CREATE UNIQUE INDEX ux_restock_history_daily
+            ON restock_history_daily (employee_id, drawer_id, day, action_type) NULLS NOT DISTINCT
+    """)
+
+
+def downgrade():
+    op.execute('DROP MATERIALIZED VIEW IF EXISTS restock_history_daily')
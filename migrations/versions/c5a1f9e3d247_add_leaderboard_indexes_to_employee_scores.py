@@ -0,0 +1,36 @@
+"""Add leaderboard ranking indexes to mv_employee_scores
+
+Revision ID: c5a1f9e3d247
+Revises: 8b2f6d4a0e17
+Create Date: 2026-10-15 23:09:41.085213
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5a1f9e3d247'
+down_revision = '8b2f6d4a0e17'
+branch_labels = None
+depends_on = None
+
+# Match the leaderboard's ORDER BY <score> DESC so LIMIT stops after the top rows
+RANKING_INDEXES = [
+    ('ix_mv_employee_scores_accuracy', 'avg_accuracy'),
+    ('ix_mv_employee_scores_efficiency', 'avg_efficiency'),
+]
+
+
+def upgrade():
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        for name, column in RANKING_INDEXES:
+            op.create_index(name, 'mv_employee_scores', [sa.text(f'{column} DESC')],
+                            unique=False, postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, _ in reversed(RANKING_INDEXES):
+            op.drop_index(name, table_name='mv_employee_scores', postgresql_concurrently=True)
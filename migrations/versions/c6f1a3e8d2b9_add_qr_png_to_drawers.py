@@ -0,0 +1,27 @@
+"""Store the rendered QR code PNG on drawers
+
+Revision ID: c6f1a3e8d2b9
+Revises: 9e5a7c1b3f60
+Create Date: 2026-10-15 19:41:27.318604
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c6f1a3e8d2b9'
+down_revision = '9e5a7c1b3f60'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Existing QR codes are rendered on demand until regenerated
+    with op.batch_alter_table('drawers', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('qr_png', sa.LargeBinary(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('drawers', schema=None) as batch_op:
+        batch_op.drop_column('qr_png')
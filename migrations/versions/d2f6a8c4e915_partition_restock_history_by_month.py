@@ -0,0 +1,134 @@
+"""Partition restock_history by month on restock_timestamp
+
+Revision ID: d2f6a8c4e915
+Revises: b7d3e1f9a256
+Create Date: 2026-10-15 16:02:41.538207
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2f6a8c4e915'
+down_revision = 'b7d3e1f9a256'
+branch_labels = None
+depends_on = None
+
+# (index name, columns)
+INDEXES = [
+    ('ix_restock_drawer_ts', ['drawer_id', 'restock_timestamp']),
+    ('ix_restock_history_employee_id', ['employee_id']),
+    ('ix_restock_history_batch_id', ['batch_id']),
+]
+
+FOREIGN_KEYS = [
+    ('restock_history_employee_id_fkey', 'employees', 'employee_id'),
+    ('restock_history_drawer_id_fkey', 'drawers', 'drawer_id'),
+    ('restock_history_batch_id_fkey', 'item_batches', 'batch_id'),
+]
+
+CREATE_DAILY_VIEW = """
+    CREATE MATERIALIZED VIEW restock_history_daily AS
+    SELECT employee_id,
+           drawer_id,
+           date_trunc('day', restock_timestamp) AS day,
+           action_type,
+           count(*) AS action_count,
+           avg(accuracy_score) AS avg_accuracy,
+           avg(efficiency_score) AS avg_efficiency,
+           sum(quantity_changed) AS quantity_changed
+    FROM restock_history
+    GROUP BY 1, 2, 3, 4
+"""
+
+CREATE_DAILY_VIEW_INDEX = """
+    CREATE UNIQUE INDEX ux_restock_history_daily
+        ON restock_history_daily (employee_id, drawer_id, day, action_type) NULLS NOT DISTINCT
+"""
+
+# One partition per month (UTC boundaries) from the oldest row through three months ahead
+CREATE_MONTHLY_PARTITIONS = """
+    DO $$
+    DECLARE
+        month_start timestamp;
+    BEGIN
+        FOR month_start IN
+            SELECT generate_series(
+                date_trunc('month', LEAST(COALESCE(min(restock_timestamp), now()), now()) AT TIME ZONE 'UTC'),
+                date_trunc('month', now() AT TIME ZONE 'UTC') + interval '3 months',
+                interval '1 month'
+            )
+            FROM restock_history_unpartitioned
+        LOOP
+            EXECUTE format(
+                'CREATE TABLE restock_history_%s PARTITION OF restock_history FOR VALUES FROM (%L) TO (%L)',
+                to_char(month_start, 'YYYY_MM'),
+                month_start::text || '+00',
+                (month_start + interval '1 month')::text || '+00'
+            );
+        END LOOP;
+    END $$
+"""
+
+
+def _drop_indexes():
+    for name, _ in INDEXES:
+        op.drop_index(name, table_name='restock_history')
+
+
+def _create_indexes_and_keys():
+    for name, columns in INDEXES:
+        op.create_index(name, 'restock_history', columns, unique=False)
+    for name, referent, column in FOREIGN_KEYS:
+        op.create_foreign_key(name, 'restock_history', referent, [column], ['id'], ondelete='SET NULL')
+
+
+def upgrade():
+    # The view depends on the table being replaced
+    op.execute('DROP MATERIALIZED VIEW IF EXISTS restock_history_daily')
+
+    _drop_indexes()
+    op.rename_table('restock_history', 'restock_history_unpartitioned')
+    op.execute('ALTER TABLE restock_history_unpartitioned RENAME CONSTRAINT restock_history_pkey TO restock_history_unpartitioned_pkey')
+
+    # The partition column has to be part of the primary key
+    op.execute("""
+        CREATE TABLE restock_history (
+            LIKE restock_history_unpartitioned INCLUDING DEFAULTS,
+            PRIMARY KEY (id, restock_timestamp)
+        ) PARTITION BY RANGE (restock_timestamp)
+    """)
+    op.execute(CREATE_MONTHLY_PARTITIONS)
+    op.execute('CREATE TABLE restock_history_default PARTITION OF restock_history DEFAULT')
+
+    op.execute('INSERT INTO restock_history SELECT * FROM restock_history_unpartitioned')
+    op.drop_table('restock_history_unpartitioned')
+
+    _create_indexes_and_keys()
+
+    op.execute(CREATE_DAILY_VIEW)
+    op.execute(CREATE_DAILY_VIEW_INDEX)
+
+
+def downgrade():
+    op.execute('DROP MATERIALIZED VIEW IF EXISTS restock_history_daily')
+
+    _drop_indexes()
+    op.rename_table('restock_history', 'restock_history_partitioned')
+    op.execute('ALTER TABLE restock_history_partitioned RENAME CONSTRAINT restock_history_pkey TO restock_history_partitioned_pkey')
+
+    op.execute("""
+        CREATE TABLE restock_history (
+            LIKE restock_history_partitioned INCLUDING DEFAULTS,
+            CONSTRAINT restock_history_pkey PRIMARY KEY (id)
+        )
+    """)
+    op.execute('INSERT INTO restock_history SELECT * FROM restock_history_partitioned')
+    # Dropping the parent drops every partition with it
+    op.drop_table('restock_history_partitioned')
+
+    _create_indexes_and_keys()
+
+    op.execute(CREATE_DAILY_VIEW)
+    op.execute(CREATE_DAILY_VIEW_INDEX)
@@ -0,0 +1,39 @@
+"""Key drawer and drawer_status pagination indexes on created_at
+
+Revision ID: d8c2f6a4e019
+Revises: b6e4a2c8f137
+Create Date: 2026-10-15 23:58:27.519304
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd8c2f6a4e019'
+down_revision = 'b6e4a2c8f137'
+branch_labels = None
+depends_on = None
+
+# (new index, old index, table, old sort column)
+INDEXES = [
+    ('ix_drawer_status_created_id', 'ix_drawer_status_updated_id', 'drawer_status', 'last_updated'),
+    ('ix_drawers_created_id', 'ix_drawers_updated_id', 'drawers', 'updated_at'),
+]
+
+
+def upgrade():
+    # Build each replacement before dropping the old index so listings are never unindexed
+    with op.get_context().autocommit_block():
+        for name, old_name, table, _ in INDEXES:
+            op.create_index(name, table, [sa.text('created_at DESC'), sa.text('id DESC')],
+                            unique=False, postgresql_concurrently=True)
+            op.drop_index(old_name, table_name=table, postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, old_name, table, column in reversed(INDEXES):
+            op.create_index(old_name, table, [sa.text(f'{column} DESC'), sa.text('id DESC')],
+                            unique=False, postgresql_concurrently=True)
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
@@ -0,0 +1,32 @@
+"""Include the stacking check's columns in the non-depleted tracking index
+
+Revision ID: e2d8b6f0a913
+Revises: c5a1f9e3d247
+Create Date: 2026-10-15 23:12:05.647302
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2d8b6f0a913'
+down_revision = 'c5a1f9e3d247'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Build the replacement before dropping the old index so lookups are never unindexed
+    with op.get_context().autocommit_block():
+        op.create_index('ix_dbt_status_active_covering', 'drawer_batch_tracking', ['drawer_status_id', 'batch_order'],
+                        unique=False, postgresql_where=sa.text('is_depleted = false'),
+                        postgresql_include=['batch_id', 'quantity_loaded', 'load_date'], postgresql_concurrently=True)
+        op.drop_index('ix_dbt_status_active_order', table_name='drawer_batch_tracking', postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.create_index('ix_dbt_status_active_order', 'drawer_batch_tracking', ['drawer_status_id', 'batch_order'],
+                        unique=False, postgresql_where=sa.text('is_depleted = false'), postgresql_concurrently=True)
+        op.drop_index('ix_dbt_status_active_covering', table_name='drawer_batch_tracking', postgresql_concurrently=True)
@@ -0,0 +1,31 @@
+"""Replace drawer_status drawer_id index with (drawer_id, last_updated DESC)
+
+Revision ID: e8a1c5d3b702
+Revises: d2f6a8c4e915
+Create Date: 2026-10-15 16:48:12.904376
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e8a1c5d3b702'
+down_revision = 'd2f6a8c4e915'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index('ix_drawer_status_drawer_updated', 'drawer_status',
+                        ['drawer_id', sa.text('last_updated DESC')], unique=False, postgresql_concurrently=True)
+        # drawer_id lookups are served by the composite index's leading column
+        op.drop_index('ix_drawer_status_drawer_id', table_name='drawer_status', postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.create_index('ix_drawer_status_drawer_id', 'drawer_status', ['drawer_id'], unique=False, postgresql_concurrently=True)
+        op.drop_index('ix_drawer_status_drawer_updated', table_name='drawer_status', postgresql_concurrently=True)
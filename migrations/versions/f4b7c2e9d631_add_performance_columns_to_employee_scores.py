@@ -0,0 +1,49 @@
+"""Add warning and completion-time aggregates to mv_employee_scores
+
+Revision ID: f4b7c2e9d631
+Revises: e2d8b6f0a913
+Create Date: 2026-10-15 23:16:52.309418
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f4b7c2e9d631'
+down_revision = 'e2d8b6f0a913'
+branch_labels = None
+depends_on = None
+
+SCORE_COLUMNS = """
+               count(*) AS total_actions,
+               avg(accuracy_score) AS avg_accuracy,
+               avg(efficiency_score) AS avg_efficiency"""
+
+PERFORMANCE_COLUMNS = """,
+               count(*) FILTER (WHERE batch_warning_triggered) AS warnings_triggered,
+               avg(completion_time_seconds) AS avg_completion_time"""
+
+
+def _create_view(columns):
+    # Materialized views can't gain columns in place, so the view is rebuilt with its indexes
+    op.execute('DROP MATERIALIZED VIEW IF EXISTS mv_employee_scores')
+    op.execute(f"""
+        CREATE MATERIALIZED VIEW mv_employee_scores AS
+        SELECT employee_id,{columns}
+        FROM restock_history
+        WHERE employee_id IS NOT NULL
+        GROUP BY employee_id
+    """)
+    # A unique index is required for REFRESH MATERIALIZED VIEW CONCURRENTLY
+    op.execute('CREATE UNIQUE INDEX ux_mv_employee_scores ON mv_employee_scores (employee_id)')
+    op.execute('CREATE INDEX ix_mv_employee_scores_accuracy ON mv_employee_scores (avg_accuracy DESC)')
+    op.execute('CREATE INDEX ix_mv_employee_scores_efficiency ON mv_employee_scores (avg_efficiency DESC)')
+
+
+def upgrade():
+    _create_view(SCORE_COLUMNS + PERFORMANCE_COLUMNS)
+
+
+def downgrade():
+    _create_view(SCORE_COLUMNS)
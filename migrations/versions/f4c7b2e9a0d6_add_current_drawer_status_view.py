@@ -0,0 +1,31 @@
+"""Add mv_current_drawer_status materialized view
+
+Revision ID: f4c7b2e9a0d6
+Revises: e8a1c5d3b702
+Create Date: 2026-10-15 17:12:35.217640
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f4c7b2e9a0d6'
+down_revision = 'e8a1c5d3b702'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("""
+        CREATE MATERIALIZED VIEW mv_current_drawer_status AS
+        SELECT DISTINCT ON (drawer_id) id, drawer_id, status, last_updated, created_at
+        FROM drawer_status
+        ORDER BY drawer_id, last_updated DESC
+    """)
+    # A unique index is required for REFRESH MATERIALIZED VIEW CONCURRENTLY
+    op.execute('CREATE UNIQUE INDEX ux_mv_current_drawer_status ON mv_current_drawer_status (drawer_id)')
+
+
+def downgrade():
+    op.execute('DROP MATERIALIZED VIEW IF EXISTS mv_current_drawer_status')
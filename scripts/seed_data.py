@@ -65,7 +65,6 @@ def seed_database():
             ),
         ]
         db.session.add_all(batches)
-        db.session.commit()
         print(f"Created {len(batches)} item batches")
 
         print("Creating sample drawers...")
@@ -100,7 +99,8 @@ def seed_database():
             ),
         ]
         db.session.add_all(drawers)
-        db.session.commit()
+        # Assign drawer ids for the layouts and statuses below
+        db.session.flush()
         print(f"Created {len(drawers)} drawers")
 
         print("Creating sample drawer layouts...")
@@ -142,7 +142,6 @@ def seed_database():
             ),
         ]
         db.session.add_all(layouts)
-        db.session.commit()
         print(f"Created {len(layouts)} drawer layouts")
 
         print("Creating sample employees...")
@@ -177,7 +176,6 @@ def seed_database():
             ),
         ]
         db.session.add_all(employees)
-        db.session.commit()
         print(f"Created {len(employees)} employees")
 
         print("Creating sample drawer status...")
@@ -199,6 +197,8 @@ def seed_database():
             ),
         ]
         db.session.add_all(drawer_statuses)
+
+        # Everything above is written in one transaction
         db.session.commit()
         print(f"Created {len(drawer_statuses)} drawer statuses")
 
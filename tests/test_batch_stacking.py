@@ -2,37 +2,13 @@
 Tests for batch stacking detection - the critical feature.
 """
 import pytest
-import sys
-import os
 
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from app import create_app, db
+from app import db
 from app.models import ItemBatch, Drawer, DrawerStatus, DrawerStatusEnum, BatchStatus
 from app.services.batch_tracking import check_batch_stacking, create_drawer_status_with_batch, mark_batch_depleted
 from datetime import datetime, timedelta
 
 
-@pytest.fixture
-def app():
-    """Create application for testing."""
-    app = create_app()
-    app.config['TESTING'] = True
-    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
-
-    with app.app_context():
-        db.create_all()
-        yield app
-        db.session.remove()
-        db.drop_all()
-
-
-@pytest.fixture
-def client(app):
-    """Create test client."""
-    return app.test_client()
-
-
 def test_batch_stacking_detection(app):
     """Test that batch stacking is detected correctly."""
     with app.app_context():
@@ -130,7 +106,7 @@ def test_batch_depletion_clears_warning(app):
         )
 
         # Get the batch tracking ID
-        tracking = status1.batch_trackings.first()
+        tracking = db.session.scalars(status1.batch_trackings.select()).first()
 
         # Mark first batch as depleted
         mark_batch_depleted(tracking.id)
@@ -165,5 +141,43 @@ def test_check_batch_stacking_empty_drawer(app):
         assert existing == [], "Empty drawer should have no existing batches"
 
 
+def test_stacking_counts_every_load(app):
+    """Each load records its own status; the stack spans all of them."""
+    with app.app_context():
+        drawer = Drawer(
+            drawer_code="TEST-DR-04",
+            trolley_id="TEST-TROLLEY",
+            position=4,
+            capacity=50,
+            drawer_type="cold"
+        )
+        db.session.add(drawer)
+
+        batches = [
+            ItemBatch(
+                item_type="Test Item",
+                batch_number=f"TEST-BATCH-01{i}",
+                quantity=50,
+                expiry_date=(datetime.now() + timedelta(days=30)).date(),
+                status=BatchStatus.available
+            )
+            for i in range(3)
+        ]
+        db.session.add_all(batches)
+        db.session.commit()
+
+        for batch in batches:
+            _, warning = create_drawer_status_with_batch(
+                drawer_id=drawer.id,
+                batch_id=batch.id,
+                quantity=10,
+                status_value=DrawerStatusEnum.partial
+            )
+
+        # The third load sees both earlier batches, not just the first status's
+        assert [b['batch_number'] for b in warning['existing_batches']] == ["TEST-BATCH-010", "TEST-BATCH-011"]
+        assert [b['batch_number'] for b in check_batch_stacking(drawer.id)] == [b.batch_number for b in batches]
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
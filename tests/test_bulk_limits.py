@@ -0,0 +1,37 @@
+"""
+Tests for the per-request size limit on bulk endpoints.
+"""
+import uuid
+
+from app.routes.drawers import MAX_QR_BATCH
+from app.utils.validators import MAX_BULK_RECORDS
+
+
+def test_bulk_statuses_over_limit_rejected(client):
+    """More than MAX_BULK_RECORDS statuses is a 400 before any database work."""
+    item = {'drawer_id': str(uuid.uuid4()), 'batch_id': str(uuid.uuid4()), 'quantity': 1, 'status': 'full'}
+    response = client.post('/api/drawer-status/bulk', json={'items': [item] * (MAX_BULK_RECORDS + 1)})
+    assert response.status_code == 400
+    assert response.get_json()['error']['code'] == 'VALIDATION_ERROR'
+
+
+def test_qr_batch_over_limit_rejected(client):
+    """More than MAX_QR_BATCH drawer ids is a 400 before any QR code is rendered."""
+    drawer_ids = [str(uuid.uuid4()) for _ in range(MAX_QR_BATCH + 1)]
+    response = client.post('/api/drawers/qr-codes:batch', json={'drawer_ids': drawer_ids})
+    assert response.status_code == 400
+    assert response.get_json()['error']['code'] == 'VALIDATION_ERROR'
+
+
+def test_bulk_layouts_over_limit_rejected(client):
+    """More than MAX_BULK_RECORDS layouts is a 400 before any database work."""
+    layout = {
+        'layout_name': 'Standard',
+        'drawer_id': str(uuid.uuid4()),
+        'item_type': 'Water',
+        'designated_quantity': 10,
+        'priority_order': 1
+    }
+    response = client.post('/api/drawer-layouts/bulk', json={'items': [layout] * (MAX_BULK_RECORDS + 1)})
+    assert response.status_code == 400
+    assert response.get_json()['error']['code'] == 'VALIDATION_ERROR'
@@ -0,0 +1,35 @@
+"""
+Tests for gzip responses and their ETags.
+"""
+from app import db
+from app.models import Drawer, DrawerLayout
+
+
+def test_gzip_response_has_weak_etag_that_revalidates(client):
+    """The gzip body is not byte-identical to the plain one, so its ETag is weak but still yields 304."""
+    drawer = Drawer(drawer_code="GZ-DR-01", trolley_id="GZ-TROLLEY", position=1, capacity=50, drawer_type="cold")
+    db.session.add(drawer)
+    db.session.flush()
+    for i in range(20):
+        db.session.add(DrawerLayout(
+            layout_name=f"Layout {i}",
+            drawer_id=drawer.id,
+            item_type="Water",
+            designated_quantity=10,
+            priority_order=i + 1
+        ))
+    db.session.commit()
+
+    plain = client.get('/api/drawer-layouts')
+    assert 'Content-Encoding' not in plain.headers
+    assert not plain.headers['ETag'].startswith('W/')
+
+    gzipped = client.get('/api/drawer-layouts', headers={'Accept-Encoding': 'gzip'})
+    assert gzipped.headers['Content-Encoding'] == 'gzip'
+    assert gzipped.headers['ETag'] == 'W/' + plain.headers['ETag']
+
+    revalidated = client.get('/api/drawer-layouts', headers={
+        'Accept-Encoding': 'gzip',
+        'If-None-Match': gzipped.headers['ETag']
+    })
+    assert revalidated.status_code == 304
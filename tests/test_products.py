@@ -0,0 +1,29 @@
+"""
+Tests for the product catalog bulk upsert.
+"""
+from sqlalchemy import select
+
+from app import db
+from app.models import Product
+
+
+def test_bulk_upsert_dedupes_and_updates(app):
+    """Repeated EANs keep their last row and existing EANs are updated in place."""
+    existing = Product(ean='4000000000001', name='Old water', product_type='drink')
+    db.session.add(existing)
+    db.session.commit()
+
+    ids = Product.bulk_upsert_by_ean([
+        {'ean': '4000000000001', 'name': 'Water 500ml'},
+        {'ean': '4000000000002', 'name': 'Juice', 'product_type': 'drink'},
+        {'ean': '4000000000001', 'name': 'Water 330ml', 'description': 'Still'},
+    ])
+    db.session.commit()
+
+    assert len(ids) == 2
+    assert ids[0] == existing.id
+    products = {p.ean: p for p in db.session.scalars(select(Product).execution_options(populate_existing=True))}
+    assert len(products) == 2
+    water = products['4000000000001']
+    assert (water.name, water.product_type, water.description) == ('Water 330ml', None, 'Still')
+    assert products['4000000000002'].id == ids[1]
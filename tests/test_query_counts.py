@@ -0,0 +1,158 @@
+"""
+Query-count guards for list endpoints - fail the build on N+1 regressions.
+"""
+import pytest
+from datetime import date
+
+from app import db
+from app.models import Drawer, DrawerLayout, Employee, RestockHistory, ActionType, ItemBatch, DrawerStatus, DrawerStatusEnum, DrawerBatchTracking
+from app.services.batch_tracking import check_batch_stacking
+from app.utils.query_counter import count_queries
+
+
+@pytest.fixture
+def drawer(app):
+    """A drawer with a few layouts and restock records."""
+    drawer = Drawer(
+        drawer_code="QC-DR-01",
+        trolley_id="QC-TROLLEY",
+        position=1,
+        capacity=50,
+        drawer_type="cold"
+    )
+    employee = Employee(employee_id="QC-EMP-01", first_name="Query", last_name="Count", role="packer")
+    db.session.add_all([drawer, employee])
+    db.session.flush()
+
+    for i in range(5):
+        db.session.add(DrawerLayout(
+            layout_name=f"Layout {i}",
+            drawer_id=drawer.id,
+            item_type="Water",
+            designated_quantity=10,
+            priority_order=i
+        ))
+        db.session.add(RestockHistory(
+            employee_id=employee.id,
+            drawer_id=drawer.id,
+            action_type=ActionType.restock,
+            quantity_changed=5
+        ))
+    db.session.commit()
+    return drawer
+
+
+def test_list_layouts_query_count(client, drawer):
+    """Listing layouts is an ETag aggregate plus a single SELECT regardless of row count."""
+    with count_queries() as queries:
+        response = client.get('/api/drawer-layouts')
+
+    assert response.status_code == 200
+    assert len(response.get_json()['data']) == 5
+    assert len(queries) <= 2
+
+
+def test_list_layouts_not_modified(client, drawer):
+    """A matching If-None-Match is answered with 304 from the aggregate alone."""
+    etag = client.get('/api/drawer-layouts').headers['ETag']
+
+    with count_queries() as queries:
+        response = client.get('/api/drawer-layouts', headers={'If-None-Match': etag})
+
+    assert response.status_code == 304
+    assert len(queries) <= 1
+
+
+def test_layouts_by_drawer_query_count(client, drawer):
+    """Existence check, ETag aggregate and one SELECT for the layouts."""
+    with count_queries() as queries:
+        response = client.get(f'/api/drawer-layouts/by-drawer/{drawer.id}')
+
+    assert response.status_code == 200
+    assert len(response.get_json()['data']) == 5
+    assert len(queries) <= 3
+
+
+def test_list_drawers_query_count(client, drawer):
+    """The streamed drawer listing is one SELECT of column rows."""
+    with count_queries() as queries:
+        response = client.get('/api/drawers')
+        data = response.get_json()['data']
+
+    assert response.status_code == 200
+    assert len(data) == 1
+    assert len(queries) <= 1
+
+
+def test_list_employees_query_count(client, drawer):
+    """The streamed employee listing is one SELECT of column rows, filtered or not."""
+    with count_queries() as queries:
+        response = client.get('/api/employees?status=active')
+        data = response.get_json()['data']
+
+    assert response.status_code == 200
+    assert len(data) == 1
+    assert len(queries) <= 1
+
+
+def test_list_restock_history_query_count(client, drawer):
+    """Paginated history is one page SELECT carrying the total as a window count."""
+    with count_queries() as queries:
+        response = client.get('/api/restock-history?per_page=3')
+
+    assert response.status_code == 200
+    assert len(response.get_json()['data']) == 3
+    assert response.get_json()['pagination']['total_items'] == 5
+    assert len(queries) <= 1
+
+
+def test_history_by_employee_query_count(client, drawer):
+    """An EXISTS probe and one SELECT, however many records the employee has."""
+    employee_id = db.session.scalar(db.select(Employee.id))
+
+    with count_queries() as queries:
+        response = client.get(f'/api/restock-history/employee/{employee_id}')
+
+    assert response.status_code == 200
+    assert len(response.get_json()['data']) == 5
+    assert len(queries) <= 2
+
+
+def test_restock_history_keyset_page_query_count(client, drawer):
+    """A cursor page is a single SELECT with no COUNT, on every page."""
+    with count_queries() as queries:
+        first = client.get('/api/restock-history?limit=3').get_json()
+    cursor = first['pagination']['next_cursor']
+
+    with count_queries() as next_queries:
+        second = client.get(f'/api/restock-history?limit=3&after={cursor}').get_json()
+
+    assert len(first['data']) == 3
+    assert len(second['data']) == 2
+    assert second['pagination']['next_cursor'] is None
+    assert len(queries) <= 1
+    assert len(next_queries) <= 1
+
+
+def test_check_batch_stacking_query_count(app, drawer):
+    """One joined SELECT across the drawer's statuses, however many batches are stacked."""
+    status = DrawerStatus(drawer_id=drawer.id, status=DrawerStatusEnum.partial)
+    db.session.add(status)
+    db.session.flush()
+    for i in range(4):
+        batch = ItemBatch(item_type="Water", batch_number=f"QC-BATCH-{i}", quantity=10, expiry_date=date(2030, 1, 1))
+        db.session.add(batch)
+        db.session.flush()
+        db.session.add(DrawerBatchTracking(
+            drawer_status_id=status.id,
+            batch_id=batch.id,
+            quantity_loaded=5,
+            batch_order=i + 1
+        ))
+    db.session.commit()
+
+    with count_queries() as queries:
+        existing = check_batch_stacking(drawer.id)
+
+    assert [batch['batch_number'] for batch in existing] == [f"QC-BATCH-{i}" for i in range(4)]
+    assert len(queries) <= 1
@@ -0,0 +1,164 @@
+"""
+Tests for soft deletes - deleted rows must disappear from every listing.
+"""
+import uuid
+
+from sqlalchemy import text
+
+from app import db
+
+
+def create_drawer(client, code):
+    response = client.post('/api/drawers', json={
+        'drawer_code': code,
+        'trolley_id': 'SD-TROLLEY',
+        'position': 1,
+        'capacity': 50,
+        'drawer_type': 'cold'
+    })
+    assert response.status_code == 201
+    return response.get_json()['data']['id']
+
+
+def test_deleted_drawer_not_listed(client):
+    """A deleted drawer is gone from the streamed and the cursor listing."""
+    kept = create_drawer(client, 'SD-DR-01')
+    deleted = create_drawer(client, 'SD-DR-02')
+
+    assert client.delete(f'/api/drawers/{deleted}').status_code == 200
+
+    streamed = [d['id'] for d in client.get('/api/drawers').get_json()['data']]
+    paged = [d['id'] for d in client.get('/api/drawers?limit=10').get_json()['data']]
+    assert streamed == [kept]
+    assert paged == [kept]
+
+
+def test_deleted_drawer_layouts_not_listed(client):
+    """A deleted drawer's layouts are gone from the layout listings."""
+    kept_drawer = create_drawer(client, 'SD-DR-05')
+    deleted_drawer = create_drawer(client, 'SD-DR-06')
+    layouts = {}
+    for drawer_id in (kept_drawer, deleted_drawer):
+        response = client.post('/api/drawer-layouts', json={
+            'layout_name': 'Standard',
+            'drawer_id': drawer_id,
+            'item_type': 'Water',
+            'designated_quantity': 10,
+            'priority_order': 1
+        })
+        assert response.status_code == 201
+        layouts[drawer_id] = response.get_json()['data']['id']
+
+    assert client.delete(f'/api/drawers/{deleted_drawer}').status_code == 200
+
+    listed = [layout['id'] for layout in client.get('/api/drawer-layouts').get_json()['data']]
+    assert listed == [layouts[kept_drawer]]
+    assert client.get(f'/api/drawer-layouts/{layouts[deleted_drawer]}').status_code == 404
+
+
+def test_deleted_drawer_code_reusable(client):
+    """A deleted drawer's code can be given to a new drawer, but a live one's cannot."""
+    deleted = create_drawer(client, 'SD-DR-07')
+    assert client.delete(f'/api/drawers/{deleted}').status_code == 200
+
+    reused = create_drawer(client, 'SD-DR-07')
+    assert reused != deleted
+    duplicate = client.post('/api/drawers', json={
+        'drawer_code': 'SD-DR-07',
+        'trolley_id': 'SD-TROLLEY',
+        'position': 2,
+        'capacity': 50,
+        'drawer_type': 'cold'
+    })
+    assert duplicate.status_code == 409
+
+
+def create_status(client, drawer_id, batch_number):
+    batch = client.post('/api/items', json={
+        'item_type': 'Water',
+        'batch_number': batch_number,
+        'quantity': 10,
+        'expiry_date': '2030-01-01'
+    }).get_json()['data']
+    response = client.post('/api/drawer-status', json={
+        'drawer_id': drawer_id,
+        'batch_id': batch['id'],
+        'quantity': 5,
+        'status': 'partial'
+    })
+    assert response.status_code in (201, 207)
+    return response.get_json()['data']['id']
+
+
+def test_deleted_status_not_listed(client):
+    """A deleted drawer status is gone from the streamed and the cursor listing."""
+    drawer_id = create_drawer(client, 'SD-DR-03')
+    kept = create_status(client, drawer_id, 'SD-BATCH-01')
+    deleted = create_status(client, drawer_id, 'SD-BATCH-02')
+
+    assert client.delete(f'/api/drawer-status/{deleted}').status_code == 200
+
+    streamed = [s['id'] for s in client.get('/api/drawer-status').get_json()['data']]
+    paged = [s['id'] for s in client.get('/api/drawer-status?limit=10').get_json()['data']]
+    assert streamed == [kept]
+    assert paged == [kept]
+
+
+def test_no_load_into_drawer_deleted_elsewhere(client, app):
+    """A drawer deleted outside this process is not loaded, however often it was checked before."""
+    drawer_id = create_drawer(client, 'SD-DR-04')
+    loaded = create_status(client, drawer_id, 'SD-BATCH-03')
+
+    # Raw SQL, as another worker's delete would look from here: no ORM events fire
+    with app.app_context():
+        db.session.execute(
+            text('UPDATE drawers SET deleted_at = CURRENT_TIMESTAMP WHERE id = :id'),
+            {'id': uuid.UUID(drawer_id).hex}
+        )
+        db.session.commit()
+
+    batch = client.post('/api/items', json={
+        'item_type': 'Water',
+        'batch_number': 'SD-BATCH-04',
+        'quantity': 10,
+        'expiry_date': '2030-01-01'
+    }).get_json()['data']
+    single = client.post('/api/drawer-status', json={
+        'drawer_id': drawer_id, 'batch_id': batch['id'], 'quantity': 5, 'status': 'partial'
+    })
+    bulk = client.post('/api/drawer-status/bulk', json={'items': [
+        {'drawer_id': drawer_id, 'batch_id': batch['id'], 'quantity': 5, 'status': 'partial'}
+    ]})
+    assert single.status_code == 404
+    assert bulk.status_code == 404
+    assert [s['id'] for s in client.get('/api/drawer-status').get_json()['data']] == [loaded]
+
+
+def test_no_load_of_batch_deleted_elsewhere(client, app):
+    """A batch deleted outside this process gives 404, not a foreign-key 500."""
+    drawer_id = create_drawer(client, 'SD-DR-08')
+    create_status(client, drawer_id, 'SD-BATCH-05')
+    batch = client.post('/api/items', json={
+        'item_type': 'Water',
+        'batch_number': 'SD-BATCH-06',
+        'quantity': 10,
+        'expiry_date': '2030-01-01'
+    }).get_json()['data']
+    # A rejected load (unknown drawer) still looks the batch up
+    assert client.post('/api/drawer-status', json={
+        'drawer_id': str(uuid.uuid4()), 'batch_id': batch['id'], 'quantity': 5, 'status': 'partial'
+    }).status_code == 404
+
+    with app.app_context():
+        db.session.execute(text('DELETE FROM item_batches WHERE id = :id'), {'id': uuid.UUID(batch['id']).hex})
+        db.session.commit()
+
+    single = client.post('/api/drawer-status', json={
+        'drawer_id': drawer_id, 'batch_id': batch['id'], 'quantity': 5, 'status': 'partial'
+    })
+    bulk = client.post('/api/drawer-status/bulk', json={'items': [
+        {'drawer_id': drawer_id, 'batch_id': batch['id'], 'quantity': 5, 'status': 'partial'}
+    ]})
+    assert single.status_code == 404
+    assert single.get_json()['error']['message'] == f'Batch {batch["id"]} not found'
+    assert bulk.status_code == 404